@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, render_template, send_from_directory, session, redirect, url_for
+from flask import Flask, Response, request, jsonify, render_template, send_from_directory, session, redirect, url_for
 from flask_cors import CORS
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
@@ -6,6 +6,8 @@ from datetime import datetime, timezone, timedelta
 from uuid import uuid4
 import os, json
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 import requests 
 try:
@@ -48,14 +50,27 @@ except ImportError:
                 }
 
 # Import our new modules
-from auth import login_required, admin_required, authenticate_user, create_scouter, get_all_scouters, delete_scouter
+from auth import (login_required, admin_required, authenticate_user, create_scouter, get_all_scouters,
+                  delete_scouter, current_user_role)
 from database import (assign_scouter_to_team, get_scouter_assignments, get_match_assignments, 
                      mark_assignment_completed, bulk_assign_match, get_all_assignments,
-                     bulk_assign_team_to_scouter, remove_team_assignments)
-from manual_matches import (create_manual_event, get_manual_event_matches, get_manual_event_teams,
-                           list_manual_events, delete_manual_event, is_manual_event)
-from tba_api import TBAClient, get_sample_matches
-from team_names import TEAM_NAMES
+                     bulk_assign_team_to_scouter, remove_team_assignments, get_scouter_counters,
+                     apply_assignment_plan, bulk_assign_matches, add_assignment_listener,
+                     get_assignment_changes, get_scouter_assignment_changes, load_event_snapshot,
+                     summarize_assignments, mark_assignments_completed, HOME_TEAM)
+from manual_matches import create_manual_event, list_manual_events, delete_manual_event
+from tba_api import TBAClient
+import schedule
+import schedule_reconcile
+import scouter_bundle
+import live_updates
+from tba_webhooks import verify_signature, handle_webhook
+import team_directory
+from team_directory import TEAM_NAMES
+from records import ScoutEntry
+from assignment_optimizer import optimize_assignments, rebalance_scouter
+from shift_planner import plan_shifts, SHIFT_LENGTH
+from fast_json import FastJSONProvider
 
 # Add these imports after your other imports
 try:
@@ -83,6 +98,7 @@ from dev_mode import (
 )
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
 CORS(app)
 
@@ -105,6 +121,47 @@ service = build('sheets', 'v4', credentials=creds)
 sheet = service.spreadsheets()
 
 tba_client = TBAClient(api_key=os.environ.get('TBA_API_KEY'))
+schedule.configure(tba_client)
+schedule_reconcile.install()
+
+def publish_assignment_changes(event_key, upserted, removed, version, previous):
+    """Push assignment writes to the event's open admin dashboards, and to each
+    affected scouter only their part of it"""
+    live_updates.publish(live_updates.admin_channel(event_key), 'assignments', {
+        'event_key': event_key,
+        'version': version,
+        'upserted': [assignment.to_dict(with_key=True) for assignment in upserted.values()],
+        'removed': removed
+    })
+    
+    per_scouter = {}
+    for key, assignment in upserted.items():
+        per_scouter.setdefault(assignment.scouter, ([], []))[0].append(assignment.to_dict(with_key=True))
+        if previous.get(key) and previous[key] != assignment.scouter:
+            per_scouter.setdefault(previous[key], ([], []))[1].append(key)
+    for key in removed:
+        if previous.get(key):
+            per_scouter.setdefault(previous[key], ([], []))[1].append(key)
+    
+    for scouter_username, (scouter_upserted, scouter_removed) in per_scouter.items():
+        live_updates.publish(live_updates.scouter_channel(scouter_username), 'assignments', {
+            'version': version,
+            'reset': False,
+            'upserted': scouter_upserted,
+            'removed': scouter_removed
+        })
+
+def publish_schedule_change(event_key, new_schedule, diff, previous):
+    """Schedules are shared, so both production and dev dashboards hear about it"""
+    for dev in (False, True):
+        live_updates.publish(live_updates.admin_channel(event_key, dev), 'schedule', {
+            'event_key': event_key,
+            'version': new_schedule.version,
+            'matches': diff
+        })
+
+add_assignment_listener(publish_assignment_changes)
+schedule.add_schedule_listener(publish_schedule_change)
 
 try:
     statbotics_predictor = StatboticsPredictor()
@@ -255,10 +312,7 @@ def analyze_scoring_breakdown(matches, phase):
 @maintenance_required
 def login_page():
     if 'user_id' in session:
-        from auth import load_users
-        users = load_users()
-        user = users.get(session['user_id'])
-        if user and user.get('role') == 'admin':
+        if current_user_role() == 'admin':
             return redirect('/admin')
         else:
             return redirect('/dashboard')
@@ -283,6 +337,7 @@ def api_dev_login():
     if user:
         session['user_id'] = username
         session['user_name'] = user.get('name', username)
+        session['role'] = 'dev'
         session['is_dev_user'] = True
         return jsonify({
             'success': True,
@@ -303,6 +358,7 @@ def api_login():
         if user:
             session['user_id'] = username
             session['user_name'] = user.get('name', username)
+            session['role'] = 'dev'
             session['is_dev_user'] = True
             return jsonify({
                 'success': True,
@@ -315,6 +371,7 @@ def api_login():
     if user:
         session['user_id'] = username
         session['user_name'] = user.get('name', username)
+        session['role'] = user.get('role', 'scouter')
         session['is_dev_user'] = False
         return jsonify({
             'success': True,
@@ -429,31 +486,31 @@ def get_analytics_data():
                     submission_datetime = datetime.now()
                 
                 # Create analytics entry
-                analytics_entry = {
-                    'team': team_number,
-                    'match': int(match_number) if match_number.isdigit() else 0,
-                    'scouterName': scouter_name,
-                    'submissionTime': submission_datetime.isoformat(),
-                    'event': current_sheet_name,
-                    'auto': {
+                analytics_entry = ScoutEntry(
+                    team=team_number,
+                    match=int(match_number) if match_number.isdigit() else 0,
+                    scouter_name=scouter_name,
+                    submission_time=submission_datetime.timestamp(),
+                    event=current_sheet_name,
+                    auto={
                         'score': auto_score,
                         **auto_data
                     },
-                    'teleop': {
+                    teleop={
                         'score': teleop_score,
                         'offenseRating': offense_defense_data['offense_rating'],
                         'defenseRating': offense_defense_data['defense_rating'],
                         'robotRole': offense_defense_data['robot_role'],
                         **teleop_data
                     },
-                    'endgame': {
+                    endgame={
                         'score': endgame_score,
                         **endgame_data
                     },
-                    'totalScore': total_score,
-                    'notes': notes,  # ✅ Will be empty string if missing, not cause error
-                    'partialMatch': partial_match.lower() == 'yes'
-                }
+                    total_score=total_score,
+                    notes=notes,  # ✅ Will be empty string if missing, not cause error
+                    partial_match=partial_match.lower() == 'yes'
+                )
                 
                 analytics_data.append(analytics_entry)
                 
@@ -462,7 +519,7 @@ def get_analytics_data():
                 continue
         
         print(f"✅ Loaded {len(analytics_data)} analytics entries from {current_sheet_name}")
-        return jsonify(analytics_data)
+        return jsonify([entry.to_dict() for entry in analytics_data])
         
     except Exception as e:
         print(f"Error fetching analytics data: {str(e)}")
@@ -477,6 +534,29 @@ def safe_int(value, default=0):
     except (ValueError, TypeError):
         return default
 
+def parse_availability(value):
+    """Shift availability {scouter: [[first_match, last_match], ...]} with int bounds,
+    or None if value isn't shaped like that (null means everyone is available)"""
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        return None
+    
+    availability = {}
+    for scouter, windows in value.items():
+        if not isinstance(windows, list):
+            return None
+        parsed = []
+        for window in windows:
+            if not isinstance(window, list) or len(window) != 2:
+                return None
+            first, last = safe_int(window[0], None), safe_int(window[1], None)
+            if first is None or last is None or first > last:
+                return None
+            parsed.append((first, last))
+        availability[scouter] = parsed
+    return availability
+
 def parse_auto_summary(summary):
     """Parse auto summary for REBUILT 2026"""
     if not summary or "Didn't move in auto" in summary:
@@ -677,7 +757,7 @@ def reset_dev_environment():
 def dev_status():
     """Get dev environment status"""
     import os
-    from dev_mode import DEV_FILES
+    from dev_mode import DEV_FILES, DEV_DIRS
     
     status = {
         'dev_mode': is_dev_mode(),
@@ -692,6 +772,12 @@ def dev_status():
             'size': os.path.getsize(path) if os.path.exists(path) else 0
         }
     
+    for key, path in DEV_DIRS.items():
+        status['files'][key] = {
+            'exists': os.path.isdir(path),
+            'size': len(os.listdir(path)) if os.path.isdir(path) else 0
+        }
+    
     return jsonify(status)
 
 @app.route('/api/dev/populate-test-data', methods=['POST'])
@@ -791,22 +877,15 @@ def admin_dashboard():
         return render_template('admin_dashboard.html')
     
     # Then check regular admin
-    from auth import load_users
-    users = load_users()
-    user = users.get(session['user_id'])
-    if not user or user.get('role') != 'admin':
+    if current_user_role() != 'admin':
         return redirect('/dashboard')
     return render_template('admin_dashboard.html')
 
 @app.route('/dashboard')
 @login_required
 def scouter_dashboard():
-    from auth import load_users
-    users = load_users()
-    user = users.get(session['user_id'])
-    
     # Auto-redirect pit scouters to pit scouting page
-    if user and user.get('role') == 'pit_scouter':
+    if current_user_role() == 'pit_scouter':
         return redirect('/pit-scout')
     
     return render_template('scouter_dashboard.html')
@@ -818,39 +897,45 @@ def scouter_dashboard():
 @app.route('/api/admin/auto-assign', methods=['POST'])
 @admin_required
 def auto_assign_teams():
-    """Automatically assign each scouter to one team across all matches"""
+    """Automatically assign scouters across all matches
+    strategy 'balanced' (default): load-balanced per match slot (assignment_optimizer)
+    strategy 'team': each scouter follows one team across all matches
+    strategy 'shifts': six scouters per block of shift_length matches, one per
+    driver station (shift_planner); optional availability {scouter: [[first, last], ...]}
+    Only unassigned slots are filled unless replace_pending is true, which re-plans
+    every pending assignment (completed and home-game ones are always kept)"""
     data = request.json
     event_key = data.get('event_key')
+    strategy = data.get('strategy', 'balanced')
+    replace_pending = data.get('replace_pending') is True
     
-    print(f"Auto-assign called with event_key: {event_key}")  # Debug log
+    print(f"Auto-assign called with event_key: {event_key}, strategy: {strategy}")  # Debug log
     
     if not event_key:
         return jsonify({'error': 'Event key required'}), 400
+    if strategy not in ('balanced', 'team', 'shifts'):
+        return jsonify({'error': f'Unknown strategy: {strategy}'}), 400
+    shift_length = safe_int(data.get('shift_length', SHIFT_LENGTH))
+    if shift_length < 1:
+        return jsonify({'error': 'shift_length must be a whole number of matches (1 or more)'}), 400
+    availability = parse_availability(data.get('availability'))
+    if availability is None:
+        return jsonify({'error': 'availability must be {scouter: [[first_match, last_match], ...]}'}), 400
     
-    from auth import get_all_scouters
     scouters_data = get_all_scouters()
     scouter_usernames = list(scouters_data.keys())
     
-    print(f"Found {len(scouter_usernames)} scouters: {scouter_usernames}")  # Debug log
+    print(f"Found {len(scouter_usernames)} scouters")  # Debug log
     
     if not scouter_usernames:
         return jsonify({'error': 'No scouters found'}), 400
     
-    # Get teams for this event
+    # Schedule is fetched once; its team -> matches index drives the whole plan
     try:
-        if is_manual_event(event_key):
-            teams = get_manual_event_teams(event_key)
-        else:
-            matches = tba_client.get_event_matches(event_key)
-            if not matches:
-                matches = get_sample_matches()
-            
-            teams_set = set()
-            for match in matches:
-                teams_set.update(match['all_teams'])
-            teams = sorted(list(teams_set), key=int)
+        event_schedule = schedule.get_event_schedule(event_key, sample_fallback=True)
+        teams = list(event_schedule.teams)
         
-        print(f"Found {len(teams)} teams: {teams}")  # Debug log
+        print(f"Found {len(teams)} teams")  # Debug log
             
     except Exception as e:
         print(f"Error loading teams: {str(e)}")  # Debug log
@@ -860,7 +945,7 @@ def auto_assign_teams():
         return jsonify({'error': 'No teams found for this event'}), 400
     
     # Remove home team if present
-    home_team = '6897'
+    home_team = HOME_TEAM
     if home_team in teams:
         teams.remove(home_team)
         print(f"Removed home team {home_team}, remaining teams: {len(teams)}")  # Debug log
@@ -868,32 +953,78 @@ def auto_assign_teams():
     if len(teams) == 0:
         return jsonify({'error': 'No teams available for assignment (excluding home team)'}), 400
     
-    # Assign teams to scouters in round-robin fashion
+    # Build the whole plan in memory, then write once
     assignments_made = []
-    
-    for i, team in enumerate(teams):
-        scouter_username = scouter_usernames[i % len(scouter_usernames)]
-        scouter_name = scouters_data[scouter_username].get('name', scouter_username)
+    report = None
+    
+    if strategy == 'shifts':
+        shift_plan = plan_shifts(event_schedule.matches, scouter_usernames,
+                                 shift_length=shift_length,
+                                 availability=availability, home_team=home_team,
+                                 existing=get_all_assignments(event_key),
+                                 keep_pending=not replace_pending)
+        report = shift_plan.summary()
+        report['shifts'] = shift_plan.shifts
         
-        print(f"Assigning team {team} to {scouter_username}")  # Debug log
+        match_assignments = shift_plan.match_assignments
+        by_scouter = {}
+        for match_number, team_assignments in match_assignments.items():
+            for team, scouter_username in team_assignments.items():
+                by_scouter.setdefault(scouter_username, []).append((match_number, team))
         
-        success, message = bulk_assign_team_to_scouter(scouter_username, event_key, str(team))
+        for scouter_username, slots in by_scouter.items():
+            assignments_made.append({
+                'scouter_username': scouter_username,
+                'scouter_name': scouters_data[scouter_username].get('name', scouter_username),
+                'matches': sorted(match_number for match_number, _ in slots),
+                'teams': sorted({team for _, team in slots}, key=lambda t: int(t) if t.isdigit() else 0)
+            })
+    elif strategy == 'balanced':
+        optimized = optimize_assignments(event_schedule.matches, scouter_usernames,
+                                         existing=get_all_assignments(event_key), home_team=home_team,
+                                         keep_pending=not replace_pending)
+        plan = optimized.assignments
+        report = optimized.summary()
         
-        if success:
+        for scouter_username, slots in optimized.by_scouter().items():
+            assignments_made.append({
+                'scouter_username': scouter_username,
+                'scouter_name': scouters_data[scouter_username].get('name', scouter_username),
+                'matches': sorted(match_number for match_number, _ in slots),
+                'teams': sorted({team for _, team in slots}, key=lambda t: int(t) if t.isdigit() else 0)
+            })
+    else:
+        plan = []
+        for i, team in enumerate(teams):
+            scouter_username = scouter_usernames[i % len(scouter_usernames)]
+            match_numbers = event_schedule.team_matches.get(team, ())
+            
+            plan.extend((scouter_username, match_number, team) for match_number in match_numbers)
             assignments_made.append({
                 'team': team,
                 'scouter_username': scouter_username,
-                'scouter_name': scouter_name
+                'scouter_name': scouters_data[scouter_username].get('name', scouter_username),
+                'matches': list(match_numbers)
             })
+    
+    try:
+        if strategy == 'shifts':
+            written = bulk_assign_matches(event_key, match_assignments, replace_pending=replace_pending)
         else:
-            print(f"Failed to assign team {team}: {message}")  # Debug log
+            written = apply_assignment_plan(event_key, plan, replace_pending=replace_pending)
+    except Exception as e:
+        print(f"Error saving assignments: {str(e)}")  # Debug log
+        return jsonify({'error': f'Could not save assignments: {str(e)}'}), 500
     
-    print(f"Successfully made {len(assignments_made)} assignments")  # Debug log
+    print(f"Successfully made {len(assignments_made)} {strategy} assignments ({written} match slots)")  # Debug log
     
     return jsonify({
         'success': True,
+        'strategy': strategy,
         'assignments': assignments_made,
-        'total_assignments': len(assignments_made)
+        'total_assignments': len(assignments_made),
+        'total_match_assignments': written,
+        'report': report
     })
 
 @app.route('/api/admin/clear-all-assignments', methods=['POST'])
@@ -917,7 +1048,46 @@ def clear_all_assignments():
     except Exception as e:
         print(f"Error clearing assignments: {str(e)}")  # Add logging
         return jsonify({'error': str(e)}), 500
-    
+
+@app.route('/api/admin/archived-events')
+@admin_required
+def get_archived_events():
+    """List events whose assignments have been archived"""
+    from database import list_archived_events
+    return jsonify(list_archived_events())
+
+@app.route('/api/admin/archive-event', methods=['POST'])
+@admin_required
+def archive_event():
+    """Move a finished event's assignments out of the active set"""
+    data = request.json
+    event_key = data.get('event_key')
+
+    if not event_key:
+        return jsonify({'error': 'Event key required'}), 400
+
+    from database import archive_event_assignments
+    if archive_event_assignments(event_key):
+        return jsonify({'success': True, 'message': f'Archived assignments for {event_key}'})
+    else:
+        return jsonify({'error': 'No active assignments for this event'}), 404
+
+@app.route('/api/admin/restore-event', methods=['POST'])
+@admin_required
+def restore_event():
+    """Bring an archived event's assignments back into the active set"""
+    data = request.json
+    event_key = data.get('event_key')
+
+    if not event_key:
+        return jsonify({'error': 'Event key required'}), 400
+
+    from database import restore_archived_event
+    if restore_archived_event(event_key):
+        return jsonify({'success': True, 'message': f'Restored assignments for {event_key}'})
+    else:
+        return jsonify({'error': 'Event is not archived or already active'}), 404
+
 
 
 @app.route('/api/admin/bulk-assign-team', methods=['POST'])
@@ -975,16 +1145,10 @@ def get_matches():
         return jsonify({'error': 'Event key required'}), 400
     
     try:
-        if is_manual_event(event_key):
-            matches = get_manual_event_matches(event_key)
-            return jsonify(matches)
-        else:
-            matches = tba_client.get_event_matches(event_key)
-            if not matches: 
-                matches = get_sample_matches()
-            return jsonify(matches)
+        event_schedule = schedule.get_event_schedule(event_key, sample_fallback=True)
+        return jsonify(event_schedule.match_dicts())
     except Exception as e:
-        return jsonify(get_sample_matches())
+        return jsonify(schedule.get_sample_schedule().match_dicts())
 
 @app.route('/api/admin/teams')
 @admin_required
@@ -995,24 +1159,31 @@ def get_teams():
         return jsonify({'error': 'Event key required'}), 400
     
     try:
-        if is_manual_event(event_key):
-            teams = get_manual_event_teams(event_key)
-            return jsonify(teams)
-        else:
-            matches = tba_client.get_event_matches(event_key)
-            if not matches:
-                matches = get_sample_matches()
-            
-            teams = set()
-            for match in matches:
-                teams.update(match['all_teams'])
-            
-            teams_list = sorted(list(teams), key=int)
-            return jsonify(teams_list)
-            
+        return jsonify(schedule.get_event_schedule(event_key, sample_fallback=True).teams)
     except Exception as e:
         return jsonify(['254', '148', '1323', '2468', '2471', '5940', '1678', '5190', '6834', '973', '1114', '2056'])
 
+@app.route('/api/tba/webhook', methods=['POST'])
+def tba_webhook():
+    """Receive TBA push notifications (authenticated by the X-TBA-HMAC signature)"""
+    body = request.get_data()
+    if not verify_signature(body, request.headers.get('X-TBA-HMAC')):
+        return jsonify({'error': 'Invalid signature'}), 401
+    
+    try:
+        payload = app.json.loads(body)
+    except ValueError:
+        return jsonify({'error': 'Invalid JSON'}), 400
+    
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    message_data = payload.get('message_data') or {}
+    if not isinstance(message_data, dict):
+        return jsonify({'error': 'message_data must be an object'}), 400
+    
+    result = handle_webhook(payload.get('message_type'), message_data)
+    return jsonify({'success': True, **result})
+
 @app.route('/api/admin/scouters')
 @admin_required
 def get_scouters():
@@ -1022,26 +1193,15 @@ def get_scouters():
 @app.route('/api/admin/scouter-stats')
 @admin_required
 def get_scouter_stats():
-    """Get scouting statistics for each scouter"""
+    """Get scouting statistics for each scouter, scoped to ?event= when given"""
     try:
+        event_key = request.args.get('event')
         scouters = get_all_scouters()
-        assignments = get_all_assignments()
+        counters = get_scouter_counters(event_key)
         
         stats = {}
         for username in scouters.keys():
-            assigned_count = 0
-            completed_count = 0
-            
-            for assignment in assignments.values():
-                if assignment.get('scouter') == username:
-                    assigned_count += 1
-                    if assignment.get('completed', False):
-                        completed_count += 1
-            
-            stats[username] = {
-                'assigned': assigned_count,
-                'completed': completed_count
-            }
+            stats[username] = counters.get(username, {'assigned': 0, 'completed': 0, 'home_games': 0})
         
         return jsonify(stats)
     except Exception as e:
@@ -1068,10 +1228,83 @@ def create_new_scouter():
 @admin_required
 def delete_scouter_account(username):
     if delete_scouter(username):
-        return jsonify({'success': True})
+        # Hand the deleted scouter's pending assignments to the least-loaded remaining scouters
+        rebalanced = rebalance_scouter(username, list(get_all_scouters().keys()))
+        return jsonify({
+            'success': True,
+            'reassigned': sum(event['reassigned'] for event in rebalanced.values()),
+            'events': rebalanced
+        })
     else:
         return jsonify({'error': 'Scouter not found'}), 404
 
+@app.route('/api/admin/reassign-scouter', methods=['POST'])
+@admin_required
+def reassign_scouter():
+    """Move a scouter's pending assignments to others (e.g. they left the event early)"""
+    data = request.json
+    username = data.get('username')
+    event_key = data.get('event_key')
+    
+    if not username:
+        return jsonify({'error': 'Username required'}), 400
+    
+    scouters = [s for s in get_all_scouters() if s != username]
+    rebalanced = rebalance_scouter(username, scouters, [event_key] if event_key else None)
+    return jsonify({
+        'success': True,
+        'reassigned': sum(event['reassigned'] for event in rebalanced.values()),
+        'events': rebalanced
+    })
+
+@app.route('/api/admin/schedule-changes')
+@admin_required
+def get_schedule_changes():
+    """Reconciliation reports for an event, newer than report id `since`"""
+    event_key = request.args.get('event')
+    if not event_key:
+        return jsonify({'error': 'Event key required'}), 400
+    
+    since = request.args.get('since', 0, type=int)
+    return jsonify({
+        'event_key': event_key,
+        'latest': schedule_reconcile.latest_report_id(event_key),
+        'reports': schedule_reconcile.get_reports(event_key, since)
+    })
+
+@app.route('/api/admin/reconcile-schedule', methods=['POST'])
+@admin_required
+def reconcile_schedule():
+    """Check an event's assignments against its current schedule and fix stale ones"""
+    data = request.json
+    event_key = data.get('event_key')
+    if not event_key:
+        return jsonify({'error': 'Event key required'}), 400
+    
+    try:
+        report = schedule_reconcile.reconcile_event(event_key)
+    except Exception as e:
+        print(f"Error reconciling {event_key}: {str(e)}")  # Debug log
+        return jsonify({'error': f'Could not reconcile assignments: {str(e)}'}), 500
+    
+    return jsonify({'success': True, 'report': report})
+
+@app.route('/api/admin/stream')
+@admin_required
+def admin_stream():
+    """Server-Sent Events for one event: assignment deltas, schedule updates and
+    reconciliation reports, pushed as they happen"""
+    event_key = request.args.get('event')
+    if not event_key:
+        return jsonify({'error': 'Event key required'}), 400
+    
+    channel = live_updates.admin_channel(event_key)
+    hello = {'event_key': event_key, 'schedule_version': schedule.get_schedule_version(event_key)}
+    response = Response(live_updates.stream(channel, hello), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/api/admin/assign-match', methods=['POST'])
 @admin_required
 def assign_match():
@@ -1092,16 +1325,24 @@ def assign_match():
 @app.route('/api/admin/assignments')
 @admin_required
 def get_admin_assignments():
+    """All assignments (a list), or with ?since=<version> only what changed:
+    {version, reset, upserted, removed}. since=0 gets everything in that shape."""
     event_key = request.args.get('event')
-    assignments = get_all_assignments(event_key)
+    since = request.args.get('since', type=int)
     
-    assignment_list = []
-    for assignment_key, assignment in assignments.items():
-        assignment_list.append({
-            'assignment_key': assignment_key,
-            **assignment
+    if since is not None and event_key:
+        version, reset, upserted, removed = get_assignment_changes(event_key, since)
+        return jsonify({
+            'version': version,
+            'reset': reset,
+            'upserted': [assignment.to_dict(with_key=True) for assignment in upserted.values()],
+            'removed': removed
         })
     
+    assignments = get_all_assignments(event_key)
+    
+    assignment_list = [assignment.to_dict(with_key=True) for assignment in assignments.values()]
+    
     return jsonify(assignment_list)
 
 @app.route('/api/admin/remove-individual-assignment', methods=['POST'])
@@ -1192,14 +1433,13 @@ def scouter_mark_home_game():
     if not assignment_key:
         return jsonify({'error': 'Assignment key required'}), 400
     
-    from database import load_assignments, mark_assignment_as_home_game
-    assignments = load_assignments()
+    from database import get_assignment, mark_assignment_as_home_game
+    assignment = get_assignment(assignment_key)
     
-    if assignment_key not in assignments:
+    if not assignment:
         return jsonify({'error': 'Assignment not found'}), 404
     
-    assignment = assignments[assignment_key]
-    if assignment.get('scouter') != session['user_id']:
+    if assignment.scouter != session['user_id']:
         return jsonify({'error': 'Not authorized for this assignment'}), 403
     
     success = mark_assignment_as_home_game(assignment_key)
@@ -1220,6 +1460,45 @@ def get_match_summary():
     
     return jsonify(summary)
 
+@app.route('/api/admin/dashboard')
+@admin_required
+def get_admin_dashboard():
+    """Everything the admin dashboard needs for an event in one response: the
+    schedule, assignments (as a since=0 delta), summary, scouters and their stats.
+    
+    The schedule is looked up once and the event's shard is read once, so the
+    summary and stats always match the assignments sent with them."""
+    event_key = request.args.get('event')
+    if not event_key:
+        return jsonify({'error': 'Event key required'}), 400
+    
+    try:
+        event_schedule = schedule.get_event_schedule(event_key, sample_fallback=True)
+    except Exception as e:
+        event_schedule = schedule.get_sample_schedule()
+    version, assignments, counters = load_event_snapshot(event_key)
+    scouters = get_all_scouters()
+    
+    return jsonify({
+        'event_key': event_key,
+        'schedule_version': event_schedule.version,
+        'matches': event_schedule.match_dicts(),
+        'teams': event_schedule.teams,
+        'assignments': {
+            'version': version,
+            'reset': True,
+            'upserted': [assignment.to_dict(with_key=True) for assignment in assignments.values()],
+            'removed': []
+        },
+        'summary': summarize_assignments(assignments),
+        'scouters': scouters,
+        'scouter_stats': {
+            username: counters.get(username, {'assigned': 0, 'completed': 0, 'home_games': 0})
+            for username in scouters
+        },
+        'schedule_changes_latest': schedule_reconcile.latest_report_id(event_key)
+    })
+
 # =============================================================================
 # SCOUTER API ROUTES
 # =============================================================================
@@ -1227,9 +1506,56 @@ def get_match_summary():
 @app.route('/api/scouter/assignments')
 @login_required
 def get_scouter_assignments_api():
+    """The scouter's assignments (a list), or with ?since=<version> only what
+    changed: {version, reset, upserted, removed, events}"""
     scouter_username = session['user_id']
+    since = request.args.get('since', type=int)
+    
+    if since is not None:
+        version, reset, upserted, removed, events = get_scouter_assignment_changes(scouter_username, since)
+        return jsonify({
+            'version': version,
+            'reset': reset,
+            'upserted': [assignment.to_dict(with_key=True) for assignment in upserted.values()],
+            'removed': removed,
+            'events': events
+        })
+    
     assignments = get_scouter_assignments(scouter_username)
-    return jsonify(assignments)
+    return jsonify([assignment.to_dict(with_key=True) for assignment in assignments])
+
+@app.route('/api/scouter/stream')
+@login_required
+def scouter_stream():
+    """Server-Sent Events for the logged-in scouter: their assignment changes only"""
+    channel = live_updates.scouter_channel(session['user_id'])
+    response = Response(live_updates.stream(channel), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/scouter/bundle')
+@login_required
+def get_scouter_bundle():
+    """The scouter's assignments, their events' schedules, team names and the
+    form options in one gzipped document, for working offline.
+    
+    The ETag is the bundle version; a matching If-None-Match gets a 304."""
+    bundle = scouter_bundle.build_bundle(session['user_id'], SCOUT_FORM_CONFIG)
+    etag = bundle['version']
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        compress = 'gzip' in request.accept_encodings
+        response = Response(scouter_bundle.encode_bundle(bundle, compress), mimetype='application/json')
+        if compress:
+            response.headers['Content-Encoding'] = 'gzip'
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.headers['Vary'] = 'Accept-Encoding, Cookie'
+    return response
 
 # =============================================================================
 # MISCELLANOUS API ROUTES
@@ -1252,6 +1578,18 @@ def get_sheet_config():
 # SCOUTING FORM ROUTES
 # =============================================================================
 
+# Options of the scout form (templates/index.html), shipped in the offline bundle
+SCOUT_FORM_CONFIG = {
+    'counter_steps': [1, 2, 4],
+    'collect_sources': ['neutral', 'outpost', 'depot', 'preloaded'],
+    'robot_roles': ['offense', 'defense', 'feeder', 'mix'],
+    'climb_levels': {
+        'level1': {'label': 'L1 (LOW RUNG)', 'points': 10},
+        'level2': {'label': 'L2 (MID RUNG)', 'points': 20},
+        'level3': {'label': 'L3 (HIGH RUNG)', 'points': 30}
+    }
+}
+
 @app.route('/scout')
 @login_required
 def scout_form():
@@ -1270,21 +1608,13 @@ def home():
     if 'user_id' not in session:
         return redirect('/login')
 
-    from auth import load_users
-    users = load_users()
-    user = users.get(session['user_id'])
-    if user and user.get('role') == 'admin':
+    if current_user_role() == 'admin':
         return redirect('/admin')
     else:
         return redirect('/dashboard')
 
-# Replace the entire @app.route('/submit') function in app.py with this:
-
-@app.route('/submit', methods=['POST'])
-@login_required
-def submit():
-    data = request.json
-
+def build_scouting_row(data):
+    """The sheet row (ten report columns) for one submitted scouting report"""
     name         = data.get('name', '').strip()
     team         = str(data.get('team', '')).strip()
     match_number = data.get('match', '').strip()
@@ -1367,15 +1697,10 @@ def submit():
 
     if not climb_status or climb_status == 'none':
         endgame_summary = "Didn't Climb"
-    elif climb_status in ['level1', 'level2', 'level3']:
-        level_info = {
-            'level1': ('L1 (LOW RUNG)',  '10pts'),
-            'level2': ('L2 (MID RUNG)',  '20pts'),
-            'level3': ('L3 (HIGH RUNG)', '30pts'),
-        }
-        level_name, points = level_info[climb_status]
+    elif climb_status in SCOUT_FORM_CONFIG['climb_levels']:
+        level = SCOUT_FORM_CONFIG['climb_levels'][climb_status]
         success_text = "✓ SUCCESSFUL" if climb_successful else "✗ FAILED"
-        endgame_summary = f"TOWER Climbed - {level_name} ({points}) - {success_text}"
+        endgame_summary = f"TOWER Climbed - {level['label']} ({level['points']}pts) - {success_text}"
     else:
         endgame_summary = "Didn't Climb"
 
@@ -1387,6 +1712,11 @@ def submit():
         endgame_summary, partial_match_status, notes
     ]
 
+    return data_row
+
+def write_scouting_rows(rows):
+    """Merge rows into the scouting sheet, grouped under their teams. The sheet
+    is read once and rewritten once however many rows there are."""
     # ---- SHEET CONFIG ----
     sheet_config = get_sheet_config()
     SHEET_NAME   = sheet_config['SHEET_NAME']
@@ -1404,9 +1734,11 @@ def submit():
                 teams_data[team_num] = []
             teams_data[team_num].append(row)
 
-    if team not in teams_data:
-        teams_data[team] = []
-    teams_data[team].append(data_row)
+    for data_row in rows:
+        team = str(data_row[1])
+        if team not in teams_data:
+            teams_data[team] = []
+        teams_data[team].append(data_row)
 
     sheet.values().clear(spreadsheetId=SPREADSHEET_ID, range=f'{SHEET_NAME}!A1:Z1000').execute()
 
@@ -1496,12 +1828,78 @@ def submit():
             body={"requests": format_requests}
         ).execute()
 
+@app.route('/submit', methods=['POST'])
+@login_required
+def submit():
+    write_scouting_rows([build_scouting_row(request.json)])
+
     if 'current_assignment' in session:
         mark_assignment_completed(session['current_assignment'])
         session.pop('current_assignment', None)
 
     return jsonify({'status': 'success'})
 
+# Outbox entry ids already written by /submit/batch, so a batch that is sent
+# again after its response was lost isn't written twice
+SUBMITTED_IDS_KEPT = 5000
+MAX_SUBMIT_BATCH = 50
+_submitted_ids = OrderedDict()
+_submitted_lock = threading.Lock()
+
+@app.route('/submit/batch', methods=['POST'])
+@login_required
+def submit_batch():
+    """Write queued offline reports with one sheet rewrite.
+
+    Body: {"entries": [{"id": ..., "payload": <what /submit takes>}, ...]}.
+    Returns the ids that are done (written now or by an earlier batch) and the
+    ids that can't be written. A report's assignment_key is marked completed
+    when it is one of the submitting scouter's own assignments."""
+    entries = (request.json or {}).get('entries') or []
+    if len(entries) > MAX_SUBMIT_BATCH:
+        return jsonify({'error': f'At most {MAX_SUBMIT_BATCH} entries per batch'}), 400
+
+    done, failed, written = [], [], []
+    rows, assignment_keys = [], []
+    for entry in entries:
+        entry_id = str(entry.get('id') or '')
+        payload = entry.get('payload') or {}
+        with _submitted_lock:
+            already_written = entry_id in _submitted_ids
+        if already_written or entry_id in written:
+            done.append(entry_id)
+            continue
+
+        # write_scouting_rows() orders teams numerically
+        if not entry_id or not str(payload.get('team', '')).strip().isdigit():
+            failed.append(entry_id)
+            continue
+        try:
+            rows.append(build_scouting_row(payload))
+        except Exception as e:
+            print(f"Skipping queued report {entry_id}: {e}")
+            failed.append(entry_id)
+            continue
+        written.append(entry_id)
+        if payload.get('assignment_key'):
+            assignment_keys.append(payload['assignment_key'])
+
+    if rows:
+        try:
+            write_scouting_rows(rows)
+        except Exception as e:
+            print(f"Error writing batch of {len(rows)} reports: {e}")
+            return jsonify({'error': 'Could not write to the sheet'}), 502
+
+        with _submitted_lock:
+            for entry_id in written:
+                _submitted_ids[entry_id] = True
+            while len(_submitted_ids) > SUBMITTED_IDS_KEPT:
+                _submitted_ids.popitem(last=False)
+        mark_assignments_completed(assignment_keys, scouter=session['user_id'])
+
+    return jsonify({'status': 'success', 'done': done + written, 'failed': failed})
+
 # =============================================================================
 # ADMIN ANALYTICS ROUTES
 # =============================================================================
@@ -1547,10 +1945,7 @@ def pit_scout_form():
         return render_template('pit_scout.html', prefill_team=team, prefill_event=event)
     
     # Regular permission check
-    from auth import load_users
-    users = load_users()
-    user = users.get(session['user_id'])
-    if not user or (user.get('role') not in ['pit_scouter', 'admin']):
+    if current_user_role() not in ['pit_scouter', 'admin']:
         return redirect('/dashboard')
     
     team = request.args.get('team', '')
@@ -1731,4 +2126,6 @@ if __name__ == '__main__':
         pass
     print("\n" + "="*60 + "\n")
     
+    schedule.start_refresher()
+    team_directory.start_refresher(tba_client)
     app.run(host='0.0.0.0', port=port)
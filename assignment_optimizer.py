@@ -0,0 +1,269 @@
+# assignment_optimizer.py - Load-balanced match scouting assignments
+"""
+Assigns every (match, team) slot of an event's schedule to a scouter so that:
+
+- everyone ends up with about the same number of matches (least-loaded first)
+- nobody gets two teams in the same match
+- nobody scouts more than max_streak consecutive matches without a break
+- the home team is never scouted, and by default neither are home matches
+  (check_home_team_in_match), since the team is busy with its own robot
+- scouters keep watching the same team when that doesn't unbalance the load,
+  which gives more consistent data per team
+
+Matches are processed in order with a heap of scouters keyed by
+(matches assigned, last match worked). For each match the least-loaded eligible
+scouters are popped, slots go first to candidates that already watched that
+team, and the rest are filled in load order. That is O(matches * log scouters)
+and handles 120 matches x 80 teams x 40 scouters in a few milliseconds.
+
+Existing assignments that are completed or marked as home games are kept as
+they are and count towards their scouter's load. With keep_pending, pending
+ones are kept too and only the unassigned slots are planned.
+"""
+
+import heapq
+
+from database import HOME_TEAM, check_home_team_in_match, get_all_assignments, get_scouter_events, reassign_assignments
+
+MAX_STREAK = 3
+# Candidates within this many matches of the least-loaded pick may be preferred for team continuity
+BALANCE_SLACK = 1
+
+
+class AssignmentPlan:
+    """Result of optimize_assignments()"""
+    __slots__ = ('assignments', 'load', 'uncovered', 'streak_overrides', 'skipped_matches')
+    
+    def __init__(self):
+        self.assignments = []       # (scouter, match_number, team_number) to write
+        self.load = {}              # scouter -> matches assigned (including kept ones)
+        self.uncovered = []         # (match_number, team_number) nobody could take
+        self.streak_overrides = 0   # slots that had to exceed max_streak
+        self.skipped_matches = []   # home matches left out
+    
+    def by_scouter(self):
+        """{scouter: [(match_number, team_number), ...]} for the new assignments"""
+        result = {}
+        for scouter, match_number, team_number in self.assignments:
+            result.setdefault(scouter, []).append((match_number, team_number))
+        return result
+    
+    def summary(self):
+        loads = [count for count in self.load.values() if count]
+        return {
+            'assigned_slots': len(self.assignments),
+            'scouters_used': len(loads),
+            'min_load': min(loads, default=0),
+            'max_load': max(loads, default=0),
+            'uncovered': [{'match_number': n, 'team_number': t} for n, t in self.uncovered],
+            'streak_overrides': self.streak_overrides,
+            'skipped_home_matches': self.skipped_matches
+        }
+
+
+def optimize_assignments(matches, scouters, existing=None, home_team=HOME_TEAM,
+                         skip_home_matches=True, max_streak=MAX_STREAK, balance_slack=BALANCE_SLACK,
+                         keep_pending=False):
+    """Plan assignments for an event.
+    
+    matches:      Match records (any order)
+    scouters:     usernames available for this event
+    existing:     {assignment_key: Assignment} already stored for the event; completed
+                  and home-game assignments are kept and the rest are re-planned
+    keep_pending: keep the pending existing assignments as well
+    """
+    plan = AssignmentPlan()
+    if not scouters:
+        return plan
+    
+    order = {scouter: i for i, scouter in enumerate(scouters)}
+    load = {scouter: 0 for scouter in scouters}
+    streak = {scouter: 0 for scouter in scouters}
+    last_match = {scouter: None for scouter in scouters}
+    watched = {scouter: set() for scouter in scouters}
+    
+    kept = {}
+    for assignment in (existing or {}).values():
+        if not (keep_pending or assignment.completed or assignment.is_home_game):
+            continue
+        # The slot stays taken even if its scouter is no longer in the list
+        kept.setdefault(assignment.match_number, {})[assignment.team_number] = assignment.scouter
+        if assignment.scouter in load:
+            load[assignment.scouter] += 1
+            watched[assignment.scouter].add(assignment.team_number)
+    
+    heap = [(load[s], 0, order[s], s) for s in scouters]
+    heapq.heapify(heap)
+    previous_match = None
+    
+    for match in sorted(matches, key=lambda m: m.match_number):
+        match_number = match.match_number
+        teams = match.all_teams
+        
+        if skip_home_matches and check_home_team_in_match(teams, home_team):
+            plan.skipped_matches.append(match_number)
+            previous_match = match_number  # everyone gets a break
+            continue
+        
+        fixed = kept.get(match_number, {})
+        busy = {scouter for scouter in fixed.values() if scouter in load}
+        open_teams = [t for t in teams if t != home_team and t not in fixed]
+        if not open_teams:
+            for scouter in busy:
+                streak[scouter] = streak[scouter] + 1 if last_match[scouter] == previous_match else 1
+                last_match[scouter] = match_number
+            previous_match = match_number
+            continue
+        
+        # Pop the least-loaded scouters not already in this match; those over the
+        # streak limit are held back unless there is nobody else
+        candidates, held_back, popped = [], [], []
+        cutoff = None
+        while heap:
+            entry = heapq.heappop(heap)
+            popped.append(entry)
+            scouter = entry[3]
+            if scouter in busy:
+                continue
+            if last_match[scouter] == previous_match and streak[scouter] >= max_streak:
+                held_back.append(scouter)
+                continue
+            if len(candidates) == len(open_teams):
+                cutoff = candidates[-1]
+            if cutoff is not None and load[scouter] > load[cutoff] + balance_slack:
+                break
+            candidates.append(scouter)
+            if len(candidates) >= len(open_teams) * 3:
+                break
+        
+        if len(candidates) < len(open_teams):
+            overflow = sorted(held_back, key=lambda s: (streak[s], load[s], order[s]))
+            needed = len(open_teams) - len(candidates)
+            plan.streak_overrides += min(needed, len(overflow))
+            candidates.extend(overflow[:needed])
+        
+        # Continuity first (within the balance slack), then least-loaded
+        chosen = {}
+        remaining = candidates[:]
+        floor = load[remaining[0]] if remaining else 0
+        for team in open_teams:
+            for scouter in remaining:
+                if team in watched[scouter] and load[scouter] <= floor + balance_slack:
+                    chosen[team] = scouter
+                    remaining.remove(scouter)
+                    break
+        for team in open_teams:
+            if team not in chosen and remaining:
+                # Keep the list load-ordered: take the least-loaded left
+                chosen[team] = remaining.pop(0)
+        
+        for team in open_teams:
+            scouter = chosen.get(team)
+            if scouter is None:
+                plan.uncovered.append((match_number, team))
+                continue
+            plan.assignments.append((scouter, match_number, team))
+            load[scouter] += 1
+            watched[scouter].add(team)
+        
+        working = set(chosen.values()) | busy
+        for scouter in working:
+            streak[scouter] = streak[scouter] + 1 if last_match[scouter] == previous_match else 1
+            last_match[scouter] = match_number
+        
+        # Push back everyone we looked at with their updated keys
+        for entry in popped:
+            scouter = entry[3]
+            heapq.heappush(heap, (load[scouter], last_match[scouter] or 0, order[scouter], scouter))
+        previous_match = match_number
+    
+    plan.load = load
+    return plan
+
+
+def _run_length(worked, match_number):
+    """Length of the consecutive-match run match_number would join"""
+    length = 1
+    n = match_number - 1
+    while n in worked:
+        length += 1
+        n -= 1
+    n = match_number + 1
+    while n in worked:
+        length += 1
+        n += 1
+    return length
+
+def plan_reassignment(assignments, removed_scouter, scouters, max_streak=MAX_STREAK):
+    """Move a scouter's pending assignments to the least-loaded available scouters.
+    
+    assignments: {assignment_key: Assignment} for one event
+    scouters:    usernames that can take work (removed_scouter is ignored)
+    Returns ({assignment_key: new_scouter}, [assignment_key, ...] nobody could take).
+    Completed and home-game assignments are left with the removed scouter, so
+    finished work keeps its history. Only the affected slots are looked at;
+    everyone else's assignments are untouched.
+    """
+    affected = sorted(
+        (a for a in assignments.values()
+         if a.scouter == removed_scouter and not a.completed and not a.is_home_game),
+        key=lambda a: a.match_number
+    )
+    if not affected:
+        return {}, []
+    
+    pool = [s for s in scouters if s != removed_scouter]
+    order = {scouter: i for i, scouter in enumerate(pool)}
+    load = {scouter: 0 for scouter in pool}
+    worked = {scouter: set() for scouter in pool}
+    for assignment in assignments.values():
+        if assignment.scouter in load:
+            load[assignment.scouter] += 1
+            worked[assignment.scouter].add(assignment.match_number)
+    
+    heap = [(load[s], order[s], s) for s in pool]
+    heapq.heapify(heap)
+    changes, unassigned = {}, []
+    
+    for assignment in affected:
+        match_number = assignment.match_number
+        popped, choice, fallback = [], None, None
+        while heap:
+            entry = heapq.heappop(heap)
+            popped.append(entry)
+            scouter = entry[2]
+            if match_number in worked[scouter]:
+                continue  # already scouting someone in this match
+            if _run_length(worked[scouter], match_number) > max_streak:
+                fallback = fallback or scouter
+                continue
+            choice = scouter
+            break
+        
+        choice = choice or fallback
+        if choice is None:
+            unassigned.append(assignment.key)
+        else:
+            changes[assignment.key] = choice
+            load[choice] += 1
+            worked[choice].add(match_number)
+        
+        for entry in popped:
+            scouter = entry[2]
+            heapq.heappush(heap, (load[scouter], order[scouter], scouter))
+    
+    return changes, unassigned
+
+def rebalance_scouter(removed_scouter, scouters, event_keys=None):
+    """Reassign a scouter's pending work in every active event they appear in.
+    
+    Each event is one shard read and one write of only the changed records.
+    Returns {event_key: {'reassigned': n, 'unassigned': [keys]}}."""
+    report = {}
+    for event_key in event_keys or get_scouter_events(removed_scouter):
+        changes, unassigned = plan_reassignment(get_all_assignments(event_key), removed_scouter, scouters)
+        report[event_key] = {
+            'reassigned': reassign_assignments(event_key, changes),
+            'unassigned': unassigned
+        }
+    return report
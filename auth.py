@@ -2,9 +2,9 @@ from flask import session, request, jsonify
 from functools import wraps
 import hashlib
 import secrets
-import json
 import os
 from dev_mode import get_data_file, is_dev_user
+from fast_json import dump_file, load_file
 
 from team_scouters import get_team_scouters
 
@@ -23,23 +23,49 @@ DEFAULT_PIT_SCOUTER = {
     'name': 'Pit Scouter'
 }
 
+# Team scouters are fixed at deploy time, so the merge set is built once at startup
+TEAM_SCOUTER_ACCOUNTS = get_team_scouters()
+
+# users_file -> (mtime_ns, users); reloaded only when the file changes on disk
+_users_cache = {}
+
+def _users_file():
+    return get_data_file('users') if is_dev_user() else USERS_FILE
+
+def _file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
 def load_users():
-    """Load users from JSON file"""
-    users_file = get_data_file('users') if is_dev_user() else USERS_FILE
+    """Load users, served from memory unless users.json changed since the last read.
+    The returned dict is shared - copy it before modifying."""
+    users_file = _users_file()
+    mtime = _file_mtime(users_file)
+    cached = _users_cache.get(users_file)
+    if cached and mtime is not None and cached[0] == mtime:
+        return cached[1]
+    
+    users = _read_users_file(users_file)
+    if _file_mtime(users_file) == mtime:
+        _users_cache[users_file] = (mtime, users)
+    return users
+
+def _read_users_file(users_file):
+    """Read users.json, adding any missing built-in accounts"""
     if not os.path.exists(users_file):
         users = {
             'admin': DEFAULT_ADMIN,
             'pit': DEFAULT_PIT_SCOUTER
         }
-        team_scouters = get_team_scouters()
-        users.update(team_scouters)
+        users.update(TEAM_SCOUTER_ACCOUNTS)
         save_users(users)
-        print(f"Created {len(team_scouters)} team scouters")
+        print(f"Created {len(TEAM_SCOUTER_ACCOUNTS)} team scouters")
         return users
     
     try:
-        with open(users_file, 'r') as f:
-            existing_users = json.load(f)
+        existing_users = load_file(users_file)
         
         users_updated = False
         
@@ -52,8 +78,7 @@ def load_users():
             users_updated = True
             print("Added pit scouter account")
         
-        team_scouters = get_team_scouters()
-        for username, scouter_data in team_scouters.items():
+        for username, scouter_data in TEAM_SCOUTER_ACCOUNTS.items():
             if username not in existing_users:
                 existing_users[username] = scouter_data
                 users_updated = True
@@ -65,16 +90,30 @@ def load_users():
         return existing_users
     except:
         users = {'admin': DEFAULT_ADMIN}
-        team_scouters = get_team_scouters()
-        users.update(team_scouters)
+        users.update(TEAM_SCOUTER_ACCOUNTS)
         save_users(users)
         return users
 
 def save_users(users):
-    """Save users to JSON file"""
-    users_file = get_data_file('users') if is_dev_user() else USERS_FILE
-    with open(users_file, 'w') as f:
-        json.dump(users, f, indent=2)
+    """Save users to JSON file and refresh the in-memory table"""
+    users_file = _users_file()
+    dump_file(users, users_file)
+    _users_cache[users_file] = (_file_mtime(users_file), users)
+
+def get_user_role(username):
+    """Look up a user's role from the cached user table"""
+    user = load_users().get(username)
+    return user.get('role') if user else None
+
+def current_user_role():
+    """Role of the logged-in user, stored in the session at login.
+    Sessions created before roles were stored fall back to one cached lookup."""
+    if 'user_id' not in session:
+        return None
+    
+    if 'role' not in session:
+        session['role'] = get_user_role(session['user_id'])
+    return session['role']
 
 def hash_password(password):
     """Hash a password"""
@@ -103,10 +142,8 @@ def admin_required(f):
         if is_dev_user():
             return f(*args, **kwargs)
         
-        # Then check regular admin
-        users = load_users()
-        user = users.get(session['user_id'])
-        if not user or user.get('role') != 'admin':
+        # Then check regular admin (role was stored in the session at login)
+        if current_user_role() != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
         return f(*args, **kwargs)
@@ -123,7 +160,7 @@ def authenticate_user(username, password):
 
 def create_scouter(username, password, name):
     """Create a new scouter account"""
-    users = load_users()
+    users = dict(load_users())
     
     if username in users:
         return False, "Username already exists"
@@ -155,7 +192,7 @@ def delete_scouter(username):
     if username == 'dev':
         return False
     
-    users = load_users()
+    users = dict(load_users())
     if username in users and users[username].get('role') == 'scouter':
         del users[username]
         save_users(users)
@@ -167,7 +204,7 @@ def create_bulk_scouters(scouters_list):
     Create multiple scouters at once
     scouters_list should be a list of dictionaries with keys: 'username', 'password', 'name'
     """
-    users = load_users()
+    users = dict(load_users())
     created_count = 0
     errors = []
     
@@ -0,0 +1,46 @@
+# bench_json.py - Encode/decode timing for a full-event payload
+"""
+Compares the old stdlib path (json.dumps with indent=2, as the data files were
+written) against fast_json (orjson when installed, compact stdlib otherwise)
+on the payloads behind /api/admin/analytics/data, /api/admin/assignments and
+/api/admin/matches for one 80-match event.
+
+Run from the repo root:  python benchmarks/bench_json.py
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fast_json
+from bench_records import build_dicts, raw_tba_matches
+
+ROUNDS = 50
+
+def bench(label, func):
+    seconds = min(timeit.repeat(func, number=ROUNDS, repeat=3)) / ROUNDS
+    print(f"  {label:<28}{seconds * 1000:>9.3f} ms")
+
+if __name__ == '__main__':
+    matches, assignments, entries = build_dicts(raw_tba_matches())
+    payloads = {
+        'analytics/data': entries,
+        'assignments': [{'assignment_key': k, **v} for k, v in assignments.items()],
+        'matches': matches
+    }
+    backend = 'orjson' if fast_json.orjson is not None else 'stdlib (orjson not installed)'
+    print(f"fast_json backend: {backend}\n")
+
+    for name, payload in payloads.items():
+        indented = json.dumps(payload, indent=2)
+        compact = fast_json.dumps_bytes(payload)
+        print(f"/api/admin/{name}: {len(payload)} items, "
+              f"{len(indented) / 1024:.1f} KB indented -> {len(compact) / 1024:.1f} KB compact")
+        bench('encode json indent=2', lambda: json.dumps(payload, indent=2))
+        bench('encode fast_json', lambda: fast_json.dumps_bytes(payload))
+        bench('decode json', lambda: json.loads(indented))
+        bench('decode fast_json', lambda: fast_json.loads(compact))
+        print()
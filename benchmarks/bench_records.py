@@ -0,0 +1,99 @@
+# bench_records.py - Memory/allocation comparison: nested dicts vs slotted records
+"""
+Builds a full-event data set (80 qualification matches, 480 assignments and
+600 analytics entries) once as the old nested dicts and once as the records
+from records.py, and reports the memory retained by each with tracemalloc.
+
+Run from the repo root:  python benchmarks/bench_records.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Assignment, Match, ScoutEntry
+
+MATCH_COUNT = 80
+EVENT_KEY = '2026njfla'
+TEAMS = [str(team) for team in range(100, 10000, 233)][:40]
+
+def raw_tba_matches():
+    """TBA-shaped match payloads (what /event/{key}/matches returns)"""
+    matches = []
+    for n in range(1, MATCH_COUNT + 1):
+        teams = [TEAMS[(n * 7 + i * 5) % len(TEAMS)] for i in range(6)]
+        matches.append({
+            'key': f'{EVENT_KEY}_qm{n}',
+            'comp_level': 'qm',
+            'match_number': n,
+            'alliances': {
+                'red': {'team_keys': [f'frc{t}' for t in teams[:3]]},
+                'blue': {'team_keys': [f'frc{t}' for t in teams[3:]]}
+            },
+            'predicted_time': 1760000000 + n * 420,
+            'actual_time': None,
+            'time': 1760000000 + n * 420
+        })
+    return matches
+
+def build_dicts(raw_matches):
+    matches = []
+    for match in raw_matches:
+        red = [t.replace('frc', '') for t in match['alliances']['red']['team_keys']]
+        blue = [t.replace('frc', '') for t in match['alliances']['blue']['team_keys']]
+        matches.append({
+            'key': match['key'], 'match_number': match['match_number'],
+            'red_teams': red, 'blue_teams': blue, 'all_teams': red + blue,
+            'predicted_time': match['predicted_time'], 'actual_time': None, 'time': match['time']
+        })
+    assignments = {}
+    entries = []
+    for match in matches:
+        for i, team in enumerate(match['all_teams']):
+            assignments[f"{EVENT_KEY}_qm{match['match_number']}_{team}"] = {
+                'scouter': f'scouter{i}', 'event_key': EVENT_KEY,
+                'match_number': match['match_number'], 'team_number': team,
+                'assigned_at': datetime.now().isoformat(), 'completed': False
+            }
+            entries.append({
+                'team': team, 'match': match['match_number'], 'scouterName': f'Scouter {i}',
+                'submissionTime': datetime.now().isoformat(), 'event': 'RebuiltTestV1',
+                'auto': {'score': 3}, 'teleop': {'score': 10}, 'endgame': {'score': 10},
+                'totalScore': 23, 'notes': '', 'partialMatch': False
+            })
+    return matches, assignments, entries
+
+def build_records(raw_matches):
+    matches = [Match.from_tba(match) for match in raw_matches]
+    assignments = {}
+    entries = []
+    for match in matches:
+        for i, team in enumerate(match.all_teams):
+            assignment = Assignment(f'scouter{i}', EVENT_KEY, match.match_number, team)
+            assignments[assignment.key] = assignment
+            entries.append(ScoutEntry(
+                team, match.match_number, f'Scouter {i}', time.time(), 'RebuiltTestV1',
+                {'score': 3}, {'score': 10}, {'score': 10}, 23
+            ))
+    return matches, assignments, entries
+
+def measure(builder, raw_matches):
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = builder(raw_matches)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current, peak, elapsed
+
+if __name__ == '__main__':
+    raw_matches = raw_tba_matches()
+    print(f"{'':<10}{'retained KB':>14}{'peak KB':>12}{'build ms':>12}")
+    for label, builder in (('dicts', build_dicts), ('records', build_records)):
+        current, peak, elapsed = measure(builder, raw_matches)
+        print(f"{label:<10}{current / 1024:>14.1f}{peak / 1024:>12.1f}{elapsed * 1000:>12.2f}")
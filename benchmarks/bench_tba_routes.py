@@ -0,0 +1,103 @@
+# bench_tba_routes.py - Timing for the TBA-dependent admin routes against the stand-in
+"""
+Starts tools/tba_standin.py in-process (80-match schedule, configurable
+latency and error rate), points the app at it with TBA_BASE_URL and times
+/api/admin/matches, /api/admin/teams and /api/admin/auto-assign through the
+Flask test client:
+
+- cold: schedule cache and TBA response cache cleared before every call
+- warm: caches kept between calls (what a polling dashboard sees)
+
+Also reports how many requests each call made to the stand-in. Runs in a
+temporary data directory, so no real users/assignments are touched. Needs the
+same environment as the app itself (GOOGLE_CREDENTIALS).
+
+Run from the repo root:  python benchmarks/bench_tba_routes.py --latency 150
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+
+from tba_standin import start_in_thread
+
+EVENT_KEY = '2026sim01'
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run(client, method, url, json=None):
+    if method == 'POST':
+        response = client.post(url, json=json)
+    else:
+        response = client.get(url)
+    assert response.status_code == 200, (url, response.status_code, response.get_data(as_text=True)[:200])
+    return response
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=150, help='stand-in latency per request (ms)')
+    parser.add_argument('--jitter', type=float, default=30)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--event', default=EVENT_KEY)
+    args = parser.parse_args()
+    
+    server = start_in_thread(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    workdir = tempfile.mkdtemp(prefix='bench_tba_')
+    os.environ['TBA_BASE_URL'] = server.base_url
+    os.environ['TBA_CACHE_DIR'] = os.path.join(workdir, 'tba_cache')
+    os.environ.setdefault('TBA_API_KEY', 'benchmark')
+    os.chdir(workdir)
+    
+    import app as app_module
+    import schedule
+    
+    def clear_caches():
+        schedule.invalidate_schedule()
+        app_module.tba_client.cache._entries.clear()
+        shutil.rmtree(os.environ['TBA_CACHE_DIR'], ignore_errors=True)
+    
+    client = app_module.app.test_client()
+    run(client, 'POST', '/api/login', {'username': 'admin', 'password': 'admin6897'})
+    
+    routes = [
+        ('matches', 'GET', f'/api/admin/matches?event={args.event}', None),
+        ('teams', 'GET', f'/api/admin/teams?event={args.event}', None),
+        ('auto-assign', 'POST', '/api/admin/auto-assign', {'event_key': args.event})
+    ]
+    
+    print(f"stand-in: {server.base_url}  latency {args.latency}±{args.jitter} ms, "
+          f"errors {args.error_rate:.0%}, {args.rounds} rounds\n")
+    print(f"{'route':<14}{'cache':<7}{'mean ms':>10}{'p95 ms':>10}{'TBA req/call':>14}")
+    
+    try:
+        for name, method, url, body in routes:
+            for scenario in ('cold', 'warm'):
+                clear_caches()
+                if scenario == 'warm':
+                    run(client, method, url, body)
+                timings = []
+                requests_before = server.total_requests()
+                for _ in range(args.rounds):
+                    if scenario == 'cold':
+                        clear_caches()
+                    start = time.perf_counter()
+                    run(client, method, url, body)
+                    timings.append((time.perf_counter() - start) * 1000)
+                per_call = (server.total_requests() - requests_before) / args.rounds
+                print(f"{name:<14}{scenario:<7}{statistics.mean(timings):>10.1f}"
+                      f"{percentile(timings, 0.95):>10.1f}{per_call:>14.1f}")
+    finally:
+        server.shutdown()
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
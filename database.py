@@ -1,230 +1,772 @@
-import json
+import bisect
 import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from dev_mode import get_data_file, is_dev_user
+from urllib.parse import quote, unquote
+from dev_mode import get_data_dir, is_dev_user
+from records import Assignment
+from fast_json import dump_file, load_file
 
-ASSIGNMENTS_FILE = 'assignments.json'
+# Assignments are sharded by event: one JSON document per event_key inside
+# ASSIGNMENTS_DIR, so working on this weekend's event never loads or rewrites
+# past events. Finished events can be moved into the archive subdirectory.
+ASSIGNMENTS_DIR = 'assignments'
+ARCHIVE_SUBDIR = 'archive'
+# Each shard's counters are also written to a small file in this subdirectory,
+# so stats reads don't parse and rebuild every assignment in the shard
+STATS_SUBDIR = 'stats'
 
-def load_assignments():
-    """Load scouter assignments from JSON file"""
-    # Use dev file if dev user, otherwise use normal file
-    assignments_file = get_data_file('assignments') if is_dev_user() else ASSIGNMENTS_FILE
-    
-    if not os.path.exists(assignments_file):
-        return {}
+# Our own team: never scouted, and its matches are skipped by the planners
+HOME_TEAM = '6897'
+
+# Pre-sharding single-file storage, migrated into shards on first access
+LEGACY_ASSIGNMENTS_FILE = 'assignments.json'
+DEV_LEGACY_ASSIGNMENTS_FILE = 'dev_assignments.json'
+
+# Called with (event_key, upserted {key: Assignment}, removed [keys], version,
+# previous {key: scouter before}) after each shard write
+_assignment_listeners = []
+
+# Versions and change log: every shard write that changes something takes the
+# next store-wide version and appends (version, key, previous scouter) for each
+# key it touched to the shard's log, so clients can ask for what changed since
+# the version they last saw. Versions start from the clock in milliseconds, so
+# they keep increasing across restarts and across a shard being dropped and
+# recreated. Only the last CHANGE_LOG_LIMIT entries are kept per shard; clients
+# further behind than that get the full set again.
+CHANGE_LOG_LIMIT = 2000
+_version_lock = threading.Lock()
+_last_version = int(time.time() * 1000)
+
+# One writer per shard: every load_assignments_for_update() ... save_assignments()
+# sequence runs inside _event_write_lock(event_key), so concurrent writers
+# (requests, the reconcile worker, webhook and refresher threads) can't
+# overwrite each other's changes or lose each other's change-log entries
+_event_locks = {}
+_event_locks_guard = threading.Lock()
+_migrate_lock = threading.Lock()
+
+
+class ShardAssignments(dict):
+    """One event's {assignment_key: Assignment} plus its version and change log;
+    remembers the keys written or removed through _put_assignment/_pop_assignment
+    since it was loaded"""
+    __slots__ = ('changed', 'version', 'log', 'log_start')
+    
+    def __init__(self, *args, version=0, log=None, log_start=0):
+        super().__init__(*args)
+        self.changed = {}  # key -> scouter it had when loaded (None if new)
+        self.version = version
+        self.log = log if log is not None else []  # [[version, key, previous scouter], ...] oldest first
+        self.log_start = log_start                 # history before this version is incomplete
+
+def add_assignment_listener(callback):
+    """Call callback(event_key, upserted, removed, version, previous) after every assignment write.
     
+    upserted maps each written key to its new Assignment, removed lists the
+    deleted keys and previous maps every touched key to the scouter it had
+    before the write (None for new keys). Runs on the writing thread, inside its request if any."""
+    _assignment_listeners.append(callback)
+
+def _notify_assignment_listeners(event_key, upserted, removed, version, previous):
+    if not (upserted or removed):
+        return
+    for listener in list(_assignment_listeners):
+        try:
+            listener(event_key, upserted, removed, version, previous)
+        except Exception as e:
+            print(f"Assignment listener failed for {event_key}: {e}")
+
+def _next_version():
+    """Next store-wide version (call with _version_lock held)"""
+    global _last_version
+    _last_version = max(_last_version + 1, int(time.time() * 1000))
+    return _last_version
+
+def current_assignment_version():
+    """Latest version handed out; every write up to it is already on disk"""
+    with _version_lock:
+        return _last_version
+
+def _assignments_dir():
+    """Directory holding the per-event assignment shards"""
+    return get_data_dir('assignments') if is_dev_user() else ASSIGNMENTS_DIR
+
+def _shard_path(event_key, archived=False):
+    """Path of the shard file for an event (event key is escaped for the filesystem)"""
+    base_dir = _assignments_dir()
+    if archived:
+        base_dir = os.path.join(base_dir, ARCHIVE_SUBDIR)
+    return os.path.join(base_dir, f"{quote(str(event_key), safe='')}.json")
+
+def _stats_path(event_key):
+    """Path of the counters file for an active event's shard"""
+    return os.path.join(_assignments_dir(), STATS_SUBDIR, f"{quote(str(event_key), safe='')}.json")
+
+@contextmanager
+def _event_write_lock(event_key):
+    """Hold an event's shard from loading it for a mutation until it is saved"""
+    # Migration writes other shards, so it runs before any shard lock is taken
+    _migrate_legacy_assignments()
+    shard_file = _shard_path(event_key)  # dev data has its own shards and locks
+    with _event_locks_guard:
+        lock = _event_locks.get(shard_file)
+        if lock is None:
+            lock = _event_locks[shard_file] = threading.RLock()
+    with lock:
+        yield
+
+def event_key_from_assignment_key(assignment_key):
+    """Recover the event key from an '{event}_qm{match}_{team}' assignment key"""
+    return assignment_key.rsplit('_', 2)[0]
+
+def _migrate_legacy_assignments():
+    """Split a pre-sharding assignments.json into per-event shards (runs once)"""
+    legacy_file = DEV_LEGACY_ASSIGNMENTS_FILE if is_dev_user() else LEGACY_ASSIGNMENTS_FILE
+    if not os.path.exists(legacy_file):
+        return
+    
+    with _migrate_lock:
+        if os.path.exists(legacy_file):
+            _migrate_legacy_file(legacy_file)
+
+def _migrate_legacy_file(legacy_file):
     try:
-        with open(assignments_file, 'r') as f:
-            return json.load(f)
+        legacy_assignments = load_file(legacy_file)
     except:
-        return {}
-
-def save_assignments(assignments):
-    """Save assignments to JSON file"""
-    # Use dev file if dev user, otherwise use normal file
-    assignments_file = get_data_file('assignments') if is_dev_user() else ASSIGNMENTS_FILE
+        legacy_assignments = {}
     
-    with open(assignments_file, 'w') as f:
-        json.dump(assignments, f, indent=2)
+    by_event = {}
+    for assignment_key, assignment in legacy_assignments.items():
+        event_key = assignment.get('event_key') or event_key_from_assignment_key(assignment_key)
+        by_event.setdefault(event_key, {})[assignment_key] = Assignment.from_dict(assignment)
+    
+    for event_key, event_assignments in by_event.items():
+        assignments, stats = _load_shard(event_key)
+        for assignment_key, assignment in event_assignments.items():
+            _put_assignment(assignments, stats, assignment_key, assignment)
+        save_assignments(event_key, assignments, stats)
+    
+    os.replace(legacy_file, legacy_file + '.migrated')
+    print(f"Migrated {len(legacy_assignments)} assignments into {len(by_event)} event shards")
 
-def assign_scouter_to_team(scouter_username, event_key, match_number, team_number):
-    """Assign a scouter to scout a specific team in a match"""
-    assignments = load_assignments()
+def _load_shard(event_key):
+    """Load one event's shard as ({key: Assignment}, stats)"""
+    shard_file = _shard_path(event_key)
     
-    assignment_key = f"{event_key}_qm{match_number}_{team_number}"
+    if not os.path.exists(shard_file):
+        return ShardAssignments(), {}
     
-    if assignment_key not in assignments:
-        assignments[assignment_key] = {}
+    try:
+        shard = load_file(shard_file)
+    except:
+        return ShardAssignments(), {}
+    
+    assignments = ShardAssignments(
+        ((k, Assignment.from_dict(v)) for k, v in shard.get('assignments', {}).items()),
+        version=shard.get('version', 0),
+        log=shard.get('log'),
+        log_start=shard.get('log_start', 0)
+    )
+    stats = shard.get('stats')
+    if stats is None:
+        stats = build_scouter_stats(assignments)
+    return assignments, stats
+
+def load_assignments(event_key=None):
+    """Load scouter assignments for one event, or merged across all active events"""
+    _migrate_legacy_assignments()
     
-    assignments[assignment_key] = {
-        'scouter': scouter_username,
-        'event_key': event_key,
-        'match_number': match_number,
-        'team_number': team_number,
-        'assigned_at': datetime.now().isoformat(),
-        'completed': False
-    }
+    if event_key:
+        return _load_shard(event_key)[0]
     
-    save_assignments(assignments)
-    return True
+    assignments = {}
+    for active_event in list_assignment_events():
+        assignments.update(_load_shard(active_event)[0])
+    return assignments
+
+def load_assignments_for_update(event_key):
+    """Load one event's assignments together with their counters for a mutation"""
+    _migrate_legacy_assignments()
+    return _load_shard(event_key)
+
+def save_assignments(event_key, assignments, stats=None):
+    """Save one event's shard (an empty shard is removed) and tell the listeners what changed"""
+    shard_file = _shard_path(event_key)
+    changed = getattr(assignments, 'changed', ())
+    upserted = {k: assignments[k] for k in changed if k in assignments}
+    removed = [k for k in changed if k not in assignments]
+    if changed:
+        assignments.changed = {}
+    
+    # Version, log and file write happen together so a reader's version never
+    # runs ahead of what is on disk
+    with _version_lock:
+        version = _next_version() if changed else getattr(assignments, 'version', 0)
+        
+        if not assignments:
+            for path in (shard_file, _stats_path(event_key)):
+                if os.path.exists(path):
+                    os.remove(path)
+        else:
+            if stats is None:
+                stats = build_scouter_stats(assignments)
+            
+            log = getattr(assignments, 'log', [])
+            log_start = getattr(assignments, 'log_start', 0)
+            if changed:
+                if not os.path.exists(shard_file):
+                    # New (or recreated) shard: nobody can catch up from before it
+                    log_start = version - 1
+                log.extend([version, key, changed[key]] for key in sorted(changed))
+                if len(log) > CHANGE_LOG_LIMIT:
+                    log_start = max(log_start, log[-CHANGE_LOG_LIMIT - 1][0])
+                    del log[:-CHANGE_LOG_LIMIT]
+                assignments.version = version
+                assignments.log_start = log_start
+            
+            os.makedirs(os.path.dirname(shard_file), exist_ok=True)
+            tmp_file = shard_file + '.tmp'
+            dump_file({
+                'event_key': event_key,
+                'assignments': {k: a.to_dict() for k, a in assignments.items()},
+                'stats': stats,
+                'version': version,
+                'log': log,
+                'log_start': log_start
+            }, tmp_file)
+            os.replace(tmp_file, shard_file)
+            _write_stats(event_key, stats)
+    
+    _notify_assignment_listeners(event_key, upserted, removed, version, changed)
+
+def _shard_changes(assignments, since, version):
+    """(reset, {changed key: scouters it had before}) for a loaded shard
+    between `since` and `version`"""
+    # No log means the shard is gone (last assignment removed, event cleared or
+    # archived) or predates versioning: nothing to catch up from, so whatever
+    # the client holds is replaced (with nothing, for a deleted shard)
+    if since <= 0 or not assignments.log or since < assignments.log_start or since > version:
+        return True, None
+    # Log entries are [version, key, scouter]; this sorts after every entry at `since`
+    start = bisect.bisect_right(assignments.log, [since, '\uffff'])
+    changed = {}
+    for _, key, previous_scouter in assignments.log[start:]:
+        changed.setdefault(key, set()).add(previous_scouter)
+    return False, changed
+
+def get_assignment_changes(event_key, since=0):
+    """What changed in an event's assignments after version `since`.
+    
+    Returns (version, reset, upserted {key: Assignment}, removed [keys]).
+    reset means `since` is too old (or 0) to catch up from and upserted holds
+    the whole set, which replaces whatever the client had."""
+    version = current_assignment_version()
+    assignments = load_assignments(event_key)
+    
+    reset, changed = _shard_changes(assignments, since, version)
+    if reset:
+        return version, True, dict(assignments), []
+    return (version, False,
+            {k: assignments[k] for k in changed if k in assignments},
+            sorted(k for k in changed if k not in assignments))
+
+def load_event_snapshot(event_key):
+    """One read of an event's shard: (version, {key: Assignment}, stats).
+    
+    Everything an admin dashboard shows about the event's assignments can be
+    built from this, so the parts can't disagree with each other."""
+    _migrate_legacy_assignments()
+    version = current_assignment_version()
+    assignments, stats = _load_shard(event_key)
+    return version, assignments, stats
+
+def list_assignment_events():
+    """Event keys that have an active (non-archived) assignment shard"""
+    assignments_dir = _assignments_dir()
+    if not os.path.isdir(assignments_dir):
+        return []
+    
+    return sorted(
+        unquote(name[:-len('.json')])
+        for name in os.listdir(assignments_dir)
+        if name.endswith('.json')
+    )
+
+def list_archived_events():
+    """Event keys whose assignment shards have been archived"""
+    archive_dir = os.path.join(_assignments_dir(), ARCHIVE_SUBDIR)
+    if not os.path.isdir(archive_dir):
+        return []
+    
+    return sorted(
+        unquote(name[:-len('.json')])
+        for name in os.listdir(archive_dir)
+        if name.endswith('.json')
+    )
+
+def archive_event_assignments(event_key):
+    """Move an event's shard out of the active set (kept on disk, never loaded by hot paths)"""
+    _migrate_legacy_assignments()
+    shard_file = _shard_path(event_key)
+    
+    with _event_write_lock(event_key):
+        if not os.path.exists(shard_file):
+            return False
+        
+        archive_file = _shard_path(event_key, archived=True)
+        os.makedirs(os.path.dirname(archive_file), exist_ok=True)
+        shutil.move(shard_file, archive_file)
+        # The archived shard keeps its own copy of the counters
+        if os.path.exists(_stats_path(event_key)):
+            os.remove(_stats_path(event_key))
+        return True
+
+def restore_archived_event(event_key):
+    """Bring an archived event's shard back into the active set"""
+    archive_file = _shard_path(event_key, archived=True)
+    
+    with _event_write_lock(event_key):
+        if not os.path.exists(archive_file) or os.path.exists(_shard_path(event_key)):
+            return False
+        
+        shutil.move(archive_file, _shard_path(event_key))
+        _write_stats(event_key, _load_shard(event_key)[1])
+        return True
+
+# =============================================================================
+# MATERIALIZED SCOUTER COUNTERS
+# =============================================================================
+# Each shard carries stats: {scouter: {'assigned': n, 'completed': n, 'home_games': n}}.
+# Every mutation below adjusts these counters in place, and save_assignments()
+# copies them to the event's file in STATS_SUBDIR, so the admin stats endpoint
+# never has to scan (or even load) the assignments.
+
+def _write_stats(event_key, stats):
+    """Write an event's counters file next to its shard"""
+    stats_file = _stats_path(event_key)
+    os.makedirs(os.path.dirname(stats_file), exist_ok=True)
+    tmp_file = stats_file + '.tmp'
+    dump_file(stats, tmp_file)
+    os.replace(tmp_file, stats_file)
+
+def _load_stats(event_key):
+    """An event's counters, without loading its assignments"""
+    try:
+        return load_file(_stats_path(event_key))
+    except:
+        # Shards written before the counters files existed (or a damaged file)
+        return _load_shard(event_key)[1]
+
+def _count_assignment(stats, assignment, delta):
+    """Add (delta=1) or remove (delta=-1) one assignment's contribution to the counters"""
+    if not assignment:
+        return
+    
+    scouter = assignment.scouter
+    counters = stats.setdefault(scouter, {'assigned': 0, 'completed': 0, 'home_games': 0})
+    
+    counters['assigned'] += delta
+    if assignment.completed:
+        counters['completed'] += delta
+    if assignment.is_home_game:
+        counters['home_games'] += delta
+    
+    if counters['assigned'] <= 0:
+        del stats[scouter]
+
+def build_scouter_stats(assignments):
+    """Rebuild a shard's counters from scratch with a single pass over its assignments"""
+    stats = {}
+    for assignment in assignments.values():
+        _count_assignment(stats, assignment, 1)
+    return stats
+
+def _put_assignment(assignments, stats, assignment_key, assignment):
+    """Insert or replace an assignment, keeping the counters in step"""
+    previous = assignments.get(assignment_key)
+    _count_assignment(stats, previous, -1)
+    assignments[assignment_key] = assignment
+    _count_assignment(stats, assignment, 1)
+    if isinstance(assignments, ShardAssignments):
+        assignments.changed.setdefault(assignment_key, previous.scouter if previous else None)
+
+def _pop_assignment(assignments, stats, assignment_key):
+    """Remove an assignment, keeping the counters in step"""
+    assignment = assignments.pop(assignment_key)
+    _count_assignment(stats, assignment, -1)
+    if isinstance(assignments, ShardAssignments):
+        assignments.changed.setdefault(assignment_key, assignment.scouter)
+    return assignment
+
+def get_scouter_counters(event_key=None):
+    """Get per-scouter assigned/completed/home-game counts, optionally for one event"""
+    _migrate_legacy_assignments()
+    
+    if event_key:
+        return _load_stats(event_key)
+    
+    totals = {}
+    for active_event in list_assignment_events():
+        for scouter, counters in _load_stats(active_event).items():
+            scouter_totals = totals.setdefault(scouter, {'assigned': 0, 'completed': 0, 'home_games': 0})
+            for name, value in counters.items():
+                scouter_totals[name] += value
+    return totals
+
+# =============================================================================
+# ASSIGNMENT OPERATIONS
+# =============================================================================
+
+def assign_scouter_to_team(scouter_username, event_key, match_number, team_number):
+    """Assign a scouter to scout a specific team in a match"""
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        
+        assignment_key = f"{event_key}_qm{match_number}_{team_number}"
+        
+        _put_assignment(assignments, stats, assignment_key, Assignment(
+            scouter=scouter_username,
+            event_key=event_key,
+            match_number=match_number,
+            team_number=team_number
+        ))
+        
+        save_assignments(event_key, assignments, stats)
+        return True
 
 def bulk_assign_team_to_scouter(scouter_username, event_key, team_number):
     """Assign a scouter to scout a specific team across ALL matches for that event"""
-    from manual_matches import is_manual_event, get_manual_event_matches
-    
-    if is_manual_event(event_key):
-        matches = get_manual_event_matches(event_key)
-    else:
-        from tba_api import TBAClient
-        tba_client = TBAClient()
-        matches = tba_client.get_event_matches(event_key)
+    from schedule import get_event_schedule
     
-    if not matches:
+    schedule = get_event_schedule(event_key)
+    if not schedule.matches:
         return False, "Could not load matches for this event"
     
-    assignments = load_assignments()
-    assigned_matches = []
-    
-    for match in matches:
-        if team_number in match['all_teams']:
-            assignment_key = f"{event_key}_qm{match['match_number']}_{team_number}"
-            
-            assignments[assignment_key] = {
-                'scouter': scouter_username,
-                'event_key': event_key,
-                'match_number': match['match_number'],
-                'team_number': team_number,
-                'assigned_at': datetime.now().isoformat(),
-                'completed': False
-            }
-            assigned_matches.append(match['match_number'])
-    
-    save_assignments(assignments)
-    return True, f"Assigned {scouter_username} to team {team_number} for {len(assigned_matches)} matches"
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        assigned_matches = []
+        
+        for match_number in schedule.team_matches.get(team_number, ()):
+            assignment_key = f"{event_key}_qm{match_number}_{team_number}"
+        
+            _put_assignment(assignments, stats, assignment_key, Assignment(
+                scouter=scouter_username,
+                event_key=event_key,
+                match_number=match_number,
+                team_number=team_number
+            ))
+            assigned_matches.append(match_number)
+        
+        save_assignments(event_key, assignments, stats)
+        return True, f"Assigned {scouter_username} to team {team_number} for {len(assigned_matches)} matches"
+
+def apply_assignment_plan(event_key, plan, replace_pending=False, overwrite_pending=False):
+    """Write a whole assignment plan with one load and one save of the event's shard
+    plan: iterable of (scouter_username, match_number, team_number)
+    replace_pending: drop the event's other pending assignments first
+    overwrite_pending: planned slots replace the pending assignment already there
+    Otherwise slots that already have an assignment are skipped; completed and
+    home-game assignments are always kept. Returns how many slots were written."""
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        assigned_at = datetime.now().timestamp()
+        count = 0
+        
+        if replace_pending:
+            for assignment_key in [k for k, a in assignments.items() if not (a.completed or a.is_home_game)]:
+                _pop_assignment(assignments, stats, assignment_key)
+        
+        for scouter_username, match_number, team_number in plan:
+            assignment_key = f"{event_key}_qm{match_number}_{team_number}"
+            current = assignments.get(assignment_key)
+            if current and (current.completed or current.is_home_game or not overwrite_pending):
+                continue
+            _put_assignment(assignments, stats, assignment_key, Assignment(
+                scouter=scouter_username,
+                event_key=event_key,
+                match_number=match_number,
+                team_number=team_number,
+                assigned_at=assigned_at
+            ))
+            count += 1
+        
+        save_assignments(event_key, assignments, stats)
+        return count
+
+def reassign_assignments(event_key, changes):
+    """Hand specific assignments to other scouters with one shard write
+    changes: {assignment_key: new_scouter_username}; other records are untouched"""
+    if not changes:
+        return 0
+    
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        assigned_at = datetime.now().timestamp()
+        count = 0
+        
+        for assignment_key, scouter_username in changes.items():
+            if assignment_key in assignments:
+                assignment = assignments[assignment_key].copy(scouter=scouter_username, assigned_at=assigned_at)
+                _put_assignment(assignments, stats, assignment_key, assignment)
+                count += 1
+        
+        save_assignments(event_key, assignments, stats)
+        return count
+
+def apply_schedule_reconciliation(event_key, moves=(), drops=(), adds=()):
+    """Apply a schedule reconciliation with one shard write
+    moves: (assignment_key, new_team_number) - same scouter and match, new team
+    drops: assignment keys to remove
+    adds:  (scouter_username, match_number, team_number)
+    Completed and home-game assignments are never moved or dropped, and a move
+    or add never overwrites an existing assignment. Returns (moved, dropped, added)."""
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        assigned_at = datetime.now().timestamp()
+        moved = dropped = added = 0
+        
+        def pending(assignment_key):
+            assignment = assignments.get(assignment_key)
+            return assignment is not None and not (assignment.completed or assignment.is_home_game)
+        
+        for assignment_key, team_number in moves:
+            if not pending(assignment_key):
+                continue
+            assignment = assignments[assignment_key]
+            new_key = f"{event_key}_qm{assignment.match_number}_{team_number}"
+            if new_key in assignments:
+                continue
+            _pop_assignment(assignments, stats, assignment_key)
+            _put_assignment(assignments, stats, new_key,
+                            assignment.copy(team_number=team_number, assigned_at=assigned_at))
+            moved += 1
+        
+        for assignment_key in drops:
+            if pending(assignment_key):
+                _pop_assignment(assignments, stats, assignment_key)
+                dropped += 1
+        
+        for scouter_username, match_number, team_number in adds:
+            assignment_key = f"{event_key}_qm{match_number}_{team_number}"
+            if assignment_key in assignments:
+                continue
+            _put_assignment(assignments, stats, assignment_key, Assignment(
+                scouter=scouter_username,
+                event_key=event_key,
+                match_number=match_number,
+                team_number=team_number,
+                assigned_at=assigned_at
+            ))
+            added += 1
+        
+        if moved or dropped or added:
+            save_assignments(event_key, assignments, stats)
+        return moved, dropped, added
+
+def get_scouter_events(scouter_username):
+    """Active events where a scouter has assignments (read from the counters files)"""
+    _migrate_legacy_assignments()
+    return [event_key for event_key in list_assignment_events()
+            if scouter_username in _load_stats(event_key)]
 
 def get_scouter_assignments(scouter_username, event_key=None):
-    """Get all assignments for a specific scouter"""
-    assignments = load_assignments()
+    """Get all assignments for a specific scouter (all active events unless event_key given)"""
+    assignments = load_assignments(event_key)
     scouter_assignments = []
     
-    for assignment_key, assignment in assignments.items():
-        if assignment.get('scouter') == scouter_username:
-            if event_key is None or assignment.get('event_key') == event_key:
-                scouter_assignments.append({
-                    'assignment_key': assignment_key,
-                    **assignment
-                })
+    for assignment in assignments.values():
+        if assignment.scouter == scouter_username:
+            scouter_assignments.append(assignment)
     
-    return sorted(scouter_assignments, key=lambda x: x['match_number'])
+    return sorted(scouter_assignments, key=lambda x: x.match_number)
+
+def get_scouter_assignment_changes(scouter_username, since=0):
+    """get_assignment_changes() for one scouter across all active events.
+    
+    Returns (version, reset, upserted, removed, events). removed lists the
+    keys this scouter had that were deleted or now belong to someone else;
+    events are the active event keys, and the client drops anything it holds
+    for an event no longer listed (cleared or archived)."""
+    _migrate_legacy_assignments()
+    version = current_assignment_version()
+    events = list_assignment_events()
+    shards = [_load_shard(event_key)[0] for event_key in events]
+    
+    changes = [_shard_changes(assignments, since, version) for assignments in shards]
+    if any(reset for reset, _ in changes):
+        upserted = {k: a for assignments in shards for k, a in assignments.items()
+                    if a.scouter == scouter_username}
+        return version, True, upserted, [], events
+    
+    upserted, removed = {}, []
+    for assignments, (_, changed) in zip(shards, changes):
+        for key, previous_scouters in changed.items():
+            assignment = assignments.get(key)
+            if assignment is not None and assignment.scouter == scouter_username:
+                upserted[key] = assignment
+            elif scouter_username in previous_scouters:
+                removed.append(key)
+    return version, False, upserted, sorted(removed), events
+
+def get_assignment(assignment_key):
+    """Get a single Assignment record by key, or None"""
+    event_key = event_key_from_assignment_key(assignment_key)
+    return load_assignments(event_key).get(assignment_key)
 
 def get_match_assignments(event_key, match_number):
     """Get all assignments for a specific match"""
-    assignments = load_assignments()
+    assignments = load_assignments(event_key)
     match_assignments = []
     
-    for assignment_key, assignment in assignments.items():
-        if (assignment.get('event_key') == event_key and 
-            assignment.get('match_number') == match_number):
-            match_assignments.append({
-                'assignment_key': assignment_key,
-                **assignment
-            })
+    for assignment in assignments.values():
+        if assignment.match_number == match_number:
+            match_assignments.append(assignment)
     
     return match_assignments
 
 def mark_assignment_completed(assignment_key):
     """Mark an assignment as completed"""
-    assignments = load_assignments()
-    
-    if assignment_key in assignments:
-        assignments[assignment_key]['completed'] = True
-        assignments[assignment_key]['completed_at'] = datetime.now().isoformat()
-        save_assignments(assignments)
-        return True
-    
-    return False
+    event_key = event_key_from_assignment_key(assignment_key)
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        
+        if assignment_key in assignments:
+            assignment = assignments[assignment_key].copy(
+                completed=True,
+                completed_at=datetime.now().timestamp()
+            )
+            _put_assignment(assignments, stats, assignment_key, assignment)
+            save_assignments(event_key, assignments, stats)
+            return True
+        
+        return False
+
+def mark_assignments_completed(assignment_keys, scouter=None):
+    """Mark several assignments completed with one write per event shard.
+    
+    With scouter given, only that scouter's own assignments are marked.
+    Returns how many were marked."""
+    by_event = {}
+    for assignment_key in assignment_keys:
+        by_event.setdefault(event_key_from_assignment_key(assignment_key), []).append(assignment_key)
+    
+    marked = 0
+    completed_at = datetime.now().timestamp()
+    for event_key, keys in by_event.items():
+        with _event_write_lock(event_key):
+            assignments, stats = load_assignments_for_update(event_key)
+            for assignment_key in keys:
+                assignment = assignments.get(assignment_key)
+                if assignment is None or assignment.completed:
+                    continue
+                if scouter is not None and assignment.scouter != scouter:
+                    continue
+                _put_assignment(assignments, stats, assignment_key,
+                                assignment.copy(completed=True, completed_at=completed_at))
+                marked += 1
+            save_assignments(event_key, assignments, stats)
+    return marked
 
 def remove_assignment(assignment_key):
     """Remove an assignment"""
-    assignments = load_assignments()
-    
-    if assignment_key in assignments:
-        del assignments[assignment_key]
-        save_assignments(assignments)
-        return True
-    
-    return False
+    event_key = event_key_from_assignment_key(assignment_key)
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        
+        if assignment_key in assignments:
+            _pop_assignment(assignments, stats, assignment_key)
+            save_assignments(event_key, assignments, stats)
+            return True
+        
+        return False
 
 def bulk_assign_match(event_key, match_number, team_assignments):
     """Bulk assign scouters to teams for a match
     team_assignments: dict like {'254': 'scouter1', '148': 'scouter2', ...}"""
-    assignments = load_assignments()
-    
-    for team_number, scouter_username in team_assignments.items():
-        if scouter_username:  
-            assignment_key = f"{event_key}_qm{match_number}_{team_number}"
-            assignments[assignment_key] = {
-                'scouter': scouter_username,
-                'event_key': event_key,
-                'match_number': match_number,
-                'team_number': team_number,
-                'assigned_at': datetime.now().isoformat(),
-                'completed': False
-            }
-    
-    save_assignments(assignments)
+    bulk_assign_matches(event_key, {match_number: team_assignments}, overwrite_pending=True)
     return True
 
-def get_all_assignments(event_key=None):
-    """Get all assignments, optionally filtered by event"""
-    assignments = load_assignments()
-    
-    if event_key:
-        return {k: v for k, v in assignments.items() if v.get('event_key') == event_key}
-    
-    return assignments
+def bulk_assign_matches(event_key, match_assignments, replace_pending=False, overwrite_pending=False):
+    """Bulk assign several matches in one transaction (one shard write)
+    match_assignments: {match_number: {'254': 'scouter1', ...}, ...}
+    (replace_pending and overwrite_pending as in apply_assignment_plan)"""
+    plan = [
+        (scouter_username, match_number, team_number)
+        for match_number, team_assignments in match_assignments.items()
+        for team_number, scouter_username in team_assignments.items()
+        if scouter_username
+    ]
+    return apply_assignment_plan(event_key, plan, replace_pending=replace_pending,
+                                 overwrite_pending=overwrite_pending)
 
-def clear_event_assignments(event_key):
-    """Clear all assignments for an event"""
-    assignments = load_assignments()
-    
-    assignments = {k: v for k, v in assignments.items() if v.get('event_key') != event_key}
-    
-    save_assignments(assignments)
-    return True
+def get_all_assignments(event_key=None):
+    """Get all assignments, optionally for a single event (only that shard is read)"""
+    return load_assignments(event_key)
 
 def remove_team_assignments(event_key, team_number):
     """Remove all assignments for a specific team in an event"""
-    assignments = load_assignments()
-    
-    keys_to_remove = []
-    for assignment_key, assignment in assignments.items():
-        if (assignment.get('event_key') == event_key and 
-            assignment.get('team_number') == team_number):
-            keys_to_remove.append(assignment_key)
-    
-    for key in keys_to_remove:
-        del assignments[key]
-    
-    save_assignments(assignments)
-    return len(keys_to_remove)
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        
+        keys_to_remove = []
+        for assignment_key, assignment in assignments.items():
+            if assignment.team_number == team_number:
+                keys_to_remove.append(assignment_key)
+        
+        for key in keys_to_remove:
+            _pop_assignment(assignments, stats, key)
+        
+        save_assignments(event_key, assignments, stats)
+        return len(keys_to_remove)
 
 def mark_assignment_as_home_game(assignment_key):
     """Mark an assignment as a home game (no scouting needed)"""
-    assignments = load_assignments()
-    
-    if assignment_key in assignments:
-        assignments[assignment_key]['is_home_game'] = True
-        assignments[assignment_key]['marked_home_at'] = datetime.now().isoformat()
-        save_assignments(assignments)
-        return True
-    
-    return False
+    event_key = event_key_from_assignment_key(assignment_key)
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        
+        if assignment_key in assignments:
+            assignment = assignments[assignment_key].copy(
+                is_home_game=True,
+                marked_home_at=datetime.now().timestamp()
+            )
+            _put_assignment(assignments, stats, assignment_key, assignment)
+            save_assignments(event_key, assignments, stats)
+            return True
+        
+        return False
 
 def unmark_assignment_as_home_game(assignment_key):
     """Remove home game status from an assignment"""
-    assignments = load_assignments()
-    
-    if assignment_key in assignments:
-        assignments[assignment_key]['is_home_game'] = False
-        if 'marked_home_at' in assignments[assignment_key]:
-            del assignments[assignment_key]['marked_home_at']
-        save_assignments(assignments)
-        return True
-    
-    return False
+    event_key = event_key_from_assignment_key(assignment_key)
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        
+        if assignment_key in assignments:
+            assignment = assignments[assignment_key].copy(
+                is_home_game=False,
+                marked_home_at=None
+            )
+            _put_assignment(assignments, stats, assignment_key, assignment)
+            save_assignments(event_key, assignments, stats)
+            return True
+        
+        return False
 
-def check_home_team_in_match(match_teams, home_team='6897'):
+def check_home_team_in_match(match_teams, home_team=HOME_TEAM):
     """Check if the home team is playing in this match"""
     return str(home_team) in [str(team) for team in match_teams]
 
 def get_match_summary_for_admin(event_key=None):
     """Get a summary of assignments including home games for admin view"""
-    assignments = load_assignments()
-    
-    if event_key:
-        assignments = {k: v for k, v in assignments.items() if v.get('event_key') == event_key}
-    
+    return summarize_assignments(load_assignments(event_key))
+
+def summarize_assignments(assignments):
+    """Total/completed/home-game/pending counts for {key: Assignment}"""
     summary = {
         'total_assignments': len(assignments),
         'completed': 0,
@@ -233,9 +775,9 @@ def get_match_summary_for_admin(event_key=None):
     }
     
     for assignment in assignments.values():
-        if assignment.get('is_home_game'):
+        if assignment.is_home_game:
             summary['home_games'] += 1
-        elif assignment.get('completed'):
+        elif assignment.completed:
             summary['completed'] += 1
         else:
             summary['pending'] += 1
@@ -244,31 +786,27 @@ def get_match_summary_for_admin(event_key=None):
 
 def clear_match_assignments_db(event_key, match_number):
     """Clear all assignments for a specific match"""
-    assignments = load_assignments()
-    
-    keys_to_remove = []
-    for assignment_key, assignment in assignments.items():
-        if (assignment.get('event_key') == event_key and 
-            assignment.get('match_number') == int(match_number)):
-            keys_to_remove.append(assignment_key)
-    
-    for key in keys_to_remove:
-        del assignments[key]
-    
-    save_assignments(assignments)
-    return len(keys_to_remove)
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        
+        keys_to_remove = []
+        for assignment_key, assignment in assignments.items():
+            if assignment.match_number == int(match_number):
+                keys_to_remove.append(assignment_key)
+        
+        for key in keys_to_remove:
+            _pop_assignment(assignments, stats, key)
+        
+        save_assignments(event_key, assignments, stats)
+        return len(keys_to_remove)
 
 def clear_event_assignments(event_key):
-    """Clear all assignments for an event"""
-    assignments = load_assignments()
-    
-    keys_to_remove = []
-    for assignment_key, assignment in assignments.items():
-        if assignment.get('event_key') == event_key:
-            keys_to_remove.append(assignment_key)
-    
-    for key in keys_to_remove:
-        del assignments[key]
-    
-    save_assignments(assignments)
-    return len(keys_to_remove)
\ No newline at end of file
+    """Clear all assignments for an event (drops that event's shard)"""
+    with _event_write_lock(event_key):
+        assignments, stats = load_assignments_for_update(event_key)
+        removed_count = len(assignments)
+        
+        for assignment_key in list(assignments):
+            _pop_assignment(assignments, stats, assignment_key)
+        save_assignments(event_key, assignments, stats)
+        return removed_count
@@ -9,8 +9,9 @@ Enhanced Developer Mode Configuration
 
 import os
 import json
+import shutil
 from functools import wraps
-from flask import session, request, jsonify, redirect, render_template_string
+from flask import session, request, jsonify, redirect, render_template_string, has_request_context
 
 # Dev mode can be enabled via environment variable OR session
 def is_dev_mode():
@@ -18,7 +19,9 @@ def is_dev_mode():
     return os.environ.get('DEV_MODE', 'False').lower() == 'true'
 
 def is_dev_user():
-    """Check if current user has dev access"""
+    """Check if current user has dev access (background jobs always use production data)"""
+    if not has_request_context():
+        return False
     return session.get('is_dev_user', False) or session.get('user_id') == 'dev'
 
 # Dev credentials
@@ -245,22 +248,34 @@ def get_dev_mock_data(data_type):
 
 # Dev-specific file paths
 DEV_FILES = {
-    'assignments': 'dev_assignments.json',
     'users': 'dev_users.json',
     'manual_events': 'dev_manual_events.json'
 }
 
+# Dev-specific directories (assignments are stored as one shard per event)
+DEV_DIRS = {
+    'assignments': 'dev_assignments'
+}
+
 def get_data_file(file_key):
     """Get appropriate data file based on dev mode"""
     if is_dev_user():
         return DEV_FILES.get(file_key)
     file_map = {
-        'assignments': 'assignments.json',
         'users': 'users.json',
         'manual_events': 'manual_events.json'
     }
     return file_map.get(file_key)
 
+def get_data_dir(dir_key):
+    """Get appropriate data directory based on dev mode"""
+    if is_dev_user():
+        return DEV_DIRS.get(dir_key)
+    dir_map = {
+        'assignments': 'assignments'
+    }
+    return dir_map.get(dir_key)
+
 def init_dev_files():
     """Initialize dev data files with sample data"""
     if not is_dev_mode():
@@ -272,6 +287,9 @@ def init_dev_files():
             with open(path, 'w') as f:
                 json.dump({}, f)
     
+    for key, path in DEV_DIRS.items():
+        os.makedirs(path, exist_ok=True)
+    
     # Create dev users file with dev user and test scouters
     users_path = DEV_FILES['users']
     if os.path.exists(users_path):
@@ -316,6 +334,9 @@ def reset_dev_data():
     for file_path in DEV_FILES.values():
         if os.path.exists(file_path):
             os.remove(file_path)
+    for dir_path in DEV_DIRS.values():
+        if os.path.isdir(dir_path):
+            shutil.rmtree(dir_path)
     init_dev_files()
     print("✅ Dev data reset complete")
 
@@ -325,8 +346,8 @@ def populate_dev_test_data():
         return False
     
     try:
-        # Create some fake assignments
-        assignments_path = DEV_FILES['assignments']
+        # Create some fake assignments (written as the dev_2025test shard)
+        assignments_path = os.path.join(DEV_DIRS['assignments'], 'dev_2025test.json')
         test_assignments = {
             'dev_2025test_qm1_254': {
                 'scouter': 'test_scouter1',
@@ -364,8 +385,9 @@ def populate_dev_test_data():
             }
         }
         
+        os.makedirs(DEV_DIRS['assignments'], exist_ok=True)
         with open(assignments_path, 'w') as f:
-            json.dump(test_assignments, f, indent=2)
+            json.dump({'event_key': 'dev_2025test', 'assignments': test_assignments}, f, indent=2)
         
         # Create manual event
         manual_events_path = DEV_FILES['manual_events']
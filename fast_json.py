@@ -0,0 +1,75 @@
+# fast_json.py - JSON encoding for API responses and data files
+"""
+Uses orjson when it is installed (several times faster than the stdlib for
+our payloads) and falls back to the stdlib json module otherwise, so the app
+runs the same either way.
+
+- dumps/loads/dump_file/load_file are used by the storage modules
+  (database.py, auth.py, manual_matches.py). Files are written compact.
+- FastJSONProvider is registered as Flask's JSON provider so jsonify()
+  uses the fast encoder too.
+"""
+
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    # Optional dependency: stdlib json is used when orjson isn't available
+    orjson = None
+
+def _orjson_default(obj):
+    """Encode the extra types Flask supports (dates, UUIDs, dataclasses, ...)"""
+    return DefaultJSONProvider.default(obj)
+
+def dumps_bytes(obj):
+    """Serialize to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False,
+                      default=_orjson_default).encode('utf-8')
+
+def dumps(obj):
+    """Serialize to a compact JSON string"""
+    return dumps_bytes(obj).decode('utf-8')
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_file(obj, path):
+    """Write obj to path as compact JSON"""
+    with open(path, 'wb') as f:
+        f.write(dumps_bytes(obj))
+
+def load_file(path):
+    """Read JSON from path"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson when available"""
+
+    def dumps(self, obj, **kwargs):
+        # Callers asking for formatting options (indent, sort_keys, ...) get the stdlib
+        if kwargs or orjson is None:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if kwargs or orjson is None:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Pretty-printed output in debug mode, same as the default provider
+        if orjson is None or (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
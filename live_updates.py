@@ -0,0 +1,113 @@
+# live_updates.py - Server-Sent Events for the dashboards
+"""
+A small in-process publish/subscribe hub. Writers publish(channel, event, data)
+when something changes; every open SSE connection on that channel gets the
+event pushed to it, so dashboards no longer poll to find out.
+
+Each connection has its own bounded queue. A client that stops reading and
+lets its queue fill up is sent a 'resync' event and dropped, and its browser
+(EventSource reconnects on its own) reloads from the normal endpoints. Idle
+connections get a comment line every HEARTBEAT seconds so proxies keep them
+open and dead ones are noticed.
+
+Channels are plain strings: admin_channel() gives admin:{event} and
+scouter_channel() scouter:{username}, with a dev: prefix for dev-mode data,
+which lives in separate files.
+"""
+
+import queue
+import threading
+
+from dev_mode import is_dev_user
+from fast_json import dumps
+
+HEARTBEAT = 15
+QUEUE_SIZE = 256
+# Browsers wait this long before reconnecting a dropped stream (ms)
+RETRY_MS = 3000
+
+_subscribers = {}
+_lock = threading.Lock()
+
+
+def admin_channel(event_key, dev=None):
+    """Channel for an event's admin dashboards (dev defaults to the current user's mode)"""
+    if dev is None:
+        dev = is_dev_user()
+    return f"admin:dev:{event_key}" if dev else f"admin:{event_key}"
+
+def scouter_channel(username, dev=None):
+    """Channel for one scouter's devices"""
+    if dev is None:
+        dev = is_dev_user()
+    return f"scouter:dev:{username}" if dev else f"scouter:{username}"
+
+def subscribe(channel):
+    """Register a new connection on a channel and return its queue"""
+    subscriber = queue.Queue(maxsize=QUEUE_SIZE)
+    with _lock:
+        _subscribers.setdefault(channel, set()).add(subscriber)
+    return subscriber
+
+def unsubscribe(channel, subscriber):
+    with _lock:
+        subscribers = _subscribers.get(channel)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del _subscribers[channel]
+
+def subscriber_count(channel=None):
+    with _lock:
+        if channel is not None:
+            return len(_subscribers.get(channel, ()))
+        return sum(len(subscribers) for subscribers in _subscribers.values())
+
+def _close(subscriber):
+    """Replace whatever a subscriber has queued with a resync and end its stream"""
+    while True:
+        try:
+            subscriber.get_nowait()
+        except queue.Empty:
+            break
+    subscriber.put_nowait('event: resync\ndata: {}\n\n')
+    subscriber.put_nowait(None)
+
+def publish(channel, event, data):
+    """Push an event to everyone on a channel; returns how many got it"""
+    with _lock:
+        subscribers = list(_subscribers.get(channel, ()))
+    if not subscribers:
+        return 0
+    
+    message = f"event: {event}\ndata: {dumps(data)}\n\n"
+    delivered = 0
+    for subscriber in subscribers:
+        try:
+            subscriber.put_nowait(message)
+            delivered += 1
+        except queue.Full:
+            # Too far behind to catch up from deltas: make it reload and drop it
+            unsubscribe(channel, subscriber)
+            _close(subscriber)
+    return delivered
+
+def stream(channel, hello=None):
+    """Generator of SSE text for one connection (use as a streaming response body).
+    
+    hello: optional data sent first as a 'ready' event."""
+    subscriber = subscribe(channel)
+    try:
+        yield f"retry: {RETRY_MS}\n"
+        yield f"event: ready\ndata: {dumps(hello or {})}\n\n"
+        while True:
+            try:
+                message = subscriber.get(timeout=HEARTBEAT)
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        unsubscribe(channel, subscriber)
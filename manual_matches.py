@@ -1,30 +1,33 @@
-import json
 import os
 from datetime import datetime
 
 from dev_mode import get_data_file, is_dev_user
+from records import Match
+from fast_json import dump_file, load_file
 
 MANUAL_EVENTS_FILE = 'manual_events.json'
 
+def manual_events_file():
+    """Path of the manual events file for the current user (dev or production)"""
+    return get_data_file('manual_events') if is_dev_user() else MANUAL_EVENTS_FILE
+
 def load_manual_events():
     """Load manual events from JSON file"""
-    events_file = get_data_file('manual_events') if is_dev_user() else MANUAL_EVENTS_FILE
+    events_file = manual_events_file()
     
     if not os.path.exists(events_file):
         return {}
     
     try:
-        with open(events_file, 'r') as f:
-            return json.load(f)
+        return load_file(events_file)
     except:
         return {}
 
 def save_manual_events(events):
     """Save manual events to JSON file"""
-    events_file = get_data_file('manual_events') if is_dev_user() else MANUAL_EVENTS_FILE
+    events_file = manual_events_file()
     
-    with open(events_file, 'w') as f:
-        json.dump(events, f, indent=2)
+    dump_file(events, events_file)
 
 def create_manual_event(event_name, matches_data):
     """Create a new manual event with matches"""
@@ -61,10 +64,10 @@ def get_manual_event(event_key):
     return events.get(event_key)
 
 def get_manual_event_matches(event_key):
-    """Get matches for a manual event"""
+    """Get matches for a manual event as Match records"""
     event = get_manual_event(event_key)
     if event:
-        return event.get('matches', [])
+        return [Match.from_dict(match) for match in event.get('matches', [])]
     return []
 
 def get_manual_event_teams(event_key):
@@ -73,7 +76,7 @@ def get_manual_event_teams(event_key):
     teams = set()
     
     for match in matches:
-        teams.update(match.get('all_teams', []))
+        teams.update(match.all_teams)
     
     return sorted(list(teams), key=lambda x: int(x) if x.isdigit() else 0)
 
@@ -0,0 +1,203 @@
+# records.py - Compact record types for the data we keep in memory
+"""
+Lightweight __slots__ records for assignments, matches and scouting entries.
+
+These replace the nested dicts we used to pass around internally: no per-object
+__dict__, team/scouter/event strings are interned so every record shares one
+copy, timestamps are kept as floats instead of ISO strings, and a match stores
+its red/blue tuples once instead of also duplicating them into all_teams.
+
+Everything is converted back to the original dict shape with to_dict() only at
+the JSON boundary (API responses and data files).
+"""
+
+import sys
+from datetime import datetime
+
+def _intern(value):
+    """Intern strings so repeated team/scouter/event values share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def to_timestamp(value):
+    """Convert an ISO timestamp string (or number) to a float timestamp"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+def to_isoformat(timestamp):
+    """Convert a float timestamp back to the ISO string stored in JSON"""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+class Assignment:
+    """One scouter assigned to one team in one match"""
+    __slots__ = ('scouter', 'event_key', 'match_number', 'team_number', 'assigned_at',
+                 'completed', 'completed_at', 'is_home_game', 'marked_home_at')
+
+    def __init__(self, scouter, event_key, match_number, team_number, assigned_at=None,
+                 completed=False, completed_at=None, is_home_game=None, marked_home_at=None):
+        self.scouter = _intern(scouter)
+        self.event_key = _intern(event_key)
+        self.match_number = match_number
+        self.team_number = _intern(team_number)
+        self.assigned_at = assigned_at if assigned_at is not None else datetime.now().timestamp()
+        self.completed = completed
+        self.completed_at = completed_at
+        # None means "never marked" so the stored JSON keeps omitting the field
+        self.is_home_game = is_home_game
+        self.marked_home_at = marked_home_at
+
+    @property
+    def key(self):
+        """Assignment key as used in storage and by the dashboards"""
+        return f"{self.event_key}_qm{self.match_number}_{self.team_number}"
+
+    def copy(self, **changes):
+        """Return a copy with some fields replaced (records are treated as immutable)"""
+        clone = Assignment.__new__(Assignment)
+        for name in Assignment.__slots__:
+            setattr(clone, name, changes.get(name, getattr(self, name)))
+        return clone
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from its stored/legacy dict form"""
+        return cls(
+            scouter=data.get('scouter'),
+            event_key=data.get('event_key'),
+            match_number=data.get('match_number'),
+            team_number=data.get('team_number'),
+            assigned_at=to_timestamp(data.get('assigned_at')),
+            completed=data.get('completed', False),
+            completed_at=to_timestamp(data.get('completed_at')),
+            is_home_game=data.get('is_home_game'),
+            marked_home_at=to_timestamp(data.get('marked_home_at'))
+        )
+
+    def to_dict(self, with_key=False):
+        """Convert to the dict shape used in assignment files and API responses"""
+        data = {'assignment_key': self.key} if with_key else {}
+        data.update({
+            'scouter': self.scouter,
+            'event_key': self.event_key,
+            'match_number': self.match_number,
+            'team_number': self.team_number,
+            'assigned_at': to_isoformat(self.assigned_at),
+            'completed': self.completed
+        })
+        if self.completed_at is not None:
+            data['completed_at'] = to_isoformat(self.completed_at)
+        if self.is_home_game is not None:
+            data['is_home_game'] = self.is_home_game
+        if self.marked_home_at is not None:
+            data['marked_home_at'] = to_isoformat(self.marked_home_at)
+        return data
+
+
+class Match:
+    """One qualification match from TBA or a manual event"""
+    __slots__ = ('key', 'match_number', 'red_teams', 'blue_teams',
+                 'predicted_time', 'actual_time', 'time')
+
+    def __init__(self, key, match_number, red_teams, blue_teams,
+                 predicted_time=None, actual_time=None, time=None):
+        self.key = key
+        self.match_number = match_number
+        self.red_teams = tuple(_intern(team) for team in red_teams)
+        self.blue_teams = tuple(_intern(team) for team in blue_teams)
+        self.predicted_time = predicted_time
+        self.actual_time = actual_time
+        self.time = time
+
+    @property
+    def all_teams(self):
+        """Red then blue teams (computed, not stored)"""
+        return self.red_teams + self.blue_teams
+
+    def has_team(self, team_number):
+        """Check whether a team plays in this match without building all_teams"""
+        return team_number in self.red_teams or team_number in self.blue_teams
+
+    @classmethod
+    def from_tba(cls, match):
+        """Build a record from a raw TBA /event/{key}/matches entry"""
+        return cls(
+            key=match['key'],
+            match_number=match['match_number'],
+            red_teams=[team.replace('frc', '') for team in match['alliances']['red']['team_keys']],
+            blue_teams=[team.replace('frc', '') for team in match['alliances']['blue']['team_keys']],
+            predicted_time=match.get('predicted_time'),
+            actual_time=match.get('actual_time'),
+            time=match.get('time')
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from the dict form (manual events, sample data)"""
+        return cls(
+            key=data.get('key'),
+            match_number=data.get('match_number'),
+            red_teams=data.get('red_teams', []),
+            blue_teams=data.get('blue_teams', []),
+            predicted_time=data.get('predicted_time'),
+            actual_time=data.get('actual_time'),
+            time=data.get('time')
+        )
+
+    def to_dict(self):
+        """Convert to the dict shape returned by /api/admin/matches"""
+        data = {
+            'match_number': self.match_number,
+            'red_teams': list(self.red_teams),
+            'blue_teams': list(self.blue_teams),
+            'all_teams': list(self.all_teams)
+        }
+        if self.key is not None:
+            data['key'] = self.key
+            data['predicted_time'] = self.predicted_time
+            data['actual_time'] = self.actual_time
+            data['time'] = self.time
+        return data
+
+
+class ScoutEntry:
+    """One parsed row of match scouting data for the analytics dashboard"""
+    __slots__ = ('team', 'match', 'scouter_name', 'submission_time', 'event',
+                 'auto', 'teleop', 'endgame', 'total_score', 'notes', 'partial_match')
+
+    def __init__(self, team, match, scouter_name, submission_time, event,
+                 auto, teleop, endgame, total_score, notes='', partial_match=False):
+        self.team = _intern(team)
+        self.match = match
+        self.scouter_name = _intern(scouter_name)
+        self.submission_time = submission_time
+        self.event = _intern(event)
+        self.auto = auto
+        self.teleop = teleop
+        self.endgame = endgame
+        self.total_score = total_score
+        self.notes = notes
+        self.partial_match = partial_match
+
+    def to_dict(self):
+        """Convert to the dict shape returned by /api/admin/analytics/data"""
+        return {
+            'team': self.team,
+            'match': self.match,
+            'scouterName': self.scouter_name,
+            'submissionTime': to_isoformat(self.submission_time),
+            'event': self.event,
+            'auto': self.auto,
+            'teleop': self.teleop,
+            'endgame': self.endgame,
+            'totalScore': self.total_score,
+            'notes': self.notes,
+            'partialMatch': self.partial_match
+        }
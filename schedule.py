@@ -0,0 +1,287 @@
+# schedule.py - Shared, cached match schedule per event
+"""
+One place to get an event's qualification schedule, for TBA and manual events
+alike. Each schedule is loaded once, normalized to Match records and indexed:
+
+- teams:        sorted list of every team at the event
+- team_matches: team -> match numbers that team plays in
+- match_teams:  match number -> teams in that match
+
+The routes (/api/admin/matches, /api/admin/teams, auto-assign) and
+database.bulk_assign_team_to_scouter() all read from here instead of fetching
+the schedule themselves.
+
+TBA schedules are kept for SCHEDULE_TTL seconds (the HTTP layer in tba_api.py
+revalidates underneath). Manual schedules are reloaded when the manual events
+file changes on disk.
+
+When the background refresher is running (start_refresher(), started by
+app.py), events that were read recently are refreshed from TBA every
+REFRESH_INTERVAL seconds and requests for them are always answered from
+memory. A refresh that changes nothing keeps the same schedule object; a real
+change (matches added/removed, teams or times updated) bumps the event's
+schedule version and notifies listeners registered with
+add_schedule_listener().
+"""
+
+import os
+import threading
+import time
+
+from manual_matches import get_manual_event_matches, is_manual_event, manual_events_file
+from tba_api import TBAClient, get_sample_matches
+
+SCHEDULE_TTL = 60
+REFRESH_INTERVAL = int(os.environ.get('SCHEDULE_REFRESH_INTERVAL', 30))
+# Events not read for this long stop being refreshed in the background
+ACTIVE_EVENT_WINDOW = 2 * 60 * 60
+
+_tba_client = None
+_schedules = {}
+_lock = threading.Lock()
+_sample_schedule = None
+_versions = {}
+_active_events = {}
+_listeners = []
+_refresher = None
+# One refresh per event at a time, and when each event's last completed
+# fetch started; see refresh_schedule()
+_refresh_locks = {}
+_fetch_started = {}
+
+
+def _team_sort_key(team):
+    return int(team) if team.isdigit() else 0
+
+
+class EventSchedule:
+    """Qualification matches for one event plus lookup indexes"""
+    __slots__ = ('event_key', 'matches', 'teams', 'team_matches', 'match_teams',
+                 'source', 'loaded_at', 'version', '_by_number', '_match_dicts')
+    
+    def __init__(self, event_key, matches, source, version=0):
+        self.event_key = event_key
+        self.matches = tuple(sorted(matches, key=lambda match: match.match_number))
+        self.source = source
+        self.loaded_at = time.time()
+        self.version = version
+        self._by_number = {match.match_number: match for match in self.matches}
+        self._match_dicts = None
+        
+        team_matches = {}
+        match_teams = {}
+        for match in self.matches:
+            teams = match.all_teams
+            match_teams[match.match_number] = teams
+            for team in teams:
+                team_matches.setdefault(team, []).append(match.match_number)
+        
+        self.team_matches = {team: tuple(numbers) for team, numbers in team_matches.items()}
+        self.match_teams = match_teams
+        self.teams = sorted(team_matches, key=_team_sort_key)
+    
+    @property
+    def is_sample(self):
+        return self.source == 'sample'
+    
+    def get_match(self, match_number):
+        """Match record by number, or None"""
+        return self._by_number.get(match_number)
+    
+    def matches_for_team(self, team_number):
+        """Match records the team plays in, in match order"""
+        return [self._by_number[number] for number in self.team_matches.get(team_number, ())]
+    
+    def match_dicts(self):
+        """/api/admin/matches payload, built once per schedule"""
+        if self._match_dicts is None:
+            self._match_dicts = [match.to_dict() for match in self.matches]
+        return self._match_dicts
+    
+    def diff(self, other):
+        """Match numbers added, removed and changed going from self to other"""
+        old = {match.match_number: _match_signature(match) for match in self.matches}
+        new = {match.match_number: _match_signature(match) for match in other.matches}
+        return {
+            'added': sorted(new.keys() - old.keys()),
+            'removed': sorted(old.keys() - new.keys()),
+            'changed': sorted(n for n in old.keys() & new.keys() if old[n] != new[n])
+        }
+
+
+def _match_signature(match):
+    return (match.red_teams, match.blue_teams, match.predicted_time, match.actual_time, match.time)
+
+def _has_changes(diff):
+    return bool(diff['added'] or diff['removed'] or diff['changed'])
+
+
+def configure(tba_client):
+    """Use the app's TBAClient (and its response cache) for TBA schedules"""
+    global _tba_client
+    _tba_client = tba_client
+
+def get_tba_client():
+    """The configured TBAClient, created on first use when running outside the app"""
+    global _tba_client
+    if _tba_client is None:
+        _tba_client = TBAClient()
+    return _tba_client
+
+def get_sample_schedule():
+    """Schedule built from the sample matches (used when TBA has nothing)"""
+    global _sample_schedule
+    if _sample_schedule is None:
+        _sample_schedule = EventSchedule('sample', get_sample_matches(), 'sample')
+    return _sample_schedule
+
+def _load_manual(event_key):
+    events_file = manual_events_file()
+    try:
+        mtime = os.stat(events_file).st_mtime_ns
+    except OSError:
+        mtime = None
+    
+    cache_key = (events_file, event_key)
+    with _lock:
+        cached = _schedules.get(cache_key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    schedule = EventSchedule(event_key, get_manual_event_matches(event_key), 'manual')
+    with _lock:
+        _schedules[cache_key] = (mtime, schedule)
+    return schedule
+
+def _refresh_lock(event_key):
+    with _lock:
+        lock = _refresh_locks.get(event_key)
+        if lock is None:
+            lock = _refresh_locks[event_key] = threading.RLock()
+        return lock
+
+def refresh_schedule(event_key):
+    """Fetch a TBA event now and swap in the new schedule if it changed
+    
+    Refreshes of the same event (requests, the refresher, webhooks) run one at
+    a time, so a change bumps the version and notifies listeners once. Callers
+    that waited on a refresh finishing get its schedule instead of fetching again."""
+    requested_at = time.time()
+    with _refresh_lock(event_key):
+        with _lock:
+            cached = _schedules.get(event_key)
+            # Only a fetch that started after this call can have seen what prompted it
+            if cached and _fetch_started.get(event_key, 0) >= requested_at:
+                return cached[1]
+        return _refresh_locked(event_key, cached[1] if cached else None)
+
+def _refresh_locked(event_key, previous):
+    started = time.time()
+    matches = get_tba_client().get_event_matches(event_key)
+    if not matches:
+        # TBA unavailable or no schedule yet: keep serving what we had
+        return previous or EventSchedule(event_key, (), 'tba')
+    
+    with _lock:
+        _fetch_started[event_key] = started
+    schedule = EventSchedule(event_key, matches, 'tba')
+    diff = previous.diff(schedule) if previous else None
+    if previous and not _has_changes(diff):
+        previous.loaded_at = schedule.loaded_at
+        return previous
+    
+    with _lock:
+        _versions[event_key] = schedule.version = _versions.get(event_key, 0) + 1
+        _schedules[event_key] = (None, schedule)
+    
+    if previous:
+        print(f"Schedule for {event_key} changed (v{schedule.version}): {diff}")
+    for listener in list(_listeners):
+        try:
+            listener(event_key, schedule, diff, previous)
+        except Exception as e:
+            print(f"Schedule listener failed for {event_key}: {e}")
+    return schedule
+
+def _load_tba(event_key):
+    with _lock:
+        cached = _schedules.get(event_key)
+        _active_events[event_key] = time.time()
+    if cached:
+        schedule = cached[1]
+        # The background refresher keeps active events current
+        if _refresher_running() or time.time() - schedule.loaded_at < SCHEDULE_TTL:
+            return schedule
+    
+    return refresh_schedule(event_key)
+
+def get_event_schedule(event_key, sample_fallback=False):
+    """Cached EventSchedule for an event (TBA or manual).
+    
+    With sample_fallback, a TBA event with no schedule returns the sample
+    matches instead of an empty schedule. Manual events never fall back."""
+    if is_manual_event(event_key):
+        return _load_manual(event_key)
+    
+    schedule = _load_tba(event_key)
+    if not schedule.matches and sample_fallback:
+        return get_sample_schedule()
+    return schedule
+
+def get_schedule_version(event_key):
+    """Version of an event's TBA schedule; bumped each time it actually changes"""
+    with _lock:
+        return _versions.get(event_key, 0)
+
+def add_schedule_listener(callback):
+    """Call callback(event_key, schedule, diff, previous) whenever a TBA schedule changes.
+    
+    diff and previous are None for the first load of an event, otherwise diff
+    is a dict of added, removed and changed match numbers and previous is the
+    schedule that was replaced."""
+    _listeners.append(callback)
+
+def active_events():
+    """TBA events read within ACTIVE_EVENT_WINDOW"""
+    cutoff = time.time() - ACTIVE_EVENT_WINDOW
+    with _lock:
+        for event_key, last_read in list(_active_events.items()):
+            if last_read < cutoff:
+                del _active_events[event_key]
+        return list(_active_events)
+
+def refresh_active_events():
+    """Refresh every active event once (what the background thread runs)"""
+    for event_key in active_events():
+        try:
+            refresh_schedule(event_key)
+        except Exception as e:
+            print(f"Error refreshing schedule for {event_key}: {e}")
+
+def _refresher_running():
+    return _refresher is not None and _refresher.is_alive()
+
+def _refresh_loop(interval):
+    while True:
+        time.sleep(interval)
+        refresh_active_events()
+
+def start_refresher(interval=REFRESH_INTERVAL):
+    """Start the background refresher thread (once per process; 0 disables it)"""
+    global _refresher
+    if interval <= 0 or _refresher_running():
+        return
+    _refresher = threading.Thread(target=_refresh_loop, args=(interval,),
+                                  name='schedule-refresher', daemon=True)
+    _refresher.start()
+    print(f"Schedule refresher running every {interval}s")
+
+def invalidate_schedule(event_key=None):
+    """Drop the cached schedule for one event (or all) so the next read reloads it"""
+    with _lock:
+        if event_key is None:
+            _schedules.clear()
+            return
+        for cache_key in list(_schedules):
+            if cache_key == event_key or (isinstance(cache_key, tuple) and cache_key[1] == event_key):
+                del _schedules[cache_key]
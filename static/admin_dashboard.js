@@ -3,6 +3,12 @@ let scouters = {};
 let matches = [];
 let teams = [];
 let isUpdating = false;
+let scheduleChanges = { event: null, seen: 0 };
+let assignmentsByKey = new Map();
+let assignmentsVersion = 0;
+let adminStream = null;
+let streamConnected = false;
+const FALLBACK_POLL_MS = 60000;
 
 class UpdateManager {
   constructor() {
@@ -58,18 +64,78 @@ document.addEventListener('DOMContentLoaded', () => {
     document.getElementById('event-key-input').value = savedEvent;
     document.getElementById('current-event-display').textContent = savedEvent;
     document.getElementById('event-section').style.display = 'block';
+    // The dashboard bootstrap brings the scouters along
     loadMatches();
+  } else {
+    loadScouters();
   }
 
+  // Changes are pushed over the admin stream; polling only covers a dropped stream
   setInterval(async () => {
-    if (currentEvent && !isUpdating) {
+    if (currentEvent && !isUpdating && !streamConnected) {
       await silentLoadMatches();
+      await pollAssignmentChanges();
+      await checkScheduleChanges();
     }
-  }, 10000);
-  
-  loadScouters();
+  }, FALLBACK_POLL_MS);
 });
 
+function connectAdminStream() {
+  if (adminStream) {
+    if (adminStream.eventKey === currentEvent) return;
+    adminStream.close();
+    adminStream = null;
+  }
+  streamConnected = false;
+  if (!currentEvent || !window.EventSource) return;
+  
+  const eventKey = currentEvent;
+  const stream = new EventSource(`/api/admin/stream?event=${encodeURIComponent(eventKey)}`);
+  stream.eventKey = eventKey;
+  let connectedBefore = false;
+  
+  stream.addEventListener('ready', async () => {
+    streamConnected = true;
+    // Writes between our last snapshot/delta and this subscription were not
+    // pushed; catch up from assignmentsVersion before later pushes move it on
+    await pollAssignmentChanges();
+    // Anything else that happened while we were disconnected was not pushed either
+    if (connectedBefore) {
+      await forceReloadMatches();
+      await checkScheduleChanges();
+    }
+    connectedBefore = true;
+  });
+  
+  stream.addEventListener('assignments', event => {
+    const delta = JSON.parse(event.data);
+    if (delta.event_key === currentEvent) {
+      applyAssignmentDelta(delta);
+    }
+  });
+  
+  stream.addEventListener('schedule', async () => {
+    if (stream.eventKey === currentEvent) {
+      await forceReloadMatches();
+    }
+  });
+  
+  stream.addEventListener('schedule_changes', event => {
+    const report = JSON.parse(event.data);
+    if (report.event_key === currentEvent) {
+      scheduleChanges = { event: currentEvent, seen: report.id };
+      showScheduleChanges([report]);
+    }
+  });
+  
+  stream.onerror = () => {
+    // EventSource reconnects by itself; poll until it does
+    streamConnected = false;
+  };
+  
+  adminStream = stream;
+}
+
 async function silentLoadMatches() {
   if (!currentEvent || isUpdating) return;
   
@@ -88,108 +154,225 @@ async function silentLoadMatches() {
   }
 }
 
-async function renderMatches() {
-  const container = document.getElementById('matches-container');
-  if (!container) return;
+function showScheduleChanges(reports) {
+  const count = key => reports.reduce((total, report) => total + report[key].length, 0);
+  const parts = [];
+  if (count('moved')) parts.push(`${count('moved')} moved`);
+  if (count('added')) parts.push(`${count('added')} added`);
+  if (count('dropped')) parts.push(`${count('dropped')} dropped`);
+  if (count('kept')) parts.push(`${count('kept')} completed kept`);
+  if (count('uncovered')) parts.push(`${count('uncovered')} team slots need a scouter`);
+  
+  showNotification(`Schedule changed: ${parts.length ? parts.join(', ') : 'no assignments affected'}`, 'info');
+}
+
+async function checkScheduleChanges() {
+  if (!currentEvent) return;
+  
+  // The first check for an event only records where we are
+  const firstCheck = scheduleChanges.event !== currentEvent;
+  const since = firstCheck ? 0 : scheduleChanges.seen;
   
   try {
-    const [assignmentsResponse, summaryResponse] = await Promise.all([
-      fetch(`/api/admin/assignments?event=${currentEvent}`),
-      fetch(`/api/admin/match-summary?event=${currentEvent}`)
-    ]);
+    const response = await fetch(`/api/admin/schedule-changes?event=${currentEvent}&since=${since}`);
+    if (!response.ok) return;
     
-    if (!assignmentsResponse.ok || !summaryResponse.ok) {
-      throw new Error('Failed to fetch assignment data');
-    }
+    const result = await response.json();
+    scheduleChanges = { event: currentEvent, seen: result.latest };
+    if (firstCheck || result.reports.length === 0) return;
     
-    const [assignments, summary] = await Promise.all([
-      assignmentsResponse.json(),
-      summaryResponse.json()
-    ]);
-
-    const summaryHTML = `
-      <div class="match-summary">
-        <h3>Assignment Summary</h3>
-        <div class="summary-stats">
-          <div class="stat-item">
-            <span class="stat-number">${summary.total_assignments}</span>
-            <span class="stat-label">Total</span>
-          </div>
-          <div class="stat-item completed">
-            <span class="stat-number">${summary.completed}</span>
-            <span class="stat-label">Completed</span>
-          </div>
-          <div class="stat-item home-games">
-            <span class="stat-number">${summary.home_games}</span>
-            <span class="stat-label">Home Games</span>
-          </div>
-          <div class="stat-item pending">
-            <span class="stat-number">${summary.pending}</span>
-            <span class="stat-label">Pending</span>
-          </div>
+    showScheduleChanges(result.reports);
+    updateManager.clearCache();
+    await silentLoadMatches();
+  } catch (error) {
+    console.error('Schedule changes check error:', error);
+  }
+}
+
+async function pollAssignmentChanges() {
+  try {
+    const response = await fetch(`/api/admin/assignments?event=${currentEvent}&since=${assignmentsVersion}`);
+    if (!response.ok) return;
+    applyAssignmentDelta(await response.json());
+  } catch (error) {
+    console.error('Assignment changes poll error:', error);
+  }
+}
+
+function applyAssignmentDelta(delta) {
+  if (delta.version) {
+    assignmentsVersion = Math.max(assignmentsVersion, delta.version);
+  }
+  if (delta.reset) {
+    assignmentsByKey = new Map(delta.upserted.map(a => [a.assignment_key, a]));
+    drawMatches();
+    return;
+  }
+  
+  const affected = new Set();
+  
+  delta.removed.forEach(key => {
+    const assignment = assignmentsByKey.get(key);
+    if (assignment) {
+      affected.add(assignment.match_number);
+      assignmentsByKey.delete(key);
+    }
+  });
+  delta.upserted.forEach(assignment => {
+    const previous = assignmentsByKey.get(assignment.assignment_key);
+    if (previous) affected.add(previous.match_number);
+    assignmentsByKey.set(assignment.assignment_key, assignment);
+    affected.add(assignment.match_number);
+  });
+  
+  // Only the touched match cards and the summary are redrawn
+  affected.forEach(matchNumber => {
+    const card = document.querySelector(`.match-card[data-match="${matchNumber}"]`);
+    const match = matches.find(m => m.match_number === matchNumber);
+    if (card && match) {
+      card.outerHTML = renderMatchCard(match);
+    }
+  });
+  
+  const summary = document.querySelector('#matches-container .match-summary');
+  if (summary) {
+    summary.outerHTML = renderAssignmentSummary();
+  }
+}
+
+function renderAssignmentSummary() {
+  const summary = { total_assignments: 0, completed: 0, home_games: 0, pending: 0 };
+  assignmentsByKey.forEach(assignment => {
+    summary.total_assignments++;
+    if (assignment.is_home_game) {
+      summary.home_games++;
+    } else if (assignment.completed) {
+      summary.completed++;
+    } else {
+      summary.pending++;
+    }
+  });
+  
+  return `
+    <div class="match-summary">
+      <h3>Assignment Summary</h3>
+      <div class="summary-stats">
+        <div class="stat-item">
+          <span class="stat-number">${summary.total_assignments}</span>
+          <span class="stat-label">Total</span>
+        </div>
+        <div class="stat-item completed">
+          <span class="stat-number">${summary.completed}</span>
+          <span class="stat-label">Completed</span>
+        </div>
+        <div class="stat-item home-games">
+          <span class="stat-number">${summary.home_games}</span>
+          <span class="stat-label">Home Games</span>
+        </div>
+        <div class="stat-item pending">
+          <span class="stat-number">${summary.pending}</span>
+          <span class="stat-label">Pending</span>
         </div>
       </div>
-    `;
-    
-    container.innerHTML = summaryHTML + matches.map(match => {
-      const matchAssignments = assignments.filter(a => a.match_number === match.match_number);
-      const isHomeMatch = match.all_teams.includes('6897'); 
-      
-      return `
-        <div class="match-card ${isHomeMatch ? 'home-match' : ''}" data-match="${match.match_number}">
-          <div class="match-header">
-            <div class="match-info">
-              <h4>Match ${match.match_number}</h4>
-              ${isHomeMatch ? '<span class="home-indicator">🏠 Home Match</span>' : ''}
-            </div>
-            <div class="match-actions">
-              <button onclick="assignMatch(${match.match_number})" class="assign-btn">Assign Scouters</button>
-              <button onclick="clearMatchAssignments(${match.match_number})" class="clear-match-btn" title="Clear all assignments for this match">
-                Clear Match
-              </button>
-            </div>
-          </div>
-          <div class="teams-grid">
-            <div class="alliance red">
-              <h5>Red Alliance</h5>
-              ${match.red_teams.map(team => {
-                const assignment = matchAssignments.find(a => a.team_number === team);
-                const isHomeTeam = team === '6897';
-                return `
-                  <div class="team-assignment ${isHomeTeam ? 'home-team' : ''} ${assignment ? 'assigned' : 'unassigned'}" data-team="${team}">
-                    <div class="team-info">
-                      <span class="team-number">${team}${isHomeTeam ? ' (HOME)' : ''}</span>
-                      <div class="assignment-status">
-                        ${assignment ? getAssignmentStatusDisplay(assignment) : '<span class="status-badge unassigned">Unassigned</span>'}
-                      </div>
-                    </div>
-                    ${assignment && !isHomeTeam ? getAssignmentActions(assignment) : ''}
+    </div>
+  `;
+}
+
+function assignmentsForMatch(matchNumber) {
+  const matchAssignments = [];
+  assignmentsByKey.forEach(assignment => {
+    if (assignment.match_number === matchNumber) matchAssignments.push(assignment);
+  });
+  return matchAssignments;
+}
+
+function renderMatchCard(match, matchAssignments = assignmentsForMatch(match.match_number)) {
+  const isHomeMatch = match.all_teams.includes('6897'); 
+  
+  return `
+    <div class="match-card ${isHomeMatch ? 'home-match' : ''}" data-match="${match.match_number}">
+      <div class="match-header">
+        <div class="match-info">
+          <h4>Match ${match.match_number}</h4>
+          ${isHomeMatch ? '<span class="home-indicator">🏠 Home Match</span>' : ''}
+        </div>
+        <div class="match-actions">
+          <button onclick="assignMatch(${match.match_number})" class="assign-btn">Assign Scouters</button>
+          <button onclick="clearMatchAssignments(${match.match_number})" class="clear-match-btn" title="Clear all assignments for this match">
+            Clear Match
+          </button>
+        </div>
+      </div>
+      <div class="teams-grid">
+        <div class="alliance red">
+          <h5>Red Alliance</h5>
+          ${match.red_teams.map(team => {
+            const assignment = matchAssignments.find(a => a.team_number === team);
+            const isHomeTeam = team === '6897';
+            return `
+              <div class="team-assignment ${isHomeTeam ? 'home-team' : ''} ${assignment ? 'assigned' : 'unassigned'}" data-team="${team}">
+                <div class="team-info">
+                  <span class="team-number">${team}${isHomeTeam ? ' (HOME)' : ''}</span>
+                  <div class="assignment-status">
+                    ${assignment ? getAssignmentStatusDisplay(assignment) : '<span class="status-badge unassigned">Unassigned</span>'}
                   </div>
-                `;
-              }).join('')}
-            </div>
-            <div class="alliance blue">
-              <h5>Blue Alliance</h5>
-              ${match.blue_teams.map(team => {
-                const assignment = matchAssignments.find(a => a.team_number === team);
-                const isHomeTeam = team === '6897';
-                return `
-                  <div class="team-assignment ${isHomeTeam ? 'home-team' : ''} ${assignment ? 'assigned' : 'unassigned'}" data-team="${team}">
-                    <div class="team-info">
-                      <span class="team-number">${team}${isHomeTeam ? ' (HOME)' : ''}</span>
-                      <div class="assignment-status">
-                        ${assignment ? getAssignmentStatusDisplay(assignment) : '<span class="status-badge unassigned">Unassigned</span>'}
-                      </div>
-                    </div>
-                    ${assignment && !isHomeTeam ? getAssignmentActions(assignment) : ''}
+                </div>
+                ${assignment && !isHomeTeam ? getAssignmentActions(assignment) : ''}
+              </div>
+              `;
+          }).join('')}
+        </div>
+        <div class="alliance blue">
+          <h5>Blue Alliance</h5>
+          ${match.blue_teams.map(team => {
+            const assignment = matchAssignments.find(a => a.team_number === team);
+            const isHomeTeam = team === '6897';
+            return `
+              <div class="team-assignment ${isHomeTeam ? 'home-team' : ''} ${assignment ? 'assigned' : 'unassigned'}" data-team="${team}">
+                <div class="team-info">
+                  <span class="team-number">${team}${isHomeTeam ? ' (HOME)' : ''}</span>
+                  <div class="assignment-status">
+                    ${assignment ? getAssignmentStatusDisplay(assignment) : '<span class="status-badge unassigned">Unassigned</span>'}
                   </div>
-                `;
-              }).join('')}
-            </div>
-          </div>
+                </div>
+                ${assignment && !isHomeTeam ? getAssignmentActions(assignment) : ''}
+              </div>
+              `;
+          }).join('')}
         </div>
-      `;
-    }).join('');
+      </div>
+    </div>
+  `;
+}
+
+function drawMatches() {
+  const container = document.getElementById('matches-container');
+  if (!container) return;
+  
+  const byMatch = new Map();
+  assignmentsByKey.forEach(a => {
+    if (!byMatch.has(a.match_number)) byMatch.set(a.match_number, []);
+    byMatch.get(a.match_number).push(a);
+  });
+  
+  container.innerHTML = renderAssignmentSummary() +
+    matches.map(match => renderMatchCard(match, byMatch.get(match.match_number) || [])).join('');
+}
+
+async function renderMatches() {
+  const container = document.getElementById('matches-container');
+  if (!container) return;
+  
+  try {
+    const assignmentsResponse = await fetch(`/api/admin/assignments?event=${currentEvent}&since=0`);
+    if (!assignmentsResponse.ok) {
+      throw new Error('Failed to fetch assignment data');
+    }
+    
+    const result = await assignmentsResponse.json();
+    assignmentsVersion = result.version;
+    assignmentsByKey = new Map(result.upserted.map(a => [a.assignment_key, a]));
+    drawMatches();
   } catch (error) {
     console.error('Error rendering matches:', error);
     container.innerHTML = '<div class="error">Error loading match data. Please refresh the page.</div>';
@@ -219,7 +402,7 @@ async function loadScouters() {
   }
 }
 
-async function updateScouterUI() {
+async function updateScouterUI(stats = null) {
   const bulkScouterSelect = document.getElementById('bulk-scouter');
   if (bulkScouterSelect) {
     bulkScouterSelect.innerHTML = '<option value="">Select Scouter</option>';
@@ -232,8 +415,10 @@ async function updateScouterUI() {
   }
 
   try {
-    const statsResponse = await fetch('/api/admin/scouter-stats');
-    const stats = await statsResponse.json();
+    if (!stats) {
+      const statsResponse = await fetch(`/api/admin/scouter-stats?event=${encodeURIComponent(currentEvent)}`);
+      stats = await statsResponse.json();
+    }
     
     const scoutersList = document.getElementById('scouters-list');
     if (scoutersList) {
@@ -268,10 +453,10 @@ async function refreshAllData() {
     
     updateManager.clearCache();
     
-    await loadScouters();
-    
     if (currentEvent) {
       await loadMatches();
+    } else {
+      await loadScouters();
     }
     
     console.log('Complete data refresh finished');
@@ -406,10 +591,13 @@ async function deleteScouter(username) {
     });
     
     if (response.ok) {
+      const result = await response.json();
       updateManager.clearCache();
       await forceReloadScouters();
       
-      showSuccessMessage('Scouter deleted successfully!');
+      showSuccessMessage(result.reassigned
+        ? `Scouter deleted; ${result.reassigned} pending assignments handed to other scouters`
+        : 'Scouter deleted successfully!');
     } else {
       showErrorMessage('Error deleting scouter');
     }
@@ -477,22 +665,31 @@ async function loadMatches() {
     const container = document.getElementById('matches-container');
     container.innerHTML = '<p>Loading matches...</p>';
     
-    const response = await fetch(`/api/admin/matches?event=${currentEvent}`);
+    // One request for the schedule, assignments, scouters and their stats
+    const response = await fetch(`/api/admin/dashboard?event=${encodeURIComponent(currentEvent)}`);
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
-    matches = await response.json();
+    const dashboard = await response.json();
+    
+    matches = dashboard.matches;
+    updateManager.hasDataChanged('matches', matches);
+    teams = dashboard.teams;
+    fillTeamSelect();
+    scouters = dashboard.scouters;
+    await updateScouterUI(dashboard.scouter_stats);
+    // Reconciliation reports from before this load are already reflected in it
+    scheduleChanges = { event: currentEvent, seen: dashboard.schedule_changes_latest };
     
     if (matches.length === 0) {
       container.innerHTML = '<p>No matches found for this event. Make sure the event key is correct.</p>';
       return;
     }
     
-    if (teams.length === 0) {
-      await loadTeamsForEvent(currentEvent);
-    }
-
-    await renderMatches();
+    assignmentsVersion = dashboard.assignments.version;
+    assignmentsByKey = new Map(dashboard.assignments.upserted.map(a => [a.assignment_key, a]));
+    drawMatches();
+    connectAdminStream();
     
   } catch (error) {
     const container = document.getElementById('matches-container');
@@ -854,7 +1051,20 @@ async function loadEventData() {
   localStorage.setItem('currentEvent', eventKey);
 
   await loadMatches();
-  await loadTeamsForEvent(eventKey);  
+}
+
+function fillTeamSelect() {
+  const bulkTeamSelect = document.getElementById('bulk-team');
+  if (bulkTeamSelect) {
+    bulkTeamSelect.innerHTML = '<option value="">Select Team</option>';
+    teams.forEach(team => {
+      const option = document.createElement('option');
+      option.value = team;
+      option.textContent = `Team ${team}`;
+      bulkTeamSelect.appendChild(option);
+    });
+    console.log(`Loaded ${teams.length} teams for event ${currentEvent}`);
+  }
 }
 
 async function loadTeamsForEvent(eventKey) {
@@ -864,18 +1074,7 @@ async function loadTeamsForEvent(eventKey) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
     teams = await response.json();
-    
-    const bulkTeamSelect = document.getElementById('bulk-team');
-    if (bulkTeamSelect) {
-      bulkTeamSelect.innerHTML = '<option value="">Select Team</option>';
-      teams.forEach(team => {
-        const option = document.createElement('option');
-        option.value = team;
-        option.textContent = `Team ${team}`;
-        bulkTeamSelect.appendChild(option);
-      });
-      console.log(`Loaded ${teams.length} teams for event ${eventKey}`);
-    }
+    fillTeamSelect();
   } catch (error) {
     console.error('Error loading teams:', error);
     const bulkTeamSelect = document.getElementById('bulk-team');
@@ -1431,6 +1630,17 @@ async function deleteManualEventConfirm(eventKey, eventName) {
   }
 }
 
+const AUTO_STRATEGY_DESCRIPTIONS = {
+  balanced: 'spread the match slots evenly across scouters, mixing teams and matches',
+  shifts: 'split the schedule into shifts, each covered by six scouters (one per driver station)',
+  team: 'give each scouter one team to follow across all of its matches'
+};
+
+function updateAutoStrategy() {
+  const strategy = document.getElementById('auto-strategy').value;
+  document.getElementById('auto-shift-length-group').style.display = strategy === 'shifts' ? 'block' : 'none';
+}
+
 async function autoAssignTeams() {
   console.log('autoAssignTeams called, currentEvent:', currentEvent);
   
@@ -1440,7 +1650,17 @@ async function autoAssignTeams() {
     return;
   }
   
-  if (!confirm('Auto-assign teams to scouters? This will assign each scouter to scout one specific team across all their matches.')) {
+  const strategy = document.getElementById('auto-strategy').value;
+  const replacePending = document.getElementById('auto-replace-pending').checked;
+  const request = { event_key: currentEvent, strategy, replace_pending: replacePending };
+  if (strategy === 'shifts') {
+    request.shift_length = parseInt(document.getElementById('auto-shift-length').value, 10);
+  }
+  
+  const scope = replacePending
+    ? 'Pending assignments will be replaced; completed and home-game ones are kept.'
+    : 'Only unassigned slots will be filled; existing assignments are kept.';
+  if (!confirm(`Auto-assign scouters? This will ${AUTO_STRATEGY_DESCRIPTIONS[strategy]}.\n\n${scope}`)) {
     console.log('Auto-assign cancelled by user');
     return;
   }
@@ -1460,7 +1680,7 @@ async function autoAssignTeams() {
         'Content-Type': 'application/json',
         'Accept': 'application/json'
       },
-      body: JSON.stringify({ event_key: currentEvent })
+      body: JSON.stringify(request)
     });
     
     console.log('Response status:', response.status);
@@ -1479,15 +1699,22 @@ async function autoAssignTeams() {
       let resultsHTML = `
         <div class="auto-assign-success">
           <h4>✅ Auto Assignment Complete!</h4>
-          <p>Successfully assigned ${result.total_assignments} teams:</p>
+          <p>${result.strategy !== 'team'
+            ? `Assigned ${result.total_match_assignments} match slots across ${result.total_assignments} scouters
+               (${result.report.min_load}–${result.report.max_load} matches each${result.report.uncovered.length ? `, ${result.report.uncovered.length} slots uncovered` : ''}):`
+            : `Successfully assigned ${result.total_assignments} teams:`}</p>
           <div class="assignment-list">
       `;
       
       result.assignments.forEach(assignment => {
-        resultsHTML += `
+        resultsHTML += assignment.team !== undefined ? `
           <div class="assignment-item">
             <strong>Team ${assignment.team}</strong> → <em>${assignment.scouter_name}</em> (${assignment.scouter_username})
           </div>
+        ` : `
+          <div class="assignment-item">
+            <em>${assignment.scouter_name}</em> (${assignment.scouter_username}) → <strong>${assignment.matches.length} matches</strong>, teams ${assignment.teams.join(', ')}
+          </div>
         `;
       });
       
@@ -1504,7 +1731,9 @@ async function autoAssignTeams() {
       updateManager.clearCache();
       await forceReloadMatches();
       
-      showSuccessMessage(`Auto-assigned ${result.total_assignments} teams successfully!`);
+      showSuccessMessage(result.strategy !== 'team'
+        ? `Auto-assigned ${result.total_match_assignments} match slots successfully!`
+        : `Auto-assigned ${result.total_assignments} teams successfully!`);
       
     } else {
       console.error('Auto-assign returned success=false:', result);
@@ -0,0 +1,126 @@
+// outbox.js - Scouting reports waiting to be sent, shared by the pages and the service worker
+//
+// Reports that can't be submitted are queued in one IndexedDB store and sent in
+// batches to /submit/batch: by the page when it is online, and by the service
+// worker's background sync (importScripts) when the page is gone. Each entry is
+// keyed by the report it is (its assignment, or scouter + team + match), so
+// saving the same report again replaces the queued copy instead of adding a
+// second one. Its id is unique per save, which lets the server recognise a
+// batch it already wrote.
+
+const OUTBOX_DB = 'astraea-outbox';
+const OUTBOX_STORE = 'reports';
+const OUTBOX_SYNC_TAG = 'outbox-sync';
+const OUTBOX_BATCH_SIZE = 25;
+
+function openOutbox() {
+  return new Promise((resolve, reject) => {
+    const request = indexedDB.open(OUTBOX_DB, 1);
+    request.onupgradeneeded = () => {
+      request.result.createObjectStore(OUTBOX_STORE, { keyPath: 'key' });
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+// Run fn(store) in one transaction; resolves with the result of the request fn returns
+async function outboxTransaction(mode, fn) {
+  const db = await openOutbox();
+  try {
+    return await new Promise((resolve, reject) => {
+      const tx = db.transaction(OUTBOX_STORE, mode);
+      const request = fn(tx.objectStore(OUTBOX_STORE));
+      tx.oncomplete = () => resolve(request ? request.result : undefined);
+      tx.onerror = () => reject(tx.error);
+      tx.onabort = () => reject(tx.error);
+    });
+  } finally {
+    db.close();
+  }
+}
+
+function outboxKey(payload) {
+  if (payload.assignment_key) return `assignment:${payload.assignment_key}`;
+  return `report:${payload.name}|${payload.team}|${payload.match}`;
+}
+
+async function outboxAdd(payload) {
+  const entry = {
+    key: outboxKey(payload),
+    id: `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`,
+    queued_at: Date.now(),
+    payload
+  };
+  await outboxTransaction('readwrite', store => store.put(entry));
+  return entry;
+}
+
+async function outboxEntries() {
+  const entries = await outboxTransaction('readonly', store => store.getAll());
+  return entries.sort((a, b) => a.queued_at - b.queued_at);
+}
+
+async function outboxCount() {
+  return outboxTransaction('readonly', store => store.count());
+}
+
+// Delete sent entries, unless the report was saved again since (its id changed)
+async function outboxRemove(ids) {
+  const sent = new Set(ids);
+  await outboxTransaction('readwrite', store => {
+    const cursor = store.openCursor();
+    cursor.onsuccess = () => {
+      const current = cursor.result;
+      if (!current) return;
+      if (sent.has(current.value.id)) current.delete();
+      current.continue();
+    };
+    return null;
+  });
+}
+
+// Ask the service worker to flush when connectivity returns (page side)
+function requestOutboxSync() {
+  if (typeof navigator === 'undefined' || !navigator.serviceWorker) return;
+  navigator.serviceWorker.ready
+    .then(registration => registration.sync && registration.sync.register(OUTBOX_SYNC_TAG))
+    .catch(error => console.log('Background sync unavailable:', error));
+}
+
+let outboxFlush = null;
+
+// Send everything queued, OUTBOX_BATCH_SIZE reports per request; resolves with how many were sent
+function flushOutbox() {
+  if (!outboxFlush) {
+    outboxFlush = sendOutbox().finally(() => { outboxFlush = null; });
+  }
+  return outboxFlush;
+}
+
+async function sendOutbox() {
+  const entries = await outboxEntries();
+  let sent = 0;
+  
+  for (let i = 0; i < entries.length; i += OUTBOX_BATCH_SIZE) {
+    const batch = entries.slice(i, i + OUTBOX_BATCH_SIZE);
+    const response = await fetch('/submit/batch', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      credentials: 'same-origin',
+      body: JSON.stringify({ entries: batch.map(({ id, payload }) => ({ id, payload })) })
+    });
+    if (!response.ok) {
+      throw new Error(`Outbox flush failed: ${response.status}`);
+    }
+    
+    const result = await response.json();
+    if (result.failed.length) {
+      // The server can never write these; keeping them would retry forever
+      console.warn('Dropping queued reports the server rejected:', result.failed);
+    }
+    await outboxRemove(result.done.concat(result.failed));
+    sent += result.done.length;
+  }
+  return sent;
+}
@@ -1,90 +1,202 @@
 let assignments = [];
+let assignmentsByKey = new Map();
+let assignmentsVersion = 0;
+let assignmentsRendered = false;
+let assignmentStream = null;
+let streamConnected = false;
+let lastSync = 0;
+// From the offline bundle (assignments, schedules, team names, form options)
+let teamNames = {};
+let bundleVersion = null;
+// Changes are pushed; polling covers a dropped stream, plus a slow safety net
+const POLL_INTERVAL_MS = 30000;
+const LONG_POLL_INTERVAL_MS = 5 * 60 * 1000;
+
+// Merge a {version, reset, upserted, removed, events} delta; returns whether anything changed
+function applyAssignmentDelta(delta) {
+  let changed = delta.reset;
+  if (delta.reset) {
+    assignmentsByKey = new Map();
+  }
+  
+  delta.removed.forEach(key => {
+    changed = assignmentsByKey.delete(key) || changed;
+  });
+  delta.upserted.forEach(assignment => {
+    assignmentsByKey.set(assignment.assignment_key, assignment);
+    changed = true;
+  });
+  
+  // Events that were cleared or archived are no longer listed (pushed deltas carry no list)
+  if (delta.events) {
+    const events = new Set(delta.events);
+    assignmentsByKey.forEach((assignment, key) => {
+      if (!events.has(assignment.event_key)) {
+        assignmentsByKey.delete(key);
+        changed = true;
+      }
+    });
+  }
+  
+  assignmentsVersion = delta.version;
+  assignments = Array.from(assignmentsByKey.values());
+  return changed;
+}
 
 async function loadAssignments() {
   try {
-    const response = await fetch('/api/scouter/assignments');
-    assignments = await response.json();
-    
-    const container = document.getElementById('assignments-container');
-    const noAssignments = document.getElementById('no-assignments');
-    
-    if (assignments.length === 0) {
-      container.style.display = 'none';
-      noAssignments.style.display = 'block';
-      return;
+    // Only what changed since the version we hold comes back
+    const response = await fetch(`/api/scouter/assignments?since=${assignmentsVersion}`);
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
     }
     
-    container.style.display = 'block';
-    noAssignments.style.display = 'none';
-    
-    const groupedAssignments = assignments.reduce((groups, assignment) => {
-      const key = `${assignment.event_key}_${assignment.match_number}`;
-      if (!groups[key]) {
-        groups[key] = [];
-      }
-      groups[key].push(assignment);
-      return groups;
-    }, {});
+    const changed = applyAssignmentDelta(await response.json());
+    lastSync = Date.now();
+    if (changed || !assignmentsRendered) {
+      renderAssignments();
+      refreshOfflineBundle();
+    }
+  } catch (error) {
+    console.error('Error loading assignments:', error);
+    if (!assignmentsRendered) {
+      document.getElementById('assignments-container').innerHTML = 
+        '<div class="error">Error loading assignments. Please refresh the page.</div>';
+    }
+  }
+}
+
+// The service worker keeps the last bundle and only downloads it again when its version changes
+async function refreshOfflineBundle() {
+  try {
+    const response = await fetch('/api/scouter/bundle');
+    if (!response.ok) return;
     
-    container.innerHTML = Object.keys(groupedAssignments)
-      .sort((a, b) => {
-        const matchA = parseInt(a.split('_').pop());
-        const matchB = parseInt(b.split('_').pop());
-        return matchA - matchB;
-      })
-      .map(key => {
-        const matchAssignments = groupedAssignments[key];
-        const firstAssignment = matchAssignments[0];
-        const matchNumber = firstAssignment.match_number;
-        const eventKey = firstAssignment.event_key;
-        
-        return `
-          <div class="match-assignment-card">
-            <div class="match-header">
-              <h3>Match ${matchNumber}</h3>
-              <span class="event-key">${eventKey}</span>
-            </div>
-            <div class="teams-to-scout">
-              <h4>Teams to Scout:</h4>
-              <div class="team-list">
-                ${matchAssignments.map(assignment => {
-                  if (assignment.is_home_game) {
-                    return `
-                      <div class="team-item home-game">
-                        <span class="team-number">Team ${assignment.team_number}</span>
-                        <span class="status home-game-status">🏠 Home Game</span>
-                        <button onclick="unmarkHomeGame('${assignment.assignment_key}')" class="unmark-home-btn">Remove Home Status</button>
-                      </div>
-                    `;
-                  }
-                  
-                  const statusClass = assignment.completed ? 'completed' : 'pending';
-                  const statusText = assignment.completed ? 'Completed' : 'Pending';
-                  
+    const bundle = await response.json();
+    if (bundle.version === bundleVersion) return;
+    bundleVersion = bundle.version;
+    teamNames = bundle.teams || {};
+    if (assignmentsRendered) {
+      renderAssignments();
+    }
+  } catch (error) {
+    console.error('Error refreshing offline bundle:', error);
+  }
+}
+
+function teamLabel(teamNumber) {
+  const name = teamNames[teamNumber];
+  return name ? `Team ${teamNumber} · ${name}` : `Team ${teamNumber}`;
+}
+
+function connectAssignmentStream() {
+  if (assignmentStream || !window.EventSource) return;
+  
+  assignmentStream = new EventSource('/api/scouter/stream');
+  
+  assignmentStream.addEventListener('ready', () => {
+    streamConnected = true;
+    // Changes between the first load (or a dropped connection) and this
+    // subscription were not pushed: catch up from the version we hold
+    loadAssignments();
+  });
+  
+  assignmentStream.addEventListener('assignments', event => {
+    if (applyAssignmentDelta(JSON.parse(event.data))) {
+      renderAssignments();
+      refreshOfflineBundle();
+    }
+    lastSync = Date.now();
+  });
+  
+  assignmentStream.addEventListener('resync', () => {
+    loadAssignments();
+  });
+  
+  assignmentStream.onerror = () => {
+    // EventSource reconnects by itself; poll until it does
+    streamConnected = false;
+  };
+}
+
+function renderAssignments() {
+  assignmentsRendered = true;
+  
+  const container = document.getElementById('assignments-container');
+  const noAssignments = document.getElementById('no-assignments');
+  
+  if (assignments.length === 0) {
+    container.style.display = 'none';
+    noAssignments.style.display = 'block';
+    return;
+  }
+  
+  container.style.display = 'block';
+  noAssignments.style.display = 'none';
+  
+  const groupedAssignments = assignments.reduce((groups, assignment) => {
+    const key = `${assignment.event_key}_${assignment.match_number}`;
+    if (!groups[key]) {
+      groups[key] = [];
+    }
+    groups[key].push(assignment);
+    return groups;
+  }, {});
+  
+  container.innerHTML = Object.keys(groupedAssignments)
+    .sort((a, b) => {
+      const matchA = parseInt(a.split('_').pop());
+      const matchB = parseInt(b.split('_').pop());
+      return matchA - matchB;
+    })
+    .map(key => {
+      const matchAssignments = groupedAssignments[key];
+      const firstAssignment = matchAssignments[0];
+      const matchNumber = firstAssignment.match_number;
+      const eventKey = firstAssignment.event_key;
+      
+      return `
+        <div class="match-assignment-card">
+          <div class="match-header">
+            <h3>Match ${matchNumber}</h3>
+            <span class="event-key">${eventKey}</span>
+          </div>
+          <div class="teams-to-scout">
+            <h4>Teams to Scout:</h4>
+            <div class="team-list">
+              ${matchAssignments.map(assignment => {
+                if (assignment.is_home_game) {
                   return `
-                    <div class="team-item ${statusClass}">
-                      <span class="team-number">Team ${assignment.team_number}</span>
-                      <span class="status">${statusText}</span>
-                      <div class="team-actions">
-                        ${!assignment.completed ? 
-                          `<button onclick="startScouting('${assignment.assignment_key}', ${assignment.team_number}, ${matchNumber})" class="scout-btn">Scout Team</button>
-                           <button onclick="markHomeGame('${assignment.assignment_key}')" class="home-game-btn">Mark Home Game</button>` :
-                          '<span class="completed-check">✓</span>'
-                        }
-                      </div>
+                    <div class="team-item home-game">
+                      <span class="team-number">${teamLabel(assignment.team_number)}</span>
+                      <span class="status home-game-status">🏠 Home Game</span>
+                      <button onclick="unmarkHomeGame('${assignment.assignment_key}')" class="unmark-home-btn">Remove Home Status</button>
                     </div>
                   `;
-                }).join('')}
-              </div>
+                }
+                
+                const statusClass = assignment.completed ? 'completed' : 'pending';
+                const statusText = assignment.completed ? 'Completed' : 'Pending';
+                
+                return `
+                  <div class="team-item ${statusClass}">
+                    <span class="team-number">${teamLabel(assignment.team_number)}</span>
+                    <span class="status">${statusText}</span>
+                    <div class="team-actions">
+                      ${!assignment.completed ? 
+                        `<button onclick="startScouting('${assignment.assignment_key}', ${assignment.team_number}, ${matchNumber})" class="scout-btn">Scout Team</button>
+                         <button onclick="markHomeGame('${assignment.assignment_key}')" class="home-game-btn">Mark Home Game</button>` :
+                        '<span class="completed-check">✓</span>'
+                      }
+                    </div>
+                  </div>
+                `;
+              }).join('')}
             </div>
           </div>
-        `;
-      }).join('');
-  } catch (error) {
-    console.error('Error loading assignments:', error);
-    document.getElementById('assignments-container').innerHTML = 
-      '<div class="error">Error loading assignments. Please refresh the page.</div>';
-  }
+        </div>
+      `;
+    }).join('');
 }
 
 // function getMatchProgressText(assignments) {
@@ -191,8 +303,19 @@ async function logout() {
 
 document.addEventListener('DOMContentLoaded', () => {
   loadAssignments();
+  connectAssignmentStream();
+  
+  // Reports queued while offline go out as soon as we are back
+  flushOutbox().catch(error => console.log('Queued reports not sent yet:', error));
+  window.addEventListener('online', () => {
+    flushOutbox().catch(error => console.log('Queued reports not sent yet:', error));
+  });
 
-  setInterval(loadAssignments, 30000);
+  setInterval(() => {
+    if (!streamConnected || Date.now() - lastSync > LONG_POLL_INTERVAL_MS) {
+      loadAssignments();
+    }
+  }, POLL_INTERVAL_MS);
 
   const urlParams = new URLSearchParams(window.location.search);
   if (urlParams.get('completed') === 'true') {
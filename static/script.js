@@ -181,24 +181,29 @@ document.addEventListener('DOMContentLoaded', () => {
   });
 
   // ========== OFFLINE QUEUE ==========
-  function saveOffline(data) {
-    const q = JSON.parse(localStorage.getItem('offlineQueue') || '[]');
-    q.push(data);
-    localStorage.setItem('offlineQueue', JSON.stringify(q));
+  // Queued reports live in the IndexedDB outbox (outbox.js), which the service
+  // worker also flushes through background sync
+  async function saveOffline(data) {
+    await outboxAdd(data);
+    requestOutboxSync();
   }
   async function sendQueued() {
-    let q = JSON.parse(localStorage.getItem('offlineQueue') || '[]');
-    if (!q.length) return;
-    for (let i = 0; i < q.length; i++) {
-      try {
-        const r = await fetch('/submit', { method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify(q[i]) });
-        if (r.ok) { q.splice(i,1); i--; } else break;
-      } catch { break; }
+    try {
+      // Reports queued in localStorage by older versions of this page
+      const legacy = JSON.parse(localStorage.getItem('offlineQueue') || '[]');
+      for (const data of legacy) await outboxAdd(data);
+      localStorage.removeItem('offlineQueue');
+      
+      await flushOutbox();
+    } catch (err) {
+      console.log('Queued reports not sent yet:', err);
     }
-    localStorage.setItem('offlineQueue', JSON.stringify(q));
   }
   window.addEventListener('load', sendQueued);
-  window.addEventListener('online', () => { alert('Back online! Syncing saved reports...'); sendQueued(); });
+  window.addEventListener('online', async () => {
+    if (await outboxCount()) alert('Back online! Syncing saved reports...');
+    sendQueued();
+  });
 
   // ========== FORM SUBMIT ==========
   let isSubmitting = false;
@@ -320,7 +325,7 @@ document.addEventListener('DOMContentLoaded', () => {
     } catch (err) {
       console.error(err);
       if (!navigator.onLine) {
-        saveOffline(payload);
+        await saveOffline(payload);
         localStorage.removeItem('scoutDraft');
         alert('Offline — report saved locally and will sync when back online.');
         window.location.href = '/dashboard?completed=true';
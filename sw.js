@@ -2,6 +2,9 @@ const CACHE_NAME = 'astraea-cache-20260315-172130'; // Updated version
 const STATIC_CACHE = 'astraea-static-v20260315-172130';
 const DYNAMIC_CACHE = 'astraea-dynamic-v20260315-172130';
 
+// Queued scouting reports (IndexedDB), shared with the pages
+importScripts('/static/outbox.js');
+
 // Essential files for offline functionality
 const STATIC_ASSETS = [
   // Core pages
@@ -18,6 +21,7 @@ const STATIC_ASSETS = [
   '/static/script.js',
   '/static/admin_dashboard.js',
   '/static/scouter_dashboard.js',
+  '/static/outbox.js',
   '/static/logo.png',
   '/static/logo2.png',
   
@@ -28,12 +32,26 @@ const STATIC_ASSETS = [
 // API endpoints that should work offline with cached data
 const OFFLINE_CAPABLE_APIS = [
   '/api/scouter/assignments',
+  '/api/admin/dashboard',
   '/api/admin/matches',
   '/api/admin/scouters',
   '/api/admin/assignments',
   '/api/admin/teams'
 ];
 
+// Everything a scouter needs offline; revalidated by version (ETag)
+const BUNDLE_API = '/api/scouter/bundle';
+
+// Endpoints that answer ?since=<version> with only what changed
+const DELTA_APIS = [
+  '/api/scouter/assignments',
+  '/api/admin/assignments'
+];
+
+// Signing in or out drops the dynamic cache (bundle, snapshots, API responses
+// and pages), so the next person on a shared device never sees the last one's data
+const SESSION_APIS = ['/api/login', '/api/logout'];
+
 // Install event - cache static assets
 self.addEventListener('install', (evt) => {
   console.log('[ServiceWorker] Install');
@@ -73,6 +91,11 @@ self.addEventListener('fetch', (evt) => {
   const { request } = evt;
   const url = new URL(request.url);
 
+  if (request.method === 'POST' && SESSION_APIS.includes(url.pathname)) {
+    evt.respondWith(handleSessionRequest(request, url.pathname));
+    return;
+  }
+
   // Skip non-GET requests and chrome-extension requests
   if (request.method !== 'GET' || url.protocol === 'chrome-extension:') {
     return;
@@ -154,27 +177,13 @@ async function handleNavigationRequest(request) {
 async function handleAPIRequest(request) {
   const url = new URL(request.url);
   
-  // For POST requests (like form submissions), try network first, then store for later sync
-  if (request.method === 'POST') {
-    try {
-      const response = await fetch(request);
-      return response;
-    } catch (error) {
-      console.log('[ServiceWorker] POST request failed, storing for sync');
-      
-      // Store failed POST requests for background sync
-      await storeFailedRequest(request);
-      
-      // Return a success response to prevent user confusion
-      return new Response(JSON.stringify({ 
-        success: true, 
-        offline: true,
-        message: 'Data saved offline and will sync when online' 
-      }), {
-        status: 200,
-        headers: { 'Content-Type': 'application/json' }
-      });
-    }
+  if (url.pathname === BUNDLE_API) {
+    return handleBundleRequest(request);
+  }
+  
+  // Delta requests (?since=<version>) are merged into one snapshot per endpoint
+  if (url.searchParams.has('since') && DELTA_APIS.includes(url.pathname)) {
+    return handleDeltaAPIRequest(request);
   }
   
   // For GET requests, try cache first for offline-capable APIs
@@ -229,6 +238,154 @@ async function handleAPIRequest(request) {
   return fetch(request);
 }
 
+// Snapshot cache key for a delta URL: same query without `since`
+function snapshotRequestFor(url) {
+  const snapshotUrl = new URL(url);
+  snapshotUrl.searchParams.delete('since');
+  snapshotUrl.searchParams.set('_snapshot', '1');
+  return new Request(snapshotUrl.toString());
+}
+
+// Apply a {version, reset, upserted, removed, events} delta to the cached snapshot
+async function mergeIntoSnapshot(cache, snapshotRequest, since, delta) {
+  const existing = await cache.match(snapshotRequest);
+  const snapshot = existing ? await existing.json() : null;
+  
+  // A delta from a version the snapshot never had would leave a gap; keep the old one
+  if (!delta.reset && (!snapshot || snapshot.version !== since)) {
+    return;
+  }
+  
+  const byKey = new Map();
+  if (!delta.reset) {
+    snapshot.upserted.forEach(a => byKey.set(a.assignment_key, a));
+  }
+  delta.removed.forEach(key => byKey.delete(key));
+  delta.upserted.forEach(a => byKey.set(a.assignment_key, a));
+  if (delta.events) {
+    const events = new Set(delta.events);
+    byKey.forEach((a, key) => {
+      if (!events.has(a.event_key)) byKey.delete(key);
+    });
+  }
+  
+  await cache.put(snapshotRequest, new Response(JSON.stringify({
+    version: delta.version,
+    upserted: Array.from(byKey.values()),
+    events: delta.events
+  }), {
+    headers: { 'Content-Type': 'application/json', 'Date': new Date().toUTCString() }
+  }));
+}
+
+// Handle delta API requests: network first, offline answers with the whole snapshot
+async function handleDeltaAPIRequest(request) {
+  const url = new URL(request.url);
+  const since = parseInt(url.searchParams.get('since'), 10) || 0;
+  const snapshotRequest = snapshotRequestFor(request.url);
+  const cache = await caches.open(DYNAMIC_CACHE);
+  
+  try {
+    const controller = new AbortController();
+    const timeoutId = setTimeout(() => controller.abort(), 3000);
+    
+    const networkResponse = await fetch(request, { signal: controller.signal });
+    clearTimeout(timeoutId);
+    
+    if (networkResponse && networkResponse.status === 200) {
+      const delta = await networkResponse.clone().json();
+      await mergeIntoSnapshot(cache, snapshotRequest, since, delta);
+    }
+    
+    return networkResponse;
+  } catch (error) {
+    console.log('[ServiceWorker] Delta API network failed, answering from snapshot');
+    
+    const snapshotResponse = await cache.match(snapshotRequest);
+    if (snapshotResponse) {
+      const snapshot = await snapshotResponse.json();
+      return new Response(JSON.stringify({
+        ...snapshot,
+        reset: true,
+        removed: [],
+        _offline: true,
+        _cachedAt: snapshotResponse.headers.get('date')
+      }), {
+        status: 200,
+        headers: { 'Content-Type': 'application/json' }
+      });
+    }
+    
+    return new Response(JSON.stringify({ 
+      error: 'Offline - no cached data available',
+      offline: true 
+    }), {
+      status: 503,
+      headers: { 'Content-Type': 'application/json' }
+    });
+  }
+}
+
+// Handle login/logout: forget the previous user's cached data
+async function handleSessionRequest(request, pathname) {
+  if (pathname === '/api/logout') {
+    // Before the request goes out, so logging out offline still clears it
+    await caches.delete(DYNAMIC_CACHE);
+    return fetch(request);
+  }
+  
+  const response = await fetch(request);
+  if (response.ok) {
+    await caches.delete(DYNAMIC_CACHE);
+  }
+  return response;
+}
+
+// Handle the offline bundle: keep one copy, download again only when its version changed
+async function handleBundleRequest(request) {
+  const cache = await caches.open(DYNAMIC_CACHE);
+  const cached = await cache.match(BUNDLE_API);
+  const headers = {};
+  if (cached && cached.headers.get('ETag')) {
+    headers['If-None-Match'] = cached.headers.get('ETag');
+  }
+  
+  try {
+    const controller = new AbortController();
+    const timeoutId = setTimeout(() => controller.abort(), 3000);
+    
+    // Bypass the HTTP cache so a 304 reaches us instead of being resolved underneath
+    const networkResponse = await fetch(BUNDLE_API, {
+      headers,
+      cache: 'no-store',
+      credentials: 'same-origin',
+      signal: controller.signal
+    });
+    clearTimeout(timeoutId);
+    
+    if (networkResponse.status === 304 && cached) {
+      return cached;
+    }
+    if (networkResponse.status === 200) {
+      await cache.put(BUNDLE_API, networkResponse.clone());
+    }
+    return networkResponse;
+  } catch (error) {
+    console.log('[ServiceWorker] Bundle network failed, answering from cache');
+    
+    if (cached) {
+      return cached;
+    }
+    return new Response(JSON.stringify({ 
+      error: 'Offline - no cached data available',
+      offline: true 
+    }), {
+      status: 503,
+      headers: { 'Content-Type': 'application/json' }
+    });
+  }
+}
+
 // Handle static assets (CSS, JS, images)
 async function handleStaticAsset(request) {
   // Cache first strategy for static assets
@@ -334,67 +491,15 @@ function createOfflineResponse(title, message) {
   });
 }
 
-// Store failed requests for background sync
-async function storeFailedRequest(request) {
-  try {
-    const requestData = {
-      url: request.url,
-      method: request.method,
-      headers: Object.fromEntries(request.headers.entries()),
-      body: await request.text(),
-      timestamp: Date.now()
-    };
-    
-    // Store in IndexedDB or fallback to cache
-    const cache = await caches.open('failed-requests');
-    const response = new Response(JSON.stringify(requestData));
-    await cache.put(`failed-${Date.now()}`, response);
-    
-    console.log('[ServiceWorker] Stored failed request for sync');
-  } catch (error) {
-    console.error('[ServiceWorker] Failed to store request:', error);
-  }
-}
-
-// Background sync for failed requests
+// Background sync: send the queued reports in batches
 self.addEventListener('sync', (event) => {
-  if (event.tag === 'background-sync') {
-    event.waitUntil(syncFailedRequests());
+  if (event.tag === OUTBOX_SYNC_TAG) {
+    event.waitUntil(flushOutbox().then(sent => {
+      if (sent) console.log('[ServiceWorker] Synced queued reports:', sent);
+    }));
   }
 });
 
-// Sync failed requests when online
-async function syncFailedRequests() {
-  try {
-    const cache = await caches.open('failed-requests');
-    const requests = await cache.keys();
-    
-    for (const request of requests) {
-      try {
-        const response = await cache.match(request);
-        const requestData = await response.json();
-        
-        // Retry the failed request
-        const retryResponse = await fetch(requestData.url, {
-          method: requestData.method,
-          headers: requestData.headers,
-          body: requestData.body
-        });
-        
-        if (retryResponse.ok) {
-          // Remove from failed requests cache
-          await cache.delete(request);
-          console.log('[ServiceWorker] Synced failed request:', requestData.url);
-        }
-      } catch (error) {
-        console.log('[ServiceWorker] Failed to sync request:', error);
-      }
-    }
-  } catch (error) {
-    console.error('[ServiceWorker] Background sync failed:', error);
-  }
-}
-
 // Handle messages from clients
 self.addEventListener('message', (event) => {
   if (event.data && event.data.type === 'SKIP_WAITING') {
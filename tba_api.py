@@ -1,30 +1,268 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
 import json
 import os
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from records import Match
+from fast_json import dump_file, load_file
+
+TBA_BASE_URL = os.environ.get('TBA_BASE_URL', 'https://www.thebluealliance.com/api/v3')
+TBA_CACHE_DIR = os.environ.get('TBA_CACHE_DIR', 'tba_cache')
+
+# (connect, read) seconds applied to every TBA request
+TBA_TIMEOUT = (3.05, 10)
+TBA_POOL_SIZE = 10
+TBA_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Longest a retry may sleep, whatever Retry-After asks for: these requests
+# run inside page loads, so a long rate-limit wait should fail fast instead
+TBA_RETRY_AFTER_MAX = 5
+TBA_BACKOFF_MAX = 4
+
+# Season event list: refreshed at most every few hours
+SEASON_EVENTS_TTL = 3 * 60 * 60
+RELEVANT_EVENT_TYPES = frozenset([0, 1, 2, 3, 4])
+EVENT_WINDOW_PAST_DAYS = 14
+EVENT_WINDOW_AHEAD_DAYS = 60
+
+class TBAResponseCache:
+    """Disk-backed cache of TBA GET responses keyed by URL.
+
+    Each entry keeps the parsed body plus the Last-Modified / ETag validators
+    and an expiry computed from Cache-Control: max-age. Entries are also held
+    in memory, so a fresh hit costs neither network nor disk I/O."""
+
+    def __init__(self, cache_dir=TBA_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + '.json')
+
+    def get(self, url):
+        """Return the cached entry for a URL (fresh or stale), or None"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is not None:
+            return entry
+        
+        try:
+            entry = load_file(self._path(url))
+        except (OSError, ValueError):
+            return None
+        
+        with self._lock:
+            self._entries[url] = entry
+        return entry
+
+    def put(self, url, data, last_modified=None, etag=None, max_age=0):
+        """Store a 200 response"""
+        entry = {
+            'url': url,
+            'data': data,
+            'last_modified': last_modified,
+            'etag': etag,
+            'expires_at': time.time() + max_age
+        }
+        self._store(url, entry)
+        return entry
+
+    def refresh(self, url, entry, max_age=0):
+        """Extend a cached entry after TBA answered 304 Not Modified"""
+        entry = dict(entry, expires_at=time.time() + max_age)
+        self._store(url, entry)
+        return entry
+
+    def invalidate(self, url):
+        """Drop a URL so the next request goes to TBA unconditionally"""
+        with self._lock:
+            self._entries.pop(url, None)
+        try:
+            os.remove(self._path(url))
+        except OSError:
+            pass
+
+    def _store(self, url, entry):
+        with self._lock:
+            self._entries[url] = entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(url)
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            dump_file(entry, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The in-memory copy still works if the disk is read-only
+            print(f"Could not persist TBA cache entry for {url}: {e}")
+
+class SeasonEvents:
+    """One season's events, parsed once and indexed by start date.
+
+    events is sorted by (start_date, name); start_dates/end_dates are parallel
+    lists of dates so a date window is answered with bisect instead of
+    re-parsing and scanning the whole season."""
+    __slots__ = ('year', 'raw', 'events', 'start_dates', 'end_dates', 'max_duration', 'loaded_at')
+
+    def __init__(self, year, raw_events):
+        self.year = year
+        self.raw = raw_events
+        self.loaded_at = time.time()
+        
+        parsed = []
+        for event in raw_events:
+            if event.get('event_type') not in RELEVANT_EVENT_TYPES:
+                continue
+            try:
+                event_start = datetime.strptime(event['start_date'], '%Y-%m-%d').date()
+                event_end = datetime.strptime(event['end_date'], '%Y-%m-%d').date()
+            except (ValueError, KeyError, TypeError):
+                # Skip events with invalid date formats
+                continue
+            parsed.append((event_start, event_end, {
+                'key': event['key'],
+                'name': event['name'],
+                'start_date': event['start_date'],
+                'end_date': event['end_date'],
+                'location': f"{event.get('city', '')}, {event.get('state_prov', '')}",
+                'event_type': event.get('event_type', 0),
+                'week': event.get('week')
+            }))
+        
+        parsed.sort(key=lambda item: (item[0], item[2]['name']))
+        self.events = [item[2] for item in parsed]
+        self.start_dates = [item[0] for item in parsed]
+        self.end_dates = [item[1] for item in parsed]
+        self.max_duration = max((end - start for start, end, _ in parsed), default=timedelta(0))
+
+    def between(self, window_start, window_end):
+        """Events overlapping [window_start, window_end], in start-date order"""
+        # Nothing starting after window_end can overlap, and nothing starting
+        # before window_start - max_duration can still be running by then
+        lo = bisect_left(self.start_dates, window_start - self.max_duration)
+        hi = bisect_right(self.start_dates, window_end)
+        return [self.events[i] for i in range(lo, hi) if self.end_dates[i] >= window_start]
+
+class _CappedRetry(Retry):
+    """Retry whose sleeps (backoff and Retry-After) never exceed a few seconds"""
+
+    def get_backoff_time(self):
+        return min(super().get_backoff_time(), TBA_BACKOFF_MAX)
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, TBA_RETRY_AFTER_MAX)
+
+def _build_session(headers, pool_size=TBA_POOL_SIZE, retries=3, backoff_factor=0.5):
+    """requests.Session with a keep-alive pool and retry/backoff on 429/5xx.
+
+    Backoff sleeps backoff_factor * 2**n between attempts (0.5s, 1s, 2s) and
+    honours Retry-After when TBA rate-limits us, capped at TBA_BACKOFF_MAX and
+    TBA_RETRY_AFTER_MAX seconds."""
+    retry = _CappedRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=TBA_RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def _max_age(response):
+    """Seconds the response may be served from cache (Cache-Control: max-age)"""
+    match = re.search(r'max-age=(\d+)', response.headers.get('Cache-Control', ''))
+    return int(match.group(1)) if match else 0
 
 class TBAClient:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, cache=None, base_url=None, max_workers=TBA_POOL_SIZE):
         self.api_key = api_key or os.environ.get('TBA_API_KEY', 'your_tba_api_key_here')
-        self.base_url = 'https://www.thebluealliance.com/api/v3'
+        self.base_url = (base_url or TBA_BASE_URL).rstrip('/')
+        self.max_workers = max_workers
+        self._seasons = {}
+        self._season_lock = threading.Lock()
         self.headers = {
             'X-TBA-Auth-Key': self.api_key,
             'User-Agent': 'AstraeaScoutingApp/1.0'
         }
+        self.cache = cache or TBAResponseCache()
+        # Pool is sized so every batch worker can hold its own connection
+        self.session = _build_session(self.headers, pool_size=max(TBA_POOL_SIZE, max_workers))
         
         if self.api_key and self.api_key != 'your_tba_api_key_here':
             print(f"TBA API Key loaded: {self.api_key[:10]}...")
         else:
             print("WARNING: TBA API Key not found or using placeholder!")
     
+    def _get(self, path, timeout=TBA_TIMEOUT):
+        """GET a TBA endpoint through the response cache.
+
+        Returns the parsed JSON body, or None for a non-200 answer. Within
+        max-age the cached body is returned without a request; after that the
+        request is revalidated with If-Modified-Since / If-None-Match and a 304
+        reuses the cached body. If TBA is unreachable, stale data is served."""
+        url = f'{self.base_url}{path}'
+        entry = self.cache.get(url)
+        
+        if entry and entry['expires_at'] > time.time():
+            return entry['data']
+        
+        headers = {}
+        if entry:
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+        
+        try:
+            response = self.session.get(url, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            if entry:
+                print(f"TBA unreachable, serving cached {path}: {e}")
+                return entry['data']
+            raise
+        
+        if response.status_code == 304 and entry:
+            return self.cache.refresh(url, entry, _max_age(response))['data']
+        
+        if response.status_code == 200:
+            data = response.json()
+            self.cache.put(
+                url, data,
+                last_modified=response.headers.get('Last-Modified'),
+                etag=response.headers.get('ETag'),
+                max_age=_max_age(response)
+            )
+            return data
+        
+        print(f"TBA API Error: {response.status_code} - {response.text}")
+        return None
+    
+    def invalidate(self, path):
+        """Forget the cached response for an endpoint so the next read refetches it"""
+        self.cache.invalidate(f'{self.base_url}{path}')
+    
     def get_event_info(self, event_key):
         """Get info about a specific event"""
         try:
-            url = f'{self.base_url}/event/{event_key}'
-            response = requests.get(url, headers=self.headers, timeout=10)
+            event = self._get(f'/event/{event_key}')
             
-            if response.status_code == 200:
-                event = response.json()
+            if event:
                 return {
                     'key': event['key'],
                     'name': event['name'],
@@ -37,92 +275,67 @@ class TBAClient:
             print(f"Error fetching event info for {event_key}: {e}")
             return None
 
+    def _season_events(self, year):
+        """SeasonEvents for a year, re-fetched at most every SEASON_EVENTS_TTL seconds"""
+        with self._season_lock:
+            season = self._seasons.get(year)
+        if season and time.time() - season.loaded_at < SEASON_EVENTS_TTL:
+            return season
+        
+        events = self._get(f'/events/{year}')
+        if events is None:
+            return season
+        
+        if season and season.raw is events:
+            # Revalidated as unchanged (304): keep the parsed index
+            season.loaded_at = time.time()
+            return season
+        
+        print(f"Retrieved {len(events)} events from TBA")
+        season = SeasonEvents(year, events)
+        with self._season_lock:
+            self._seasons[year] = season
+        return season
+
     def get_current_events(self):
         """Get current/recent events - filtered to show only relevant ones"""
         try:
-            year = datetime.now().year
-            url = f'{self.base_url}/events/{year}'
-            print(f"Fetching events from: {url}")
+            today = datetime.now().date()
+            season = self._season_events(today.year)
+            if season is None:
+                return []
             
-            response = requests.get(url, headers=self.headers, timeout=10)
-            print(f"TBA API Response Status: {response.status_code}")
+            current_events = season.between(
+                today - timedelta(days=EVENT_WINDOW_PAST_DAYS),
+                today + timedelta(days=EVENT_WINDOW_AHEAD_DAYS)
+            )
+            if not current_events:
+                # Off-season: nothing in the window, so offer the whole season
+                current_events = list(season.events)
             
-            if response.status_code == 200:
-                events = response.json()
-                print(f"Retrieved {len(events)} events from TBA")
-                
-                today = datetime.now().date()
-                two_weeks_ago = today - timedelta(days=14)
-                two_months_ahead = today + timedelta(days=60)
-                
-                current_events = []
-                for event in events:
-                    if event.get('event_type') in [0, 1, 2, 3, 4]: 
-                        try:
-                            event_start = datetime.strptime(event['start_date'], '%Y-%m-%d').date()
-                            event_end = datetime.strptime(event['end_date'], '%Y-%m-%d').date()
-                            
-                            if (event_start <= today <= event_end or 
-                                event_start <= two_months_ahead or   
-                                event_end >= two_weeks_ago):          
-                                
-                                current_events.append({
-                                    'key': event['key'],
-                                    'name': event['name'],
-                                    'start_date': event['start_date'],
-                                    'end_date': event['end_date'],
-                                    'location': f"{event.get('city', '')}, {event.get('state_prov', '')}",
-                                    'event_type': event.get('event_type', 0),
-                                    'week': event.get('week')
-                                })
-                        except (ValueError, KeyError):
-                            # Skip events with invalid date formats
-                            continue
-                
-                print(f"Filtered to {len(current_events)} relevant events")
-                return sorted(current_events, key=lambda x: (x['start_date'], x['name']))
-            else:
-                print(f"TBA API Error: {response.status_code} - {response.text}")
-                return []
+            print(f"Filtered to {len(current_events)} relevant events")
+            return current_events
         except Exception as e:
             print(f"Error fetching events: {e}")
             return []
 
     def get_event_matches(self, event_key):
-        """Get matches for a specific event"""
+        """Get qualification matches for a specific event as Match records"""
         try:
-            url = f'{self.base_url}/event/{event_key}/matches'
-            print(f"Fetching matches from: {url}")
+            matches = self._get(f'/event/{event_key}/matches')
             
-            response = requests.get(url, headers=self.headers, timeout=10)
-            print(f"TBA API Response Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                matches = response.json()
+            if matches is not None:
                 print(f"Retrieved {len(matches)} matches from TBA")
                 
                 processed_matches = []
                 
                 for match in matches:
                     if match['comp_level'] == 'qm':  
-                        red_teams = [team.replace('frc', '') for team in match['alliances']['red']['team_keys']]
-                        blue_teams = [team.replace('frc', '') for team in match['alliances']['blue']['team_keys']]
-                        
-                        processed_matches.append({
-                            'key': match['key'],
-                            'match_number': match['match_number'],
-                            'red_teams': red_teams,
-                            'blue_teams': blue_teams,
-                            'all_teams': red_teams + blue_teams,
-                            'predicted_time': match.get('predicted_time'),
-                            'actual_time': match.get('actual_time'),
-                            'time': match.get('time')
-                        })
+                        processed_matches.append(Match.from_tba(match))
                 
                 print(f"Processed {len(processed_matches)} qualification matches")
-                return sorted(processed_matches, key=lambda x: x['match_number'])
+                return sorted(processed_matches, key=lambda x: x.match_number)
             else:
-                print(f"TBA API Error: {response.status_code} - {response.text}")
                 return []
         except Exception as e:
             print(f"Error fetching matches for {event_key}: {e}")
@@ -131,9 +344,8 @@ class TBAClient:
     def get_team_info(self, team_key):
         """Get basic info about a team"""
         try:
-            response = requests.get(f'{self.base_url}/team/{team_key}', headers=self.headers)
-            if response.status_code == 200:
-                team = response.json()
+            team = self._get(f'/team/{team_key}')
+            if team:
                 return {
                     'key': team['key'],
                     'team_number': team['team_number'],
@@ -148,6 +360,50 @@ class TBAClient:
             print(f"Error fetching team info for {team_key}: {e}")
             return None
 
+    def get_teams_page(self, page):
+        """One page (up to 500 teams) of TBA's /teams/{page}/simple listing.
+
+        Returns the raw team dicts, [] past the last page, or None on error."""
+        try:
+            return self._get(f'/teams/{page}/simple')
+        except Exception as e:
+            print(f"Error fetching teams page {page}: {e}")
+            return None
+
+    def _fetch_many(self, fetch, keys, max_workers=None):
+        """Run fetch(key) for every key concurrently, keeping input order.
+
+        At most max_workers (default self.max_workers) requests are in flight
+        at once. Duplicate keys are fetched once."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        
+        workers = min(max_workers or self.max_workers, len(keys))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tba') as pool:
+            results = pool.map(fetch, keys)
+            return dict(zip(keys, results))
+
+    def get_many_event_matches(self, event_keys, max_workers=None):
+        """Fetch qualification matches for several events concurrently.
+
+        Returns {event_key: [Match, ...]}; an event that failed maps to []."""
+        return self._fetch_many(self.get_event_matches, event_keys, max_workers)
+
+    def get_many_team_info(self, team_keys, max_workers=None):
+        """Fetch basic info for several teams concurrently.
+
+        Accepts 'frc254' or '254'. Returns {team_key: info or None} keyed by the
+        keys as given."""
+        def fetch(team_key):
+            team_key = str(team_key)
+            return self.get_team_info(team_key if team_key.startswith('frc') else f'frc{team_key}')
+        return self._fetch_many(fetch, team_keys, max_workers)
+
+    def get_many_teams_pages(self, pages, max_workers=None):
+        """Fetch several /teams/{page}/simple pages concurrently: {page: teams or None}"""
+        return self._fetch_many(self.get_teams_page, pages, max_workers)
+
 SAMPLE_MATCHES = [
     {
         'key': '2025test_qm1',
@@ -172,5 +428,5 @@ SAMPLE_MATCHES = [
 ]
 
 def get_sample_matches():
-    """Return sample matches for testing"""
-    return SAMPLE_MATCHES
\ No newline at end of file
+    """Return sample matches for testing as Match records"""
+    return [Match.from_dict(match) for match in SAMPLE_MATCHES]
\ No newline at end of file
@@ -0,0 +1,96 @@
+# tba_webhooks.py - Push notifications from The Blue Alliance
+"""
+TBA can POST notifications to us instead of us polling it. Each request body
+is JSON {"message_type": ..., "message_data": {...}} and carries an
+X-TBA-HMAC header: hex HMAC-SHA256 of the raw body keyed with the webhook
+secret (TBA_WEBHOOK_SECRET, shown on the TBA account page).
+
+Schedule-affecting messages (schedule_updated, upcoming_match, match_score,
+starting_comp_level) drop the cached TBA response for that event's matches
+and, if the event is active, refresh its schedule right away on a background
+thread. The refresh goes through schedule.refresh_schedule(), so listeners
+see the usual version bump and diff. With webhooks on,
+SCHEDULE_REFRESH_INTERVAL can be raised (or set to 0) to poll less.
+
+Recorded payloads live in fixtures/tba_webhooks/ and can be replayed with
+tools/post_webhook.py.
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+
+import schedule
+
+SCHEDULE_MESSAGES = frozenset(['schedule_updated', 'upcoming_match', 'match_score', 'starting_comp_level'])
+
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def get_webhook_secret():
+    return os.environ.get('TBA_WEBHOOK_SECRET', '')
+
+def sign(body, secret):
+    """X-TBA-HMAC value for a raw request body"""
+    return hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+def verify_signature(body, signature, secret=None):
+    """Check the X-TBA-HMAC header against the raw body"""
+    secret = get_webhook_secret() if secret is None else secret
+    if not secret or not signature:
+        return False
+    return hmac.compare_digest(sign(body, secret), signature.strip().lower())
+
+def _refresh_event(event_key):
+    try:
+        schedule.refresh_schedule(event_key)
+    except Exception as e:
+        print(f"Webhook refresh failed for {event_key}: {e}")
+    finally:
+        with _pending_lock:
+            _pending.discard(event_key)
+
+def _schedule_refresh(event_key):
+    """Refresh on a background thread; bursts for one event collapse into one fetch"""
+    with _pending_lock:
+        if event_key in _pending:
+            return False
+        _pending.add(event_key)
+    threading.Thread(target=_refresh_event, args=(event_key,),
+                     name=f'webhook-{event_key}', daemon=True).start()
+    return True
+
+def handle_webhook(message_type, message_data):
+    """Apply one verified notification; returns a small summary for the response"""
+    if not isinstance(message_data, dict):
+        return {'handled': None}
+    
+    if message_type == 'verification':
+        # Paste this into the webhook page on thebluealliance.com/account
+        print(f"TBA webhook verification key: {message_data.get('verification_key')}")
+        return {'handled': 'verification'}
+    
+    if message_type == 'ping':
+        return {'handled': 'ping'}
+    
+    if message_type not in SCHEDULE_MESSAGES:
+        return {'handled': None}
+    
+    event_key = message_data.get('event_key')
+    if not event_key:
+        match = message_data.get('match')
+        match_key = message_data.get('match_key') or (match.get('key') if isinstance(match, dict) else None)
+        event_key = match_key.split('_')[0] if isinstance(match_key, str) else None
+    if not event_key or not isinstance(event_key, str):
+        return {'handled': None}
+    
+    tba_client = schedule.get_tba_client()
+    tba_client.invalidate(f'/event/{event_key}/matches')
+    
+    refreshing = False
+    if event_key in schedule.active_events():
+        refreshing = _schedule_refresh(event_key)
+    
+    return {'handled': message_type, 'event_key': event_key, 'refreshing': refreshing}
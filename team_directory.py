@@ -0,0 +1,197 @@
+# team_directory.py - Local index of every FRC team's nickname and city
+"""
+Team names used to come only from the hard-coded dict in team_names.py, so any
+team outside those ~140 got an "Unknown Team" header in the sheet.
+
+This module ingests TBA's paged /teams/{page}/simple listing in bulk (pages
+fetched concurrently) into a compact local index:
+
+    {"updated_at": ..., "pages": {page: digest}, "page_teams": {page: [numbers]},
+     "teams": {number: [nickname, city]}}
+
+Refreshes are incremental: page requests are revalidated through the TBA
+response cache and only pages whose contents changed are merged back in.
+start_refresher() (started by app.py) checks every REFRESH_CHECK_INTERVAL
+seconds and refreshes once the index is older than TEAM_DIRECTORY_MAX_AGE,
+so a long-running server keeps picking up new and renamed teams.
+
+TEAM_NAMES is a read-only mapping over the index (falling back to the static
+team_names.TEAM_NAMES), so TEAM_NAMES.get(number, default) stays an O(1)
+dict lookup for callers.
+
+Run `python team_directory.py` to ingest or refresh from the command line.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections.abc import Mapping
+
+from fast_json import dump_file, dumps_bytes, load_file
+from team_names import TEAM_NAMES as STATIC_TEAM_NAMES
+
+TEAM_DIRECTORY_FILE = 'team_directory.json'
+# Refresh in the background when the index is older than this
+TEAM_DIRECTORY_MAX_AGE = 24 * 60 * 60
+# How often the background thread checks whether the index is due
+REFRESH_CHECK_INTERVAL = 60 * 60
+# TBA team pages hold 500 teams; stop after this many as a safety net
+MAX_TEAM_PAGES = 40
+
+_index = None
+_lock = threading.Lock()
+_refreshing = threading.Lock()
+_refresher = None
+
+
+def _empty_index():
+    return {'updated_at': None, 'pages': {}, 'page_teams': {}, 'teams': {}}
+
+def load_index():
+    """The team index (loaded from disk once per process)"""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                try:
+                    _index = load_file(TEAM_DIRECTORY_FILE)
+                except (OSError, ValueError):
+                    _index = _empty_index()
+    return _index
+
+def _save_index(index):
+    tmp_path = f'{TEAM_DIRECTORY_FILE}.tmp'
+    dump_file(index, tmp_path)
+    os.replace(tmp_path, TEAM_DIRECTORY_FILE)
+
+def _page_digest(teams):
+    return hashlib.sha1(dumps_bytes(teams)).hexdigest()
+
+def _compact(team):
+    city = ', '.join(part for part in (team.get('city'), team.get('state_prov')) if part)
+    return [team.get('nickname') or '', city]
+
+def refresh_team_directory(tba_client, max_workers=None):
+    """Ingest or refresh the directory from TBA; returns (pages_changed, team_count).
+    
+    Pages are fetched max_workers at a time until TBA returns an empty page.
+    Unchanged pages (same digest as last time) are skipped."""
+    global _index
+    index = load_index()
+    pages = dict(index['pages'])
+    page_teams = dict(index['page_teams'])
+    teams = dict(index['teams'])
+    batch_size = max_workers or tba_client.max_workers
+    changed = 0
+    page = 0
+    
+    while page < MAX_TEAM_PAGES:
+        batch = list(range(page, min(page + batch_size, MAX_TEAM_PAGES)))
+        results = tba_client.get_many_teams_pages(batch, max_workers)
+        last_page = False
+        
+        for number in batch:
+            raw_teams = results.get(number)
+            if raw_teams is None:
+                # Fetch failed: keep what we had for this page
+                continue
+            if not raw_teams:
+                last_page = True
+                continue
+            
+            key = str(number)
+            digest = _page_digest(raw_teams)
+            if pages.get(key) == digest:
+                continue
+            
+            for team_number in page_teams.get(key, ()):
+                teams.pop(team_number, None)
+            numbers = []
+            for team in raw_teams:
+                team_number = str(team['team_number'])
+                teams[team_number] = _compact(team)
+                numbers.append(team_number)
+            pages[key] = digest
+            page_teams[key] = numbers
+            changed += 1
+        
+        if last_page:
+            break
+        page += batch_size
+    
+    index = {'updated_at': time.time(), 'pages': pages, 'page_teams': page_teams, 'teams': teams}
+    _save_index(index)
+    with _lock:
+        _index = index
+    
+    print(f"Team directory: {changed} page(s) updated, {len(teams)} teams")
+    return changed, len(teams)
+
+def refresh_if_stale(tba_client, max_age=TEAM_DIRECTORY_MAX_AGE):
+    """Refresh if the index is missing or older than max_age (skipped while another refresh runs)"""
+    updated_at = load_index().get('updated_at')
+    if updated_at and time.time() - updated_at < max_age:
+        return
+    
+    if not _refreshing.acquire(blocking=False):
+        return
+    try:
+        refresh_team_directory(tba_client)
+    except Exception as e:
+        print(f"Team directory refresh failed: {e}")
+    finally:
+        _refreshing.release()
+
+def _refresh_loop(tba_client, interval, max_age):
+    while True:
+        refresh_if_stale(tba_client, max_age)
+        time.sleep(interval)
+
+def _refresher_running():
+    return _refresher is not None and _refresher.is_alive()
+
+def start_refresher(tba_client, interval=REFRESH_CHECK_INTERVAL, max_age=TEAM_DIRECTORY_MAX_AGE):
+    """Start the background thread that keeps the index fresh (once per process; 0 disables it).
+    
+    It refreshes right away if the index is stale, then checks every interval seconds."""
+    global _refresher
+    if interval <= 0 or _refresher_running():
+        return
+    _refresher = threading.Thread(target=_refresh_loop, args=(tba_client, interval, max_age),
+                                  name='team-directory', daemon=True)
+    _refresher.start()
+
+def get_team_city(team_number):
+    """City, state of a team, or '' if unknown"""
+    entry = load_index()['teams'].get(str(team_number))
+    return entry[1] if entry else ''
+
+
+class TeamNames(Mapping):
+    """Read-only team number -> nickname mapping backed by the directory index"""
+    
+    def __getitem__(self, team_number):
+        entry = load_index()['teams'].get(team_number)
+        if entry and entry[0]:
+            return entry[0]
+        return STATIC_TEAM_NAMES[team_number]
+    
+    def _names(self):
+        teams = load_index()['teams']
+        named = {number for number, entry in teams.items() if entry[0]}
+        return named | STATIC_TEAM_NAMES.keys()
+    
+    def __iter__(self):
+        return iter(self._names())
+    
+    def __len__(self):
+        return len(self._names())
+
+
+TEAM_NAMES = TeamNames()
+
+
+if __name__ == '__main__':
+    from tba_api import TBAClient
+    refresh_team_directory(TBAClient())
@@ -0,0 +1,154 @@
+# test_auto_assign.py - /api/admin/auto-assign request validation
+"""
+Runs the app through the Flask test client in a temporary data directory, so
+no real users/assignments are touched. Needs the same environment as the app
+itself (GOOGLE_CREDENTIALS); skipped without it.
+
+Run from the repo root:  python -m pytest tests
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+if 'GOOGLE_CREDENTIALS' not in os.environ:
+    pytest.skip('GOOGLE_CREDENTIALS is not set', allow_module_level=True)
+
+MATCHES = [
+    {'red_teams': ['254', '1678', '118'], 'blue_teams': ['971', '2056', '148']},
+    {'red_teams': ['1114', '3310', '4414'], 'blue_teams': ['5940', '6328', '1323']},
+    {'red_teams': ['254', '971', '1114'], 'blue_teams': ['1678', '2056', '3310']},
+]
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    # The app reads and writes its data files relative to the working directory
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('data'))
+    os.environ.setdefault('TBA_API_KEY', 'test')
+    try:
+        yield importlib.import_module('app')
+    finally:
+        os.chdir(previous)
+
+@pytest.fixture
+def admin_client(app_module):
+    client = app_module.app.test_client()
+    response = client.post('/api/login', json={'username': 'admin', 'password': 'admin6897'})
+    assert response.status_code == 200
+    return client
+
+@pytest.fixture(scope='module')
+def event_key(app_module):
+    from manual_matches import create_manual_event
+    return create_manual_event('Shift Test', MATCHES)
+
+
+@pytest.mark.parametrize('shift_length', [0, -3, 'abc', '', None, [2]])
+def test_invalid_shift_length_is_rejected(admin_client, event_key, shift_length):
+    response = admin_client.post('/api/admin/auto-assign', json={
+        'event_key': event_key,
+        'strategy': 'shifts',
+        'shift_length': shift_length
+    })
+    assert response.status_code == 400
+    assert 'shift_length' in response.get_json()['error']
+
+@pytest.mark.parametrize('availability', [
+    ['alice'],
+    {'alice': 'abc'},
+    {'alice': [1, 2]},
+    {'alice': [[1, 'x']]},
+    {'alice': [[1, 2, 3]]},
+    {'alice': [[5, 1]]},
+])
+def test_invalid_availability_is_rejected(admin_client, event_key, availability):
+    response = admin_client.post('/api/admin/auto-assign', json={
+        'event_key': event_key,
+        'strategy': 'shifts',
+        'availability': availability
+    })
+    assert response.status_code == 400
+    assert 'availability' in response.get_json()['error']
+
+def test_availability_limits_who_is_picked(app_module, admin_client, event_key):
+    from database import clear_event_assignments
+    clear_event_assignments(event_key)
+    scouters = list(app_module.get_all_scouters())
+    # Everyone but the first six is unavailable, so they cover the whole event
+    availability = {scouter: [] for scouter in scouters[6:]}
+    availability[scouters[0]] = [['1', '3']]
+    response = admin_client.post('/api/admin/auto-assign', json={
+        'event_key': event_key,
+        'strategy': 'shifts',
+        'availability': availability
+    })
+    assert response.status_code == 200, response.get_data(as_text=True)
+    stations = response.get_json()['report']['shifts'][0]['stations']
+    assert set(stations.values()) == set(scouters[:6])
+
+@pytest.mark.parametrize('shift_length', [2, '2'])
+def test_shift_length_is_coerced_to_int(admin_client, event_key, shift_length):
+    response = admin_client.post('/api/admin/auto-assign', json={
+        'event_key': event_key,
+        'strategy': 'shifts',
+        'shift_length': shift_length
+    })
+    assert response.status_code == 200, response.get_data(as_text=True)
+    shifts = response.get_json()['report']['shifts']
+    assert [(shift['start_match'], shift['end_match']) for shift in shifts] == [(1, 2), (3, 3)]
+
+@pytest.mark.parametrize('completed, body', [(False, {}), (True, {'replace_pending': True})])
+def test_shifts_never_double_book_a_scouter_in_a_match(app_module, admin_client, event_key, completed, body):
+    from database import clear_event_assignments, get_all_assignments, mark_assignment_completed
+    clear_event_assignments(event_key)
+    scouter = next(iter(app_module.get_all_scouters()))
+    kept_key = f'{event_key}_qm1_148'
+    app_module.assign_scouter_to_team(scouter, event_key, 1, '148')
+    if completed:
+        mark_assignment_completed(kept_key)
+    
+    response = admin_client.post('/api/admin/auto-assign', json={
+        'event_key': event_key,
+        'strategy': 'shifts',
+        'shift_length': 2,
+        **body
+    })
+    assert response.status_code == 200, response.get_data(as_text=True)
+    
+    assignments = get_all_assignments(event_key)
+    assert assignments[kept_key].scouter == scouter
+    assert assignments[kept_key].completed == completed
+    by_match = {}
+    for assignment in assignments.values():
+        by_match.setdefault(assignment.match_number, []).append(assignment.scouter)
+    for scouters in by_match.values():
+        assert len(scouters) == len(set(scouters))
+
+@pytest.mark.parametrize('replace_pending', [False, True])
+def test_team_strategy_keeps_completed_and_pending(app_module, admin_client, event_key, replace_pending):
+    from database import clear_event_assignments, get_all_assignments, mark_assignment_completed
+    clear_event_assignments(event_key)
+    scouters = list(app_module.get_all_scouters())
+    app_module.assign_scouter_to_team(scouters[0], event_key, 1, '254')
+    mark_assignment_completed(f'{event_key}_qm1_254')
+    app_module.assign_scouter_to_team(scouters[1], event_key, 2, '1114')
+    
+    response = admin_client.post('/api/admin/auto-assign', json={
+        'event_key': event_key,
+        'strategy': 'team',
+        'replace_pending': replace_pending
+    })
+    assert response.status_code == 200, response.get_data(as_text=True)
+    
+    assignments = get_all_assignments(event_key)
+    completed = assignments[f'{event_key}_qm1_254']
+    assert (completed.scouter, completed.completed) == (scouters[0], True)
+    if not replace_pending:
+        assert assignments[f'{event_key}_qm2_1114'].scouter == scouters[1]
@@ -0,0 +1,71 @@
+# post_webhook.py - Replay recorded TBA webhook payloads against a running server
+"""
+Signs each payload with TBA_WEBHOOK_SECRET (X-TBA-HMAC, HMAC-SHA256 of the
+body) the same way TBA does and POSTs it to /api/tba/webhook.
+
+Usage (from the repo root, with the app running):
+
+    TBA_WEBHOOK_SECRET=... python tools/post_webhook.py                      # all fixtures
+    TBA_WEBHOOK_SECRET=... python tools/post_webhook.py upcoming_match --event 2026njfla
+    python tools/post_webhook.py --url http://localhost:5000/api/tba/webhook --bad-signature
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tba_webhooks import sign
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'fixtures', 'tba_webhooks')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, f'{name}.json')) as f:
+        return json.load(f)
+
+def retarget(payload, event_key):
+    """Point a recorded payload at another event"""
+    data = payload['message_data']
+    old_event = data.get('event_key')
+    if not old_event:
+        return payload
+    text = json.dumps(payload).replace(old_event, event_key)
+    return json.loads(text)
+
+def post(url, payload, secret):
+    body = json.dumps(payload).encode('utf-8')
+    start = time.perf_counter()
+    response = requests.post(url, data=body, timeout=10, headers={
+        'Content-Type': 'application/json',
+        'X-TBA-HMAC': sign(body, secret)
+    })
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{payload['message_type']:<22}{response.status_code}  {elapsed:7.1f} ms  {response.text.strip()}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('fixtures', nargs='*', help='fixture names (default: all)')
+    parser.add_argument('--url', default='http://localhost:5000/api/tba/webhook')
+    parser.add_argument('--event', help='rewrite the event key in each payload')
+    parser.add_argument('--secret', default=os.environ.get('TBA_WEBHOOK_SECRET', ''))
+    parser.add_argument('--bad-signature', action='store_true', help='sign with a wrong secret (expect 401)')
+    args = parser.parse_args()
+
+    names = args.fixtures or sorted(os.path.splitext(os.path.basename(path))[0]
+                                    for path in glob.glob(os.path.join(FIXTURES_DIR, '*.json')))
+    secret = 'not-the-secret' if args.bad_signature else args.secret
+    if not secret:
+        parser.error('set TBA_WEBHOOK_SECRET or pass --secret')
+
+    for name in names:
+        payload = load_fixture(name)
+        if args.event:
+            payload = retarget(payload, args.event)
+        post(args.url, payload, secret)
@@ -0,0 +1,53 @@
+# record_tba.py - Record live TBA responses as fixtures for tools/tba_standin.py
+"""
+Fetches the season event list and, for each event given, the event info,
+qualification schedule and team info for every team in it, and writes the
+raw responses to fixtures/tba/ under the names the stand-in looks up.
+
+Needs network access and TBA_API_KEY:
+
+    python tools/record_tba.py 2026njfla 2026njtab --year 2026
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tba_api import TBAClient
+from tba_standin import DEFAULT_FIXTURES_DIR, fixture_name
+
+def record(client, path, out_dir):
+    data = client._get(path)
+    if data is None:
+        print(f"  skipped {path} (no data)")
+        return None
+    with open(os.path.join(out_dir, fixture_name(path)), 'w') as f:
+        json.dump(data, f)
+    print(f"  recorded {path}")
+    return data
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('events', nargs='*', help='event keys to record')
+    parser.add_argument('--year', type=int, help='also record /events/{year}')
+    parser.add_argument('--out', default=DEFAULT_FIXTURES_DIR)
+    args = parser.parse_args()
+    
+    os.makedirs(args.out, exist_ok=True)
+    client = TBAClient()
+    
+    if args.year:
+        record(client, f'/events/{args.year}', args.out)
+    
+    for event_key in args.events:
+        print(event_key)
+        record(client, f'/event/{event_key}', args.out)
+        matches = record(client, f'/event/{event_key}/matches', args.out) or []
+        team_keys = sorted({team for match in matches
+                            for alliance in match['alliances'].values()
+                            for team in alliance['team_keys']})
+        for team_key in team_keys:
+            record(client, f'/team/{team_key}', args.out)
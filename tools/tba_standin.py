@@ -0,0 +1,287 @@
+# tba_standin.py - Local stand-in for The Blue Alliance API v3
+"""
+Serves the TBA endpoints the app uses so TBAClient (and the routes on top of
+it) can be exercised and benchmarked without the live API:
+
+    /events/{year}                  season event list
+    /event/{key}                    event info
+    /event/{key}/matches            qualification schedule (80 matches)
+    /team/{key}                     team info
+    /teams/{page}/simple            paged team listing
+
+Responses come from recorded fixtures when a matching file exists in the
+fixtures directory (see tools/record_tba.py; /event/2026njfla/matches is
+stored as event__2026njfla__matches.json), otherwise they are generated
+deterministically from the path, so every run sees the same data.
+
+Like TBA, responses carry Last-Modified and Cache-Control: max-age and a
+matching If-Modified-Since gets a 304. Latency and errors can be injected:
+
+    python tools/tba_standin.py --port 8087 --latency 150 --jitter 50 --error-rate 0.05
+    TBA_BASE_URL=http://127.0.0.1:8087 python app.py
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from team_names import TEAM_NAMES
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'fixtures', 'tba')
+MATCH_COUNT = 80
+TEAMS_PER_EVENT = 40
+EVENTS_PER_SEASON = 60
+TEAM_PAGES = 20
+# All synthetic data is "last modified" at this fixed time so revalidation works across runs
+LAST_MODIFIED = format_datetime(datetime(2026, 1, 1, tzinfo=timezone.utc), usegmt=True)
+
+
+def fixture_name(path):
+    """File name used for a recorded response: /event/x/matches -> event__x__matches.json"""
+    return path.strip('/').replace('/', '__') + '.json'
+
+def _rng(*parts):
+    return random.Random('/'.join(str(part) for part in parts))
+
+def _team_pool():
+    return sorted(TEAM_NAMES, key=int)
+
+def synth_event(event_key, index=None):
+    rng = _rng('event', event_key)
+    year = int(event_key[:4]) if event_key[:4].isdigit() else 2026
+    week = (index if index is not None else rng.randrange(EVENTS_PER_SEASON)) % 8
+    start = date(year, 2, 26) + timedelta(weeks=week, days=rng.randrange(3))
+    return {
+        'key': event_key,
+        'name': f'Stand-in Event {event_key[4:].upper()}',
+        'event_code': event_key[4:],
+        'event_type': 1 if week < 6 else (2 if week == 6 else 3),
+        'start_date': start.isoformat(),
+        'end_date': (start + timedelta(days=2)).isoformat(),
+        'year': year,
+        'week': week,
+        'city': 'Mount Olive',
+        'state_prov': 'NJ',
+        'country': 'USA'
+    }
+
+def synth_events(year):
+    return [synth_event(f'{year}sim{n:02d}', n) for n in range(EVENTS_PER_SEASON)]
+
+def synth_matches(event_key):
+    """80 qualification matches; every team plays 12 and never twice in a match"""
+    rng = _rng('matches', event_key)
+    teams = rng.sample(_team_pool(), TEAMS_PER_EVENT)
+    slots = []
+    while len(slots) < MATCH_COUNT * 6:
+        round_teams = teams[:]
+        rng.shuffle(round_teams)
+        slots.extend(round_teams)
+    # Rounds don't divide evenly into matches: swap out repeats at the seams
+    for i in range(len(slots)):
+        match_start = i - i % 6
+        if slots[i] in slots[match_start:i]:
+            j = next(j for j in range(match_start + 6, len(slots))
+                     if slots[j] not in slots[match_start:match_start + 6])
+            slots[i], slots[j] = slots[j], slots[i]
+    
+    start = datetime.fromisoformat(synth_event(event_key)['start_date']).replace(
+        hour=9, tzinfo=timezone.utc).timestamp()
+    matches = []
+    for n in range(1, MATCH_COUNT + 1):
+        match_teams = slots[(n - 1) * 6:n * 6]
+        scheduled = int(start + (n - 1) * 420)
+        matches.append({
+            'key': f'{event_key}_qm{n}',
+            'comp_level': 'qm',
+            'set_number': 1,
+            'match_number': n,
+            'event_key': event_key,
+            'alliances': {
+                'red': {'score': -1, 'team_keys': [f'frc{t}' for t in match_teams[:3]]},
+                'blue': {'score': -1, 'team_keys': [f'frc{t}' for t in match_teams[3:]]}
+            },
+            'time': scheduled,
+            'predicted_time': scheduled + rng.randrange(0, 240),
+            'actual_time': None
+        })
+    # Include a few playoff matches; the client must filter them out
+    for n in range(1, 4):
+        matches.append({'key': f'{event_key}_sf{n}m1', 'comp_level': 'sf', 'set_number': n,
+                        'match_number': 1, 'event_key': event_key,
+                        'alliances': {'red': {'team_keys': []}, 'blue': {'team_keys': []}}})
+    rng.shuffle(matches)
+    return matches
+
+def synth_team(team_number):
+    nickname = TEAM_NAMES.get(str(team_number), f'Team {team_number}')
+    return {
+        'key': f'frc{team_number}',
+        'team_number': team_number,
+        'nickname': nickname,
+        'name': f'{nickname} Robotics Sponsors',
+        'city': 'Somewhere',
+        'state_prov': 'NJ',
+        'country': 'USA'
+    }
+
+def synth_teams_page(page):
+    if page >= TEAM_PAGES:
+        return []
+    rng = _rng('teams', page)
+    return [synth_team(number) for number in range(max(page * 500, 1), page * 500 + 500)
+            if rng.random() < 0.4 or str(number) in TEAM_NAMES]
+
+def synthesize(parts):
+    """Generated body for a path split into parts, or None for unknown routes"""
+    if len(parts) == 2 and parts[0] == 'events' and parts[1].isdigit():
+        return synth_events(int(parts[1]))
+    if len(parts) == 2 and parts[0] == 'event':
+        return synth_event(parts[1])
+    if len(parts) == 3 and parts[0] == 'event' and parts[2] == 'matches':
+        return synth_matches(parts[1])
+    if len(parts) == 2 and parts[0] == 'team' and parts[1][3:].isdigit():
+        return synth_team(int(parts[1][3:]))
+    if len(parts) == 3 and parts[0] == 'teams' and parts[1].isdigit() and parts[2] == 'simple':
+        return synth_teams_page(int(parts[1]))
+    return None
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'TBAStandin/1.0'
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+    
+    def do_GET(self):
+        server = self.server
+        server.count_request(self.path)
+        
+        if server.latency:
+            time.sleep(max(0, server.latency + server.random.uniform(-server.jitter, server.jitter)) / 1000)
+        
+        if server.error_rate and server.random.random() < server.error_rate:
+            status = server.random.choice((429, 500, 503))
+            headers = {'Retry-After': '0'} if status == 429 else None
+            return self._send(status, b'{"Errors": ["injected"]}', headers)
+        
+        path = self.path.split('?')[0]
+        prefix = server.path_prefix
+        if prefix and path.startswith(prefix):
+            path = path[len(prefix):]
+        
+        body = server.lookup(path)
+        if body is None:
+            return self._send(404, b'{"Errors": [{"path": "not found"}]}')
+        
+        headers = {
+            'Content-Type': 'application/json',
+            'Last-Modified': LAST_MODIFIED,
+            'Cache-Control': f'public, max-age={server.max_age}'
+        }
+        if self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+            server.count_request('304')
+            return self._send(304, headers=headers)
+        self._send(200, body, headers)
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def __init__(self, address, latency=0, jitter=0, error_rate=0.0, max_age=61,
+                 fixtures_dir=DEFAULT_FIXTURES_DIR, path_prefix='/api/v3', seed=0, verbose=False):
+        super().__init__(address, StandinHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_age = max_age
+        self.fixtures_dir = fixtures_dir
+        self.path_prefix = path_prefix
+        self.random = random.Random(seed)
+        self.verbose = verbose
+        self.counts = {}
+        self._bodies = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}{self.path_prefix}'
+    
+    def count_request(self, key):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+    
+    def total_requests(self):
+        with self._lock:
+            return sum(count for key, count in self.counts.items() if key != '304')
+    
+    def lookup(self, path):
+        """Encoded body for a path: recorded fixture first, then synthetic"""
+        with self._lock:
+            if path in self._bodies:
+                return self._bodies[path]
+        
+        fixture = os.path.join(self.fixtures_dir or '', fixture_name(path))
+        if self.fixtures_dir and os.path.exists(fixture):
+            with open(fixture, 'rb') as f:
+                body = f.read()
+        else:
+            data = synthesize(path.strip('/').split('/'))
+            body = None if data is None else json.dumps(data).encode('utf-8')
+        
+        with self._lock:
+            self._bodies[path] = body
+        return body
+
+
+def start_in_thread(**options):
+    """Start a stand-in on a free local port; returns the server (call shutdown() when done)"""
+    server = StandinServer(('127.0.0.1', 0), **options)
+    threading.Thread(target=server.serve_forever, name='tba-standin', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8087)
+    parser.add_argument('--latency', type=float, default=0, help='added latency per request (ms)')
+    parser.add_argument('--jitter', type=float, default=0, help='+/- random latency (ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered 429/5xx')
+    parser.add_argument('--max-age', type=int, default=61, help='Cache-Control max-age (s)')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR, help='recorded fixtures directory')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+    
+    server = StandinServer((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, max_age=args.max_age,
+                           fixtures_dir=args.fixtures, seed=args.seed, verbose=args.verbose)
+    print(f"TBA stand-in on {server.base_url} (latency {args.latency}ms, errors {args.error_rate:.0%})")
+    print(f"Run the app with TBA_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass